@@ -11,7 +11,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from fastapi import APIRouter, Query, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Query, HTTPException, BackgroundTasks, Request, Response
 from typing import Optional, List
 import logging
 from datetime import datetime
@@ -23,7 +23,10 @@ from services.mobile_banner_crawler import MobileBannerCrawler
 from services.enhanced_mobile_banner_crawler import EnhancedMobileBannerCrawler
 from models.banner import BannerResponse
 from core.cache import get_banner_cache
+from core.http_cache import make_etag, is_not_modified, not_modified_response, set_cache_headers
 from core.scheduler import get_scheduler
+from core.leader import require_leader
+from core.negative_cache import BANNER, MOBILE_BANNER_KEY, get_negative_cache
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/banner", tags=["banner"])
@@ -35,6 +38,8 @@ _crawl_lock = threading.Lock()
 
 @router.get("/mobile", response_model=BannerResponse)
 async def get_mobile_banners(
+    request: Request,
+    response: Response,
     force_crawl: bool = Query(False, description="是否强制重新爬取")
 ):
     """
@@ -68,6 +73,13 @@ async def get_mobile_banners(
             cached_images = banner_cache.get_banner_images()
             image_urls = [img.get('url', '') for img in cached_images if img.get('url')]
             
+            # 条件请求：轮播图未更新时直接返回 304
+            last_modified = banner_cache.last_update
+            etag = make_etag("banner", last_modified.isoformat() if last_modified else "", image_urls)
+            if is_not_modified(request, etag, last_modified):
+                return not_modified_response(etag, last_modified)
+            set_cache_headers(response, etag, last_modified)
+            
             logger.info("📋 返回缓存的Banner图片URL列表")
             return BannerResponse(
                 success=True,
@@ -76,6 +88,19 @@ async def get_mobile_banners(
                 message=f"获取手机版Banner图片成功（缓存），共 {len(image_urls)} 张"
             )
         
+        # 最近抓取失败且仍在退避期内：不再启动浏览器，返回已缓存的轮播图（可能为空）
+        negative = get_negative_cache()
+        retry_after = negative.retry_after(BANNER, MOBILE_BANNER_KEY)
+        if retry_after:
+            cached_images = banner_cache.get_banner_images()
+            image_urls = [img.get('url', '') for img in cached_images if img.get('url')]
+            return BannerResponse(
+                success=bool(image_urls),
+                images=image_urls,
+                total=len(image_urls),
+                message=f"最近的Banner爬取失败，{retry_after:.0f} 秒后才会重试，返回缓存结果，共 {len(image_urls)} 张"
+            )
+        
         logger.info("🚀 开始爬取手机版Banner图片URL")
         
         # 在线程池中执行爬取任务
@@ -86,6 +111,7 @@ async def get_mobile_banners(
         )
         
         if not banner_images:
+            negative.record_failure(BANNER, MOBILE_BANNER_KEY, "未找到任何Banner图片")
             return BannerResponse(
                 success=False,
                 images=[],
@@ -93,6 +119,8 @@ async def get_mobile_banners(
                 message="未找到任何Banner图片"
             )
         
+        negative.record_success(BANNER, MOBILE_BANNER_KEY)
+        
         # 提取图片URL列表
         image_urls = [img.get('url', '') for img in banner_images if img.get('url')]
         
@@ -294,6 +322,7 @@ async def manual_banner_crawl(
     """
     手动触发轮播图爬取任务
     """
+    require_leader()
     try:
         logger.info(f"🚀 手动触发轮播图爬取 - 增强版: {use_enhanced}, 下载: {download_images}")
         
@@ -11,27 +11,143 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from fastapi import APIRouter, Query, HTTPException, Depends
-from typing import List, Optional
+from fastapi import APIRouter, Query, HTTPException, Depends, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+import asyncio
 import logging
 from datetime import datetime
 
 from services.openharmony_news_crawler import OpenHarmonyNewsCrawler
 from services.news_service import get_news_service, NewsSource
-from models.news import NewsArticle, NewsResponse
-from core.database import get_db
+from models.news import NewsArticle, NewsResponse, NewsSearchResponse, SortOrder
+from core.database import get_db, fts_available, search_news_articles
 from core.scheduler import get_scheduler
 from core.cache import get_news_cache, ServiceStatus
+from core.news_index import parse_timestamp
+from core.news_snapshot import resolve_fields, CARD_FIELDS
+from core.response_cache import get_hot_page_cache, ENDPOINT_FILTERS
+from core.compression import choose_encoding
+from core.fast_json import FastJSONResponse, dumps, iter_news_response
+from core.content_store import get_content_store
+from core.snapshot_file import MappedSnapshotFile, get_snapshot_writer
+from core.leader import get_leader_election, require_leader
+from core.cache_backend import get_cache_backend
+from core.detail_cache import get_detail_cache, fetch_detail_uncached, DETAIL_FETCH_CATEGORY, DetailFetchError
+from core.negative_cache import get_negative_cache
+from core.prefetch import get_detail_prefetcher
+from core.config import settings
+from core.http_cache import (
+    make_etag, content_etag, is_not_modified, not_modified_response, set_cache_headers
+)
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/api/news", tags=["news"])
+router = APIRouter(prefix="/api/news", tags=["news"], default_response_class=FastJSONResponse)
+
+def _split_values(values: Optional[List[str]]) -> List[str]:
+    """拆分多值查询参数，同时支持 ?category=a&category=b 与 ?category=a,b"""
+    if not values:
+        return []
+    result = []
+    for value in values:
+        result.extend(v.strip() for v in value.split(",") if v.strip())
+    return result
+
+def _list_validators(request: Request, cache, endpoint: str):
+    """
+    列表接口的缓存校验值：ETag 由快照内容指纹和查询参数决定，Last-Modified 取缓存更新时间
+
+    代数只在单个进程内递增，重启或多个工作进程之间会重复，不能用来区分内容。
+    """
+    query = sorted(request.query_params.multi_items())
+    return make_etag(endpoint, cache.snapshot.fingerprint, query), cache.last_update
+
+def _hot_page_response(request: Request, cache, endpoint: str, page: int, page_size: int,
+                       category: Optional[str] = None, etag: Optional[str] = None,
+                       last_modified: Optional[datetime] = None) -> Optional[Response]:
+    """命中当前快照的预序列化页面时直接返回原始 JSON 字节"""
+    hot_pages = get_hot_page_cache()
+    if not hot_pages.is_hot(page, page_size):
+        return None
+    variants = hot_pages.get(cache.snapshot, (endpoint, page, page_size, category))
+    if variants is None:
+        return None
+    # 按 Accept-Encoding 直接返回预压缩的版本，不再逐请求压缩
+    encoding = choose_encoding(request.headers.get("accept-encoding"), variants)
+    response = FastJSONResponse(content=variants[encoding])
+    if len(variants) > 1:
+        response.headers["Vary"] = "Accept-Encoding"
+    if encoding != "identity":
+        response.headers["Content-Encoding"] = encoding
+        # 压缩版本与原文字节不同，使用弱 ETag
+        etag = f"W/{etag}" if etag else etag
+    if etag:
+        set_cache_headers(response, etag, last_modified)
+    return response
+
+def _parse_date_param(name: str, value: Optional[str], end_of_day: bool = False) -> Optional[int]:
+    """把日期查询参数转换为时间戳，格式无法识别时返回 400"""
+    if not value:
+        return None
+    timestamp = parse_timestamp(value, end_of_day=end_of_day)
+    if timestamp is None:
+        raise HTTPException(status_code=400, detail=f"无法识别的日期格式 {name}: {value}")
+    return timestamp
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+def _parse_fields_param(value: Optional[str], default: str = "card"):
+    """解析 fields 参数，包含未知字段时返回 400"""
+    try:
+        return resolve_fields(value, default)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _wants_ndjson(request: Request) -> bool:
+    """客户端是否通过 Accept 请求 NDJSON 格式"""
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+def _ndjson_lines(fragments: Iterable[bytes]) -> Iterator[bytes]:
+    """每篇文章的 JSON 片段占一行，逐行产出"""
+    for fragment in fragments:
+        yield fragment + b"\n"
+
+def _stream_response(cache, etag: str, last_modified: Optional[datetime],
+                     **filters) -> StreamingResponse:
+    """以 NDJSON 流式返回全部匹配文章，内存占用与结果数量无关"""
+    response = StreamingResponse(_ndjson_lines(cache.iter_news(as_json=True, **filters)),
+                                 media_type=NDJSON_MEDIA_TYPE)
+    set_cache_headers(response, etag, last_modified)
+    return response
+
+def _all_pages_response(cache, etag: str, last_modified: Optional[datetime],
+                        **filters) -> StreamingResponse:
+    """all=true 的 JSON 格式：结构与分页响应相同，但逐篇流式输出，不在内存中拼出整个响应体"""
+    response = StreamingResponse(iter_news_response(cache.iter_news(as_json=True, **filters)),
+                                 media_type="application/json")
+    set_cache_headers(response, etag, last_modified)
+    return response
+
+def _json_response(body: bytes, etag: str, last_modified: Optional[datetime]) -> FastJSONResponse:
+    """直接输出拼接好的 JSON 字节（跳过 response_model 的重复校验），并带上缓存校验头"""
+    response = FastJSONResponse(content=body)
+    set_cache_headers(response, etag, last_modified)
+    return response
 
 @router.get("/", response_model=NewsResponse)
 async def get_news(
+    request: Request,
     page: int = Query(1, ge=1, description="页码"),
     page_size: int = Query(20, ge=1, le=100, description="每页数量"),
-    category: Optional[str] = Query(None, description="新闻分类"),
+    category: Optional[List[str]] = Query(None, description="新闻分类，可传多个"),
+    source: Optional[List[str]] = Query(None, description="新闻来源，可传多个"),
+    month: Optional[List[str]] = Query(None, description="发布月份（YYYY-MM），可传多个"),
     search: Optional[str] = Query(None, description="搜索关键词"),
+    start_date: Optional[str] = Query(None, description="起始日期（含），如 2025-09-01"),
+    end_date: Optional[str] = Query(None, description="结束日期（含），如 2025-09-30"),
+    sort: SortOrder = Query(SortOrder.DEFAULT, description="排序方式"),
+    cursor: Optional[str] = Query(None, description="游标分页：首页传空值，之后传上一页返回的 next_cursor"),
+    fields: Optional[str] = Query(None, description="返回字段：card（默认，不含正文）/ full / 逗号分隔的字段名"),
     all: bool = Query(False, description="是否返回全部新闻不分页")
 ):
     """
@@ -40,9 +156,18 @@ async def get_news(
     参数说明：
     - page: 页码（当all=True时忽略）
     - page_size: 每页数量（当all=True时忽略）
-    - category: 新闻分类过滤
+    - category: 新闻分类过滤（可重复传参或用逗号分隔，多个取值为“或”关系）
+    - source: 新闻来源过滤（同上）
+    - month: 发布月份过滤，格式 YYYY-MM（同上）
     - search: 搜索关键词
-    - all: 是否返回全部新闻不分页，为true时返回所有匹配的新闻
+    - start_date/end_date: 发布日期闭区间，支持 YYYY-MM-DD、YYYY-MM 等格式
+    - sort: default（缓存顺序）/ date_desc（最新在前）/ date_asc（最早在前）
+    - cursor: 启用游标分页（按发布时间从新到旧，忽略 page 和 sort），
+      首页传 cursor= 空值，后续传响应中的 next_cursor，适合无限滚动
+    - fields: 返回字段，默认 card 只包含列表展示所需字段（不含正文内容块），
+      full 返回完整文章，也可以传逗号分隔的字段名，如 id,title,content
+    - all: 是否返回全部新闻不分页，为true时返回所有匹配的新闻；
+      请求头带 Accept: application/x-ndjson 时改为流式返回（同 /stream）
     """
     try:
         # 从缓存获取数据
@@ -67,22 +192,56 @@ async def get_news(
                 has_prev=False
             )
         
+        # 条件请求：数据未变化时直接返回 304
+        etag, last_modified = _list_validators(request, cache, "news")
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
+        
+        categories = _split_values(category)
+        projection = _parse_fields_param(fields)
+        
+        # 无搜索、无额外过滤、默认卡片投影的热门页直接返回预序列化结果
+        is_plain_query = not (all or search or source or month or start_date or end_date
+                              or cursor is not None)
+        if (is_plain_query and sort == SortOrder.DEFAULT and len(categories) <= 1
+                and projection == CARD_FIELDS):
+            hot_response = _hot_page_response(
+                request, cache, "news", page, page_size, categories[0] if categories else None,
+                etag=etag, last_modified=last_modified
+            )
+            if hot_response is not None:
+                return hot_response
+        
+        filters = {
+            "category": categories,
+            "source": _split_values(source),
+            "month": _split_values(month),
+            "start_ts": _parse_date_param("start_date", start_date),
+            "end_ts": _parse_date_param("end_date", end_date, end_of_day=True),
+            "fields": projection,
+        }
+        
         # 从缓存获取数据
-        if all:
-            # 如果要返回全部数据，设置一个很大的page_size来获取所有数据
-            result = cache.get_news(page=1, page_size=10000, 
-                                  category=category, search=search)
-            # 重新设置分页信息，表示这是全部数据
-            result.page = 1
-            result.page_size = result.total
-            result.has_next = False
-            result.has_prev = False
+        if cursor is not None:
+            # 游标分页：在日期索引上二分定位，翻页期间缓存变化也不会重复或遗漏
+            try:
+                body = cache.get_news_by_cursor(cursor=cursor, page_size=page_size,
+                                                search=search, as_json=True, **filters)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        elif all and _wants_ndjson(request):
+            return _stream_response(cache, etag, last_modified,
+                                    search=search, sort=sort, **filters)
+        elif all:
+            # 返回全部匹配数据，分页信息表示这是一整页
+            return _all_pages_response(cache, etag, last_modified,
+                                       search=search, sort=sort, **filters)
         else:
             # 正常分页逻辑
-            result = cache.get_news(page=page, page_size=page_size, 
-                                  category=category, search=search)
+            body = cache.get_news(page=page, page_size=page_size, 
+                                  search=search, sort=sort, as_json=True, **filters)
         
-        return result
+        return _json_response(body, etag, last_modified)
         
     except HTTPException:
         raise
@@ -92,9 +251,11 @@ async def get_news(
 
 @router.get("/openharmony", response_model=NewsResponse)
 async def get_openharmony_news(
+    request: Request,
     page: int = Query(1, ge=1, description="页码"),
     page_size: int = Query(20, ge=1, le=100, description="每页数量"),
-    search: Optional[str] = Query(None, description="搜索关键词")
+    search: Optional[str] = Query(None, description="搜索关键词"),
+    fields: Optional[str] = Query(None, description="返回字段：card（默认，不含正文）/ full / 逗号分隔的字段名")
 ):
     """
     获取OpenHarmony官网最新资讯
@@ -122,24 +283,22 @@ async def get_openharmony_news(
                 has_prev=False
             )
         
-        # 从缓存获取数据，只返回OpenHarmony来源的文章
-        result = cache.get_news(page=page, page_size=page_size, 
-                              category="官方动态", search=search)
-        
-        # 过滤只保留OpenHarmony来源的文章
-        filtered_articles = [
-            article for article in result.articles 
-            if getattr(article, 'source', None) == 'OpenHarmony'
-        ]
-        
-        return NewsResponse(
-            articles=filtered_articles,
-            total=len(filtered_articles),
-            page=page,
-            page_size=page_size,
-            has_next=len(filtered_articles) == page_size,
-            has_prev=page > 1
-        )
+        # 条件请求：数据未变化时直接返回 304
+        etag, last_modified = _list_validators(request, cache, "openharmony")
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
+        
+        projection = _parse_fields_param(fields)
+        if not search and projection == CARD_FIELDS:
+            hot_response = _hot_page_response(request, cache, "openharmony", page, page_size,
+                                              etag=etag, last_modified=last_modified)
+            if hot_response is not None:
+                return hot_response
+        
+        # 从缓存获取数据，分类与来源在分页之前一起过滤，total/has_next 才准确
+        body = cache.get_news(page=page, page_size=page_size, search=search,
+                              fields=projection, as_json=True, **ENDPOINT_FILTERS["openharmony"])
+        return _json_response(body, etag, last_modified)
         
     except HTTPException:
         raise
@@ -149,9 +308,11 @@ async def get_openharmony_news(
 
 @router.get("/blog", response_model=NewsResponse)
 async def get_openharmony_blog(
+    request: Request,
     page: int = Query(1, ge=1, description="页码"),
     page_size: int = Query(20, ge=1, le=100, description="每页数量"),
-    search: Optional[str] = Query(None, description="搜索关键词")
+    search: Optional[str] = Query(None, description="搜索关键词"),
+    fields: Optional[str] = Query(None, description="返回字段：card（默认，不含正文）/ full / 逗号分隔的字段名")
 ):
     """
     获取OpenHarmony技术博客文章
@@ -179,24 +340,22 @@ async def get_openharmony_blog(
                 has_prev=False
             )
         
-        # 从缓存获取数据，只返回技术博客来源的文章
-        result = cache.get_news(page=page, page_size=page_size, 
-                              category="技术博客", search=search)
-        
-        # 过滤只保留OpenHarmony技术博客来源的文章
-        filtered_articles = [
-            article for article in result.articles 
-            if getattr(article, 'source', None) == 'OpenHarmony技术博客'
-        ]
-        
-        return NewsResponse(
-            articles=filtered_articles,
-            total=len(filtered_articles),
-            page=page,
-            page_size=page_size,
-            has_next=len(filtered_articles) == page_size,
-            has_prev=page > 1
-        )
+        # 条件请求：数据未变化时直接返回 304
+        etag, last_modified = _list_validators(request, cache, "blog")
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
+        
+        projection = _parse_fields_param(fields)
+        if not search and projection == CARD_FIELDS:
+            hot_response = _hot_page_response(request, cache, "blog", page, page_size,
+                                              etag=etag, last_modified=last_modified)
+            if hot_response is not None:
+                return hot_response
+        
+        # 从缓存获取数据，分类与来源在分页之前一起过滤，total/has_next 才准确
+        body = cache.get_news(page=page, page_size=page_size, search=search,
+                              fields=projection, as_json=True, **ENDPOINT_FILTERS["blog"])
+        return _json_response(body, etag, last_modified)
         
     except HTTPException:
         raise
@@ -205,6 +364,90 @@ async def get_openharmony_blog(
         raise HTTPException(status_code=500, detail="获取OpenHarmony技术博客失败")
 
 
+@router.get("/stream")
+async def stream_news(
+    request: Request,
+    category: Optional[List[str]] = Query(None, description="新闻分类，可传多个"),
+    source: Optional[List[str]] = Query(None, description="新闻来源，可传多个"),
+    month: Optional[List[str]] = Query(None, description="发布月份（YYYY-MM），可传多个"),
+    search: Optional[str] = Query(None, description="搜索关键词"),
+    start_date: Optional[str] = Query(None, description="起始日期（含），如 2025-09-01"),
+    end_date: Optional[str] = Query(None, description="结束日期（含），如 2025-09-30"),
+    sort: SortOrder = Query(SortOrder.DEFAULT, description="排序方式"),
+    fields: Optional[str] = Query(None, description="返回字段：full（默认）/ card / 逗号分隔的字段名")
+):
+    """
+    以 NDJSON（每行一篇文章）流式导出全部匹配的新闻
+    
+    过滤、排序与 fields 参数同 /api/news/（但默认导出完整文章），用于替代 all=true 的整体导出：
+    文章从快照中逐篇读取、逐行序列化，内存占用不随数据量增长。
+    """
+    cache = get_news_cache()
+    cache_status = cache.get_status()
+    if cache_status["status"] == ServiceStatus.ERROR.value:
+        raise HTTPException(
+            status_code=503, 
+            detail=f"服务暂时不可用: {cache_status.get('error_message', '未知错误')}"
+        )
+    
+    etag, last_modified = _list_validators(request, cache, "stream")
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    
+    return _stream_response(
+        cache, etag, last_modified,
+        category=_split_values(category),
+        source=_split_values(source),
+        month=_split_values(month),
+        search=search,
+        start_ts=_parse_date_param("start_date", start_date),
+        end_ts=_parse_date_param("end_date", end_date, end_of_day=True),
+        sort=sort,
+        fields=_parse_fields_param(fields, default="full")
+    )
+
+@router.get("/search", response_model=NewsSearchResponse)
+async def search_news(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200, description="搜索词，空格分隔的多个词需同时命中"),
+    page: int = Query(1, ge=1, description="页码"),
+    page_size: int = Query(20, ge=1, le=100, description="每页数量"),
+    category: Optional[str] = Query(None, description="新闻分类"),
+    source: Optional[str] = Query(None, description="新闻来源")
+):
+    """
+    全文搜索（标题、摘要与正文）
+    
+    基于数据库中 news_articles 的 FTS5 全文索引（trigram 分词），按 BM25 相关度排序，
+    每条结果附带以 <mark> 标出匹配内容的标题与正文摘录（文本已 HTML 转义）。
+    与 /api/news/?search= 的区别：后者只在内存快照的标题和摘要中匹配，按缓存顺序返回。
+    """
+    if not settings.persist_news_cache or not await asyncio.to_thread(fts_available):
+        raise HTTPException(status_code=503, detail="全文搜索不可用：需要启用 PERSIST_NEWS_CACHE 且 SQLite 支持 FTS5 trigram")
+    
+    cache = get_news_cache()
+    etag, last_modified = _list_validators(request, cache, "search")
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    
+    try:
+        total, hits = await asyncio.to_thread(
+            search_news_articles, q, page_size, (page - 1) * page_size, category, source
+        )
+    except Exception as e:
+        logger.error(f"全文搜索失败: {e}")
+        raise HTTPException(status_code=500, detail="全文搜索失败")
+    
+    result = NewsSearchResponse(
+        query=q,
+        hits=hits,
+        total=total,
+        page=page,
+        page_size=page_size,
+        has_next=page * page_size < total
+    )
+    return _json_response(dumps(result.model_dump(mode="json")), etag, last_modified)
+
 @router.post("/crawl")
 async def crawl_news(
     source: NewsSource = Query(NewsSource.ALL, description="新闻来源"),
@@ -213,6 +456,7 @@ async def crawl_news(
     """
     手动触发新闻爬取（会更新缓存）
     """
+    require_leader()
     try:
         # 获取调度器并执行手动爬取
         scheduler = get_scheduler()
@@ -230,7 +474,7 @@ async def crawl_news(
         raise HTTPException(status_code=500, detail="启动爬取任务失败")
 
 @router.get("/{article_id}", response_model=NewsArticle)
-async def get_article_detail(article_id: str):
+async def get_article_detail(article_id: str, request: Request):
     """
     获取单篇新闻详情（会动态抓取完整内容）
     """
@@ -246,22 +490,41 @@ async def get_article_detail(article_id: str):
                 detail=f"服务暂时不可用: {cache_status.get('error_message', '未知错误')}"
             )
         
-        # 获取所有文章并查找指定ID
-        all_news = cache.get_news(page=1, page_size=1000)
-        for article in all_news.articles:
-            if article.id == article_id:
-                # 检查是否是 Huawei Developer 文章，需要抓取完整内容
-                if article.category == "Huawei Developer":
-                    from services.huawei_blog_api_crawler import HuaweiBlogAPICrawler
-                    crawler = HuaweiBlogAPICrawler()
-                    # 动态抓取完整内容
-                    article.content = crawler._fetch_article_content(article.url)
-                    # 关闭浏览器资源
-                    del crawler
-                return article
-        
-        # 如果没找到，返回404
-        raise HTTPException(status_code=404, detail="文章不存在")
+        # 通过ID索引直接定位文章
+        cached = cache.get_article(article_id)
+        if cached is None:
+            raise HTTPException(status_code=404, detail="文章不存在")
+        
+        # 检查是否是 Huawei Developer 文章，需要抓取完整内容
+        if cached.category == DETAIL_FETCH_CATEGORY:
+            # 完整内容优先取详情缓存，未命中时才启动浏览器抓取；
+            # 在 API 模型上补充，缓存中的记录保持不变
+            detail_cache = get_detail_cache()
+            try:
+                if detail_cache is not None:
+                    content = await detail_cache.get_content(article_id, cached.url)
+                else:
+                    content = await fetch_detail_uncached(article_id, cached.url)
+            except DetailFetchError as e:
+                # 抓取失败或处于退避期：返回列表中缓存的摘要（没有摘要时返回标题），
+                # 而不是错误占位文本；正文可能已分层到磁盘，不能回退到记录中的内容
+                logger.warning(f"文章详情不可用，返回摘要 {article_id}: {e}（{e.retry_after:.0f} 秒后可重试）")
+                content = [{"type": "text", "value": cached.summary or cached.title}]
+            article = NewsArticle.model_validate(cached.to_dict(content=content))
+            body = dumps(article.model_dump(mode="json"))
+        else:
+            # 其他来源直接使用入库时序列化好的 JSON
+            body = cache.get_article_json(article_id)
+            if body is None:
+                # 查找之后快照已被替换，文章不在新快照中
+                raise HTTPException(status_code=404, detail="文章不存在")
+        
+        # 详情的 ETag 由文章内容决定
+        etag = content_etag(body)
+        if is_not_modified(request, etag, cache.last_update):
+            return not_modified_response(etag, cache.last_update)
+        
+        return _json_response(body, etag, cache.last_update)
         
     except HTTPException:
         raise
@@ -269,6 +532,15 @@ async def get_article_detail(article_id: str):
         logger.error(f"获取文章详情失败: {e}")
         raise HTTPException(status_code=500, detail="获取文章详情失败")
 
+def _snapshot_file_stats(cache) -> Optional[Dict[str, Any]]:
+    """快照文件状态：映射中的文件（读取方）或写入器统计"""
+    store = cache.snapshot.content_store
+    if isinstance(store, MappedSnapshotFile):
+        return store.get_stats()
+    if settings.enable_snapshot_file:
+        return get_snapshot_writer().get_stats()
+    return None
+
 @router.get("/status/info")
 async def get_service_status():
     """
@@ -281,10 +553,22 @@ async def get_service_status():
         # 获取新闻服务信息
         news_service = get_news_service()
         news_sources = news_service.get_news_sources()
+        content_store = get_content_store()
+        detail_cache = get_detail_cache()
+        prefetcher = get_detail_prefetcher()
         
         return {
             "service_status": status_info,
+            "hot_pages": get_hot_page_cache().get_stats(),
+            "content_store": content_store.get_stats() if content_store else None,
+            "snapshot_file": _snapshot_file_stats(cache),
+            "leader": get_leader_election().get_stats(),
+            "detail_cache": detail_cache.get_stats() if detail_cache else None,
+            "detail_prefetch": prefetcher.get_stats() if prefetcher else None,
+            "fetch_failures": get_negative_cache().get_stats(),
+            "cache_backend": get_cache_backend().get_stats(),
             "news_sources": news_sources,
+            "last_crawl": news_service.last_crawl_stats,
             "timestamp": datetime.now().isoformat(),
             "endpoints": {
                 "all_news": "/api/news/",
@@ -293,6 +577,8 @@ async def get_service_status():
                 "news_detail": "/api/news/{article_id}",
                 "manual_crawl": "/api/news/crawl",
                 "service_status": "/api/news/status/info",
+                "memory_report": "/api/news/status/memory",
+                "stream_export": "/api/news/stream",
                 "cache_refresh": "/api/news/cache/refresh"
             }
         }
@@ -301,11 +587,30 @@ async def get_service_status():
         logger.error(f"获取服务状态失败: {e}")
         raise HTTPException(status_code=500, detail="获取服务状态失败")
 
+@router.get("/status/memory")
+async def get_memory_report():
+    """
+    获取缓存内存报告（预序列化数据大小、字符串驻留与内容块去重节省的空间）
+    """
+    try:
+        cache = get_news_cache()
+        hot_pages = get_hot_page_cache().get_stats()
+        return {
+            "snapshot": cache.snapshot.memory_report(),
+            "hot_page_bytes": hot_pages["encoded_bytes"],
+            "timestamp": datetime.now().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error(f"获取内存报告失败: {e}")
+        raise HTTPException(status_code=500, detail="获取内存报告失败")
+
 @router.post("/cache/refresh")
 async def refresh_cache():
     """
     手动刷新缓存
     """
+    require_leader()
     try:
         # 获取调度器并执行初始缓存加载
         scheduler = get_scheduler()
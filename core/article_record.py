@@ -0,0 +1,167 @@
+# Copyright (c) 2025 XBXyftx
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from models.news import NewsArticle
+from core.interning import ContentInterner
+from core.news_index import parse_timestamp
+
+
+class CodeBook:
+    """
+    字符串与小整数之间的编码表（只追加，编码不会复用）
+
+    分类、来源的取值很少但每篇文章都有，记录中只保存整数编码。
+    """
+
+    def __init__(self):
+        self._codes: Dict[Optional[str], int] = {None: 0}
+        self._values: List[Optional[str]] = [None]
+        self._lock = threading.Lock()
+
+    def encode(self, value: Optional[str]) -> int:
+        """获取取值对应的编码，新取值自动分配编码"""
+        code = self._codes.get(value)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(value)
+                if code is None:
+                    code = len(self._values)
+                    self._values.append(value)
+                    self._codes[value] = code
+        return code
+
+    def decode(self, code: int) -> Optional[str]:
+        """编码还原为取值"""
+        return self._values[code]
+
+    def __len__(self) -> int:
+        return len(self._values) - 1
+
+
+# 进程内共享的分类、来源编码表
+CATEGORY_CODES = CodeBook()
+SOURCE_CODES = CodeBook()
+
+
+def article_field(article, name: str, default=None):
+    """读取文章字段，兼容字典与 NewsArticle（及 ArticleRecord）"""
+    if isinstance(article, dict):
+        return article.get(name, default)
+    return getattr(article, name, default)
+
+
+class ArticleRecord:
+    """
+    缓存内部使用的紧凑文章记录
+
+    不论爬虫输出的是字典还是 NewsArticle，入库时都统一转换为该记录：
+    使用 __slots__ 去掉实例字典，发布时间预先解析为整数时间戳，
+    分类与来源保存为编码，内容块保存为驻留后的 (类型, 值) 元组。
+    启用分层存储时正文写入磁盘，content 为 None（通过 NewsSnapshot.full_article 读取）。
+    记录在缓存中只读，只在响应边界通过 to_api()/to_dict() 转换为 API 模型。
+    """
+
+    __slots__ = ("id", "title", "date", "timestamp", "url", "content", "summary",
+                 "category_code", "source_code", "created_at", "updated_at")
+
+    def __init__(self, id: Optional[str], title: str, date: str, url: str,
+                 content: Tuple[Any, ...] = (), category: Optional[str] = None,
+                 summary: Optional[str] = None, source: Optional[str] = None,
+                 created_at: Optional[datetime] = None, updated_at: Optional[datetime] = None,
+                 timestamp: Optional[int] = None):
+        self.id = id
+        self.title = title
+        self.date = date
+        self.timestamp = timestamp if timestamp is not None else parse_timestamp(date)
+        self.url = url
+        self.content = content
+        self.summary = summary
+        self.category_code = CATEGORY_CODES.encode(category)
+        self.source_code = SOURCE_CODES.encode(source)
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+    @classmethod
+    def from_article(cls, article, interner: Optional[ContentInterner] = None,
+                     keep_content: bool = True) -> "ArticleRecord":
+        """
+        从爬虫输出（字典或 NewsArticle）创建记录，重复的字符串与内容块通过 interner 共享
+
+        keep_content 为 False 时不在记录中保留正文（正文由调用方另行存储）。
+        """
+        if isinstance(article, ArticleRecord):
+            return article
+        interner = interner or ContentInterner()
+        content = None
+        if keep_content:
+            blocks = article_field(article, "content") or ()
+            content = tuple(interner.intern_block(block) for block in blocks)
+        date = article_field(article, "date") or ""
+        return cls(
+            id=article_field(article, "id"),
+            title=article_field(article, "title") or "",
+            date=interner.intern(date) if date else date,
+            url=article_field(article, "url") or "",
+            content=content,
+            category=article_field(article, "category"),
+            summary=article_field(article, "summary"),
+            source=article_field(article, "source"),
+            created_at=article_field(article, "created_at"),
+            updated_at=article_field(article, "updated_at"),
+        )
+
+    @property
+    def category(self) -> Optional[str]:
+        return CATEGORY_CODES.decode(self.category_code)
+
+    @property
+    def source(self) -> Optional[str]:
+        return SOURCE_CODES.decode(self.source_code)
+
+    @property
+    def is_resident(self) -> bool:
+        """正文是否保存在内存中"""
+        return self.content is not None
+
+    def content_blocks(self) -> List[Dict[str, Any]]:
+        """内容块还原为 API 格式的字典列表，正文不在内存中时抛出 LookupError"""
+        if self.content is None:
+            raise LookupError(f"文章 {self.id} 的正文不在内存中")
+        return [{"type": block[0], "value": block[1]} if isinstance(block, tuple) else block
+                for block in self.content]
+
+    def to_dict(self, content: Optional[List[Any]] = None) -> Dict[str, Any]:
+        """转换为与 NewsArticle 字段一致的字典，content 用于传入从磁盘读取的正文"""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "date": self.date,
+            "url": self.url,
+            "content": self.content_blocks() if content is None else content,
+            "category": self.category,
+            "summary": self.summary,
+            "source": self.source,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+    def to_api(self) -> NewsArticle:
+        """转换为 API 模型"""
+        return NewsArticle.model_validate(self.to_dict())
+
+    def __repr__(self) -> str:
+        return f"ArticleRecord(id={self.id!r}, title={self.title!r}, date={self.date!r})"
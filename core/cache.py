@@ -1,45 +1,94 @@
 # core/cache.py
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union, Tuple, Callable, Iterator
 import logging
+import os
+import threading
+import time
 from datetime import datetime
 from enum import Enum
+from functools import partial
 
 from services.huawei_blog_api_crawler import HuaweiBlogAPICrawler
-from models.news import NewsArticle, NewsResponse
+from models.news import NewsArticle, NewsResponse, SortOrder
+from core.news_snapshot import NewsSnapshot, encode_cursor, decode_cursor
+from core.article_record import ArticleRecord, article_field
+from core.fast_json import render_news_response, article_json, dumps, loads
+from core.config import settings
+from core.database import save_news_articles, load_news_articles
+from core.content_store import get_content_store
+from core.snapshot_file import MappedSnapshotFile, get_snapshot_writer, snapshot_file_changed
+from core.leader import get_leader_election
+from core.cache_backend import get_cache_backend
 
 logger = logging.getLogger(__name__)
 
+def _to_api(snapshot: NewsSnapshot, articles: List[Any]) -> List[Any]:
+    """在响应边界把文章记录转换为 API 模型（字段投影得到的字典原样保留）"""
+    return [snapshot.full_article(a) if isinstance(a, ArticleRecord) else a for a in articles]
+
 class ServiceStatus(str, Enum):
     PREPARING = "preparing"
     READY = "ready"
     ERROR = "error"
 
 class NewsCache:
+    """
+    新闻缓存
+    
+    数据保存在不可变的 NewsSnapshot 中。写入方（刷新、分批追加、整体更新）
+    在写锁内基于当前快照构建新快照，再通过一次引用赋值发布；
+    读请求只读取一次 self._snapshot，不加锁，也不会看到构建到一半的数据。
+    """
     def __init__(self):
-        self.articles: List[NewsArticle] = []
+        self._snapshot = NewsSnapshot(content_store=get_content_store())
+        self._write_lock = threading.Lock()
+        # (回调, 分批追加时是否也调用)
+        self._publish_listeners: List[Tuple[Callable[[NewsSnapshot], None], bool]] = []
+        self._batches_pending = False  # 有分批追加的快照尚未通知只关心完整结果的回调
+        self._is_first_load = True
         self.status: ServiceStatus = ServiceStatus.PREPARING
         self.error_message: Optional[str] = None
         self.last_update: Optional[datetime] = None
+        self._backend_version = 0  # 已从共享缓存后端加载的版本（跟随进程）
         self._load_initial_data()
     
     def _load_initial_data(self):
-        """加载初始数据到缓存"""
+        """
+        加载初始数据到缓存
+        
+        先从数据库恢复上次持久化的文章并立即发布（热启动），
+        再获取华为开发者文章基础数据，在恢复的数据上更新。
+        """
         try:
             logger.info("开始加载新闻缓存...")
-            self.articles = []
+            if not get_leader_election().is_leader:
+                self._load_as_follower()
+                return
+            persisted = self._load_persisted()
+            if persisted:
+                self._publish(NewsSnapshot.build(persisted, get_content_store()))
+                self.status = ServiceStatus.READY
+            articles = []
             
             # 加载华为开发者博客
             try:
                 huawei_crawler = HuaweiBlogAPICrawler()
                 # 只加载基础数据（不抓取详情内容，详情在 get_news 时抓取）
                 huawei_articles = self._get_huawei_articles_basic()
-                self.articles.extend(huawei_articles)
+                articles.extend(huawei_articles)
                 logger.info(f"成功加载 {len(huawei_articles)} 篇华为开发者文章（基础数据）")
             except Exception as e:
                 logger.error(f"加载华为开发者博客失败: {e}")
             
+            if persisted:
+                # 已从数据库恢复，基础数据按ID更新到现有快照上
+                self.append_to_cache(articles)
+                self.finish_batches()
+            else:
+                # 在旁边构建完整快照后一次性发布，旧快照在此之前照常服务
+                self._persist(articles)
+                self._publish(NewsSnapshot.build(articles, get_content_store()))
             self.status = ServiceStatus.READY
-            self.last_update = datetime.now()
             logger.info("新闻缓存加载完成")
             
         except Exception as e:
@@ -47,6 +96,101 @@ class NewsCache:
             self.error_message = str(e)
             logger.error(f"新闻缓存加载失败: {e}")
     
+    def _load_as_follower(self):
+        """跟随进程不爬取：优先读取共享缓存后端或领导进程写入的快照文件，否则从数据库恢复"""
+        synced = self.sync_backend() if get_cache_backend().shared else self.sync_snapshot_file()
+        if synced:
+            return
+        persisted = self._load_persisted()
+        if persisted:
+            self._publish(NewsSnapshot.build(persisted, get_content_store()))
+            self.status = ServiceStatus.READY
+        logger.info("跟随进程等待领导进程发布快照文件")
+    
+    def _load_persisted(self) -> List[Dict[str, Any]]:
+        """从数据库读取上次持久化的文章，失败时返回空列表"""
+        if not settings.persist_news_cache:
+            return []
+        try:
+            start_time = time.time()
+            articles = load_news_articles()
+            if articles:
+                logger.info(f"从数据库恢复 {len(articles)} 篇文章，"
+                            f"耗时 {(time.time() - start_time) * 1000:.0f}ms")
+            return articles
+        except Exception as e:
+            logger.warning(f"从数据库恢复新闻缓存失败，将等待爬取: {e}")
+            return []
+    
+    def _persist(self, articles: List[Any], replace_all: bool = False):
+        """把文章写入数据库（写穿），失败只记录日志，不影响缓存"""
+        if not settings.persist_news_cache:
+            return
+        try:
+            saved = save_news_articles([loads(article_json(a)) for a in articles],
+                                       replace_all=replace_all)
+            logger.debug(f"已持久化 {saved} 篇文章")
+        except Exception as e:
+            logger.error(f"持久化新闻缓存失败: {e}")
+    
+    def sync_snapshot_file(self, path: Optional[str] = None) -> bool:
+        """
+        快照文件被其他工作进程替换为新版本时，重新映射并发布，返回是否切换了快照
+
+        新快照的正文直接从映射中读取，多个进程共享同一份物理页。
+        """
+        path = path or settings.snapshot_file_path
+        current = self._snapshot.content_store
+        if not snapshot_file_changed(path, current if isinstance(current, MappedSnapshotFile) else None):
+            return False
+        try:
+            mapped = MappedSnapshotFile(path)
+            snapshot = NewsSnapshot.from_mapped(mapped)
+        except (OSError, ValueError) as e:
+            logger.warning(f"加载快照文件失败: {e}")
+            return False
+        self._publish(snapshot, keep_generation=True)
+        self.status = ServiceStatus.READY
+        self.error_message = None
+        logger.info(f"已切换到快照文件第 {mapped.generation} 代，共 {len(snapshot)} 篇文章")
+        return True
+    
+    def sync_backend(self) -> bool:
+        """共享缓存后端发布了新版本时，读取全部文章重建本地快照，返回是否切换了快照"""
+        backend = get_cache_backend()
+        try:
+            if backend.get_version() == self._backend_version:
+                return False
+            version, articles, meta = backend.get_snapshot()
+        except Exception as e:
+            logger.warning(f"读取共享缓存后端失败: {e}")
+            return False
+        if version == self._backend_version:
+            return False
+        snapshot = NewsSnapshot.build(articles, get_content_store())
+        # 沿用领导进程的代数与内容指纹（文章内容相同），各副本的 ETag 保持一致
+        snapshot.generation = meta.get("generation") or self._snapshot.generation + 1
+        snapshot.fingerprint = meta.get("fingerprint") or snapshot.fingerprint
+        self._publish(snapshot, keep_generation=True)
+        self._backend_version = version
+        self.status = ServiceStatus.READY
+        self.error_message = None
+        logger.info(f"已加载共享缓存第 {version} 版，共 {len(articles)} 篇文章")
+        return True
+    
+    def detach_snapshot_file(self):
+        """
+        成为领导进程时，把映射的快照转换为进程自有的快照
+
+        映射的快照文件只读，之后的爬取结果需要追加到自有快照（及正文存储）上。
+        """
+        snapshot = self._snapshot
+        if not isinstance(snapshot.content_store, MappedSnapshotFile):
+            return
+        articles = [loads(snapshot.export_json(i)) for i in range(len(snapshot))]
+        self._publish(NewsSnapshot.build(articles, get_content_store()))
+        logger.info(f"已接管快照文件中的 {len(articles)} 篇文章")
+    
     def _get_huawei_articles_basic(self):
         """获取华为文章的基础数据（不包含详情内容）"""
         import requests
@@ -119,11 +263,24 @@ class NewsCache:
             return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
     def get_news(self, page: int = 1, page_size: int = 20, 
-                 category: Optional[str] = None, 
-                 search: Optional[str] = None) -> NewsResponse:
-        """获取新闻列表，支持分类和搜索（此时才抓取完整内容）"""
+                 category: Union[str, List[str], None] = None, 
+                 search: Optional[str] = None,
+                 source: Union[str, List[str], None] = None,
+                 month: Union[str, List[str], None] = None,
+                 start_ts: Optional[int] = None,
+                 end_ts: Optional[int] = None,
+                 sort: SortOrder = SortOrder.DEFAULT,
+                 fields: Optional[Tuple[str, ...]] = None,
+                 as_json: bool = False) -> Union[NewsResponse, bytes]:
+        """
+        获取新闻列表，支持分类、来源、月份（YYYY-MM）过滤、日期区间和搜索
+        
+        过滤规则见 NewsSnapshot.query，整个请求只使用同一个快照。
+        fields 为投影字段（见 resolve_fields），None 返回完整文章。
+        as_json 为 True 时直接返回由预序列化片段拼接成的 JSON 字节。
+        """
         if self.status == ServiceStatus.PREPARING:
-            return NewsResponse(
+            empty = NewsResponse(
                 articles=[],
                 total=0,
                 page=page,
@@ -131,33 +288,24 @@ class NewsCache:
                 has_next=False,
                 has_prev=False
             )
+            return empty.model_dump_json().encode("utf-8") if as_json else empty
         
-        # 过滤数据
-        filtered_articles = self.articles
-        
-        # 分类过滤
-        if category:
-            filtered_articles = [a for a in filtered_articles if a.get('category') == category]
-        
-        # 关键字搜索
-        if search:
-            filtered_articles = [
-                a for a in filtered_articles 
-                if search.lower() in a.get('title', '').lower() or 
-                   search.lower() in a.get('summary', '').lower()
-            ]
-        
-        # 分页处理
-        total = len(filtered_articles)
-        start = (page - 1) * page_size
-        end = start + page_size
-        paginated_articles = filtered_articles[start:end]
+        snapshot = self._snapshot
+        paginated_articles, total = snapshot.query(
+            page=page, page_size=page_size, category=category, search=search,
+            source=source, month=month, start_ts=start_ts, end_ts=end_ts, sort=sort,
+            fields=fields, as_json=as_json
+        )
+        end = page * page_size
         
         # 注意：这里不抓取详细内容，因为会太慢
         # 详细内容应该在获取单篇文章时抓取（/api/news/{article_id}）
         
+        if as_json:
+            return render_news_response(paginated_articles, total, page, page_size,
+                                        has_next=end < total, has_prev=page > 1)
         return NewsResponse(
-            articles=paginated_articles,
+            articles=_to_api(snapshot, paginated_articles),
             total=total,
             page=page,
             page_size=page_size,
@@ -165,44 +313,224 @@ class NewsCache:
             has_prev=page > 1
         )
     
-    def get_article_detail(self, article_id: str):
-        """获取单篇文章的详细内容"""
-        for article in self.articles:
-            if article["id"] == article_id:
-                # 抓取详细内容
-                crawler = HuaweiBlogAPICrawler()
-                article["content"] = crawler._fetch_article_content(article["url"])
-                return article
-        return None
+    def iter_news(self, **filters) -> Iterator[Any]:
+        """
+        逐篇产出全部匹配的新闻（用于流式导出）
+        
+        filters 与 get_news 相同（不含分页）；迭代期间始终使用开始时的快照。
+        """
+        if self.status == ServiceStatus.PREPARING:
+            return iter(())
+        return self._snapshot.iter_query(**filters)
+    
+    def get_news_by_cursor(self, cursor: Optional[str] = None, page_size: int = 20,
+                           as_json: bool = False, **filters) -> Union[NewsResponse, bytes]:
+        """
+        游标分页获取新闻列表（按发布时间从新到旧）
+        
+        cursor 为空表示从第一页开始，格式不正确时抛出 ValueError；
+        filters 与 get_news 相同（不含排序），as_json 同 get_news。
+        """
+        position = decode_cursor(cursor) if cursor else None
+        if self.status == ServiceStatus.PREPARING:
+            empty = NewsResponse(articles=[], total=0, page=1, page_size=page_size)
+            return empty.model_dump_json().encode("utf-8") if as_json else empty
+        
+        snapshot = self._snapshot
+        articles, total, next_position = snapshot.query_after(
+            cursor=position, limit=page_size, as_json=as_json, **filters
+        )
+        if as_json:
+            return render_news_response(
+                articles, total, 1, page_size,
+                has_next=next_position is not None,
+                has_prev=position is not None,
+                next_cursor=encode_cursor(next_position) if next_position else None
+            )
+        return NewsResponse(
+            articles=_to_api(snapshot, articles),
+            total=total,
+            page=1,
+            page_size=page_size,
+            has_next=next_position is not None,
+            has_prev=position is not None,
+            next_cursor=encode_cursor(next_position) if next_position else None
+        )
+    
+    @property
+    def articles(self) -> Tuple[ArticleRecord, ...]:
+        """当前快照中的全部文章记录（只读）"""
+        return self._snapshot.articles
+    
+    @property
+    def snapshot(self) -> NewsSnapshot:
+        """当前发布的快照"""
+        return self._snapshot
+    
+    def get_article(self, article_id: str) -> Optional[ArticleRecord]:
+        """按ID查找缓存中的文章记录（哈希索引，O(1)）"""
+        return self._snapshot.get(article_id)
+    
+    def get_article_json(self, article_id: str) -> Optional[bytes]:
+        """按ID获取缓存中文章的 JSON 片段（入库时已序列化）"""
+        return self._snapshot.get_json(article_id)
     
     def get_status(self) -> Dict[str, Any]:
         """获取缓存状态"""
+        snapshot = self._snapshot
         return {
             "status": self.status.value,
             "error_message": self.error_message,
             "last_update": self.last_update.isoformat() if self.last_update else None,
-            "total_articles": len(self.articles)
+            "total_articles": len(snapshot),
+            "cache_count": len(snapshot),
+            "generation": snapshot.generation
         }
     
+    def set_status(self, status: ServiceStatus, error_message: Optional[str] = None):
+        """设置缓存状态"""
+        self.status = status
+        self.error_message = error_message
+    
     def refresh_data(self):
-        """刷新缓存数据"""
-        self.status = ServiceStatus.PREPARING
+        """刷新缓存数据（刷新期间继续使用旧快照提供服务）"""
         self._load_initial_data()
     
     def append_to_cache(self, articles: List[NewsArticle]):
-        """向缓存中追加文章（用于分批加载）"""
-        self.articles.extend(articles)
-        logger.info(f"向新闻缓存追加 {len(articles)} 篇文章，当前总数: {len(self.articles)}")
+        """
+        向缓存中追加文章（用于分批加载）
+
+        先写入数据库再发布：/search 查询数据库，ETag 却取自快照，
+        新 ETag 出现时数据库中必须已经是对应的数据。
+        """
+        self._persist(articles)
+        with self._write_lock:
+            snapshot = self._snapshot.extend(articles)
+            self._publish_locked(snapshot)
+            self._batches_pending = True
+        self._notify_published(snapshot, batch=True)
+        logger.info(f"向新闻缓存追加 {len(articles)} 篇文章，当前总数: {len(snapshot)}")
+    
+    def finish_batches(self):
+        """
+        一次爬取的分批追加全部完成：以当前快照通知只关心完整结果的回调
+
+        快照文件等回调每次都要处理全部文章，如果每批都调用，首次爬取的开销随批数平方增长。
+        """
+        with self._write_lock:
+            if not self._batches_pending:
+                return
+            self._batches_pending = False
+            snapshot = self._snapshot
+        for listener, batches in self._publish_listeners:
+            if not batches:
+                self._call_listener(listener, snapshot)
+    
+    def update_cache(self, articles: List[NewsArticle]):
+        """
+        用完整的爬取结果替换缓存内容（非首次加载时使用）
+
+        只替换爬取结果中出现的来源：本次没有运行或没有返回文章的来源
+        （如启动时加载的华为文章基础数据）保留缓存中的文章，URL 与爬取结果重复的除外。
+        """
+        articles = self._keep_uncrawled_sources(articles) + list(articles)
+        # 与 append_to_cache 一样先写入数据库再发布
+        self._persist(articles, replace_all=True)
+        snapshot = NewsSnapshot.build(articles, get_content_store())
+        self._publish(snapshot)
+        self.status = ServiceStatus.READY
+        self.error_message = None
+        logger.info(f"新闻缓存已整体更新，当前总数: {len(snapshot)}")
+    
+    def _keep_uncrawled_sources(self, articles: List[Any]) -> List[Dict[str, Any]]:
+        """当前快照中来源不在爬取结果里的文章（完整文章字典，保持原有顺序）"""
+        sources = {article_field(a, "source") for a in articles}
+        urls = {article_field(a, "url") for a in articles}
+        snapshot = self._snapshot
+        kept = [loads(snapshot.export_json(position))
+                for position, article in enumerate(snapshot.articles)
+                if article.source not in sources and article.url not in urls]
+        if kept:
+            logger.info(f"保留 {len(kept)} 篇本次未爬取来源的文章")
+        return kept
+    
+    def _publish(self, snapshot: NewsSnapshot, keep_generation: bool = False):
+        """发布一个已构建完成的快照"""
+        with self._write_lock:
+            self._publish_locked(snapshot, keep_generation)
+            self._batches_pending = False
+        self._notify_published(snapshot)
+    
+    def _publish_locked(self, snapshot: NewsSnapshot, keep_generation: bool = False):
+        """
+        在持有写锁时发布快照：分配代数后用一次引用赋值替换
+
+        keep_generation 为 True 时沿用快照自带的代数（跟随进程加载领导进程发布的快照）。
+        """
+        if not keep_generation:
+            snapshot.generation = self._snapshot.generation + 1
+        snapshot.published_at = datetime.now()
+        self._snapshot = snapshot
+        self.last_update = snapshot.published_at
+    
+    def add_publish_listener(self, listener: Callable[[NewsSnapshot], None], batches: bool = True):
+        """
+        注册快照发布回调（注册时会立即以当前快照调用一次）
+
+        batches 为 False 时分批追加不调用，只在整体发布或 finish_batches 时调用。
+        """
+        self._publish_listeners.append((listener, batches))
+        if self._snapshot.generation > 0:
+            self._call_listener(listener, self._snapshot)
+    
+    def _notify_published(self, snapshot: NewsSnapshot, batch: bool = False):
+        """在写锁之外通知各回调，回调异常不影响发布"""
+        for listener, batches in self._publish_listeners:
+            if batches or not batch:
+                self._call_listener(listener, snapshot)
+    
+    def _call_listener(self, listener, snapshot: NewsSnapshot):
+        try:
+            listener(snapshot)
+        except Exception as e:
+            logger.error(f"快照发布回调执行失败: {e}", exc_info=True)
 
 
 # 全局缓存实例
 _news_cache = None
 
+def _write_snapshot_file(snapshot: NewsSnapshot):
+    """只有领导进程写入共享快照文件"""
+    if get_leader_election().is_leader:
+        get_snapshot_writer().write(snapshot)
+
+def _publish_to_backend(snapshot: NewsSnapshot):
+    """
+    领导进程把发布的快照写入共享缓存后端（没有ID的文章按位置生成键）
+
+    正文按需读取：后端只为内容摘要有变化的文章调用 export_json。
+    """
+    if get_leader_election().is_leader:
+        get_cache_backend().publish_snapshot(
+            ((article.id or f"#{position}", snapshot.content_digest(position),
+              partial(snapshot.export_json, position))
+             for position, article in enumerate(snapshot.articles)),
+            generation=snapshot.generation,
+            fingerprint=snapshot.fingerprint,
+        )
+
 def get_news_cache() -> NewsCache:
     """获取新闻缓存实例（单例模式）"""
     global _news_cache
     if _news_cache is None:
         _news_cache = NewsCache()
+        if settings.enable_snapshot_file or settings.enable_leader_election:
+            # 每次爬取完成后把快照写入共享文件，供其他工作进程映射
+            _news_cache.add_publish_listener(_write_snapshot_file, batches=False)
+        if get_cache_backend().shared:
+            # 每次爬取完成后把快照写入 Redis，供其他主机上的 API 副本读取
+            # （分批写入时不发布，副本每次爬取只需重建一两次快照）
+            _news_cache.add_publish_listener(_publish_to_backend, batches=False)
     return _news_cache
 
 
@@ -215,6 +543,7 @@ class BannerCache:
         self.status = ServiceStatus.PREPARING
         self.error_message = None
         self.last_update = None
+        self._file_mtime: Optional[int] = None  # 已加载的共享文件版本（跟随进程）
         self._load_initial_data()
     
     def _load_initial_data(self):
@@ -232,14 +561,24 @@ class BannerCache:
         """获取轮播图列表"""
         return self.banners
     
+    def get_banner_images(self):
+        """获取轮播图图片信息列表（与 get_banners 相同，供 API 使用）"""
+        return self.banners
+    
     def get_status(self):
         """获取轮播图缓存状态"""
         return {
             "status": self.status.value,
             "error_message": self.error_message,
-            "last_update": self.last_update.isoformat() if self.last_update else None
+            "last_update": self.last_update.isoformat() if self.last_update else None,
+            "cache_count": len(self.banners)
         }
     
+    def set_status(self, status: ServiceStatus, error_message: Optional[str] = None):
+        """设置轮播图缓存状态"""
+        self.status = status
+        self.error_message = error_message
+    
     def set_updating(self, is_updating: bool):
         """设置轮播图缓存更新状态"""
         if is_updating:
@@ -254,6 +593,65 @@ class BannerCache:
         self.status = ServiceStatus.READY
         self.last_update = datetime.now()
         logger.info(f"轮播图缓存更新完成，共 {len(banners)} 张图片")
+        if not get_leader_election().is_leader:
+            return
+        if settings.enable_leader_election:
+            self._save_to_file()
+        backend = get_cache_backend()
+        if backend.shared:
+            try:
+                backend.publish_banners(banners)
+            except Exception as e:
+                logger.error(f"轮播图写入共享缓存后端失败: {e}")
+    
+    def _save_to_file(self):
+        """领导进程把轮播图写入共享文件（先写临时文件再原子替换）"""
+        path = _banner_file_path()
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(dumps(self.banners))
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error(f"写入轮播图共享文件失败: {e}")
+    
+    def sync_backend(self) -> bool:
+        """跟随进程从共享缓存后端加载轮播图，返回是否有更新"""
+        try:
+            banners = get_cache_backend().get_banners()
+        except Exception as e:
+            logger.warning(f"读取共享缓存后端的轮播图失败: {e}")
+            return False
+        if banners is None or banners == self.banners:
+            return False
+        self.banners = banners
+        self.status = ServiceStatus.READY
+        self.last_update = datetime.now()
+        return True
+    
+    def sync_file(self) -> bool:
+        """跟随进程在共享文件更新后重新加载轮播图，返回是否有更新"""
+        path = _banner_file_path()
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            if mtime == self._file_mtime:
+                return False
+            with open(path, "rb") as f:
+                banners = loads(f.read())
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning(f"读取轮播图共享文件失败: {e}")
+            return False
+        self._file_mtime = mtime
+        self.banners = banners
+        self.status = ServiceStatus.READY
+        self.last_update = datetime.now()
+        return True
+
+
+def _banner_file_path() -> str:
+    return f"{settings.snapshot_file_path}.banners.json"
 
 
 def get_banner_cache() -> BannerCache:
@@ -273,4 +671,14 @@ def init_cache():
     get_news_cache()
     # 触发轮播图缓存初始化  
     get_banner_cache()
-    logger.info("所有缓存初始化完成")
\ No newline at end of file
+    logger.info("所有缓存初始化完成")
+
+
+def sync_from_leader():
+    """跟随进程定期执行：加载领导进程发布的新闻快照与轮播图（共享缓存后端或快照文件）"""
+    if get_cache_backend().shared:
+        get_news_cache().sync_backend()
+        get_banner_cache().sync_backend()
+    else:
+        get_news_cache().sync_snapshot_file()
+        get_banner_cache().sync_file()
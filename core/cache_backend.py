@@ -0,0 +1,302 @@
+# Copyright (c) 2025 XBXyftx
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.config import settings
+from core.fast_json import dumps, loads
+
+try:
+    import redis
+except ImportError:  # 未安装时只能使用进程内后端
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# 发布快照时的条目：(文章ID, 内容摘要, 读取完整文章 JSON 的函数)
+# 正文只在文章有变化、需要写入后端时才读取
+ArticleEntry = Tuple[str, bytes, Callable[[], bytes]]
+
+
+class CacheBackend(ABC):
+    """
+    新闻数据的共享缓存后端接口
+
+    领导进程爬取完成并发布快照后，把文章写入后端；其他进程或其他主机上的
+    API 副本轮询版本号，发现新版本后读取整份文章列表重建本地快照。
+    版本号每次发布递增，0 表示还没有发布过。每个版本附带领导进程快照的
+    元数据（代数与内容指纹），跟随进程沿用，不再自行编号。
+    """
+
+    # 是否跨进程共享；进程内后端只用于单进程部署和测试
+    shared = False
+
+    @abstractmethod
+    def get_version(self) -> int:
+        """当前已发布的快照版本号（轮询用，开销很小）"""
+
+    @abstractmethod
+    def get_snapshot(self) -> Tuple[int, List[Dict[str, Any]], Dict[str, Any]]:
+        """读取 (版本号, 按发布顺序排列的完整文章列表, 快照元数据)"""
+
+    @abstractmethod
+    def publish_snapshot(self, articles: Iterable[ArticleEntry], generation: int = 0,
+                         fingerprint: str = "") -> int:
+        """整体替换文章列表，返回新版本号"""
+
+    @abstractmethod
+    def get_article(self, article_id: str) -> Optional[Dict[str, Any]]:
+        """按ID读取单篇完整文章"""
+
+    @abstractmethod
+    def publish_banners(self, banners: List[Dict[str, Any]]):
+        """整体替换轮播图列表"""
+
+    @abstractmethod
+    def get_banners(self) -> Optional[List[Dict[str, Any]]]:
+        """读取轮播图列表，未发布过时返回 None"""
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = {"backend": type(self).__name__, "shared": self.shared}
+        try:
+            stats["version"] = self.get_version()
+        except Exception as e:
+            stats["error"] = str(e)
+        return stats
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """进程内后端：以 JSON 片段保存最近一次发布的数据（摘要未变的文章沿用上一版的片段）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = 0
+        self._order: List[str] = []
+        self._articles: Dict[str, Tuple[bytes, bytes]] = {}  # 文章ID -> (摘要, JSON)
+        self._meta: Dict[str, Any] = {}
+        self._banners: Optional[bytes] = None
+
+    def get_version(self) -> int:
+        return self._version
+
+    def get_snapshot(self) -> Tuple[int, List[Dict[str, Any]], Dict[str, Any]]:
+        with self._lock:
+            return (self._version, [loads(self._articles[key][1]) for key in self._order],
+                    dict(self._meta))
+
+    def publish_snapshot(self, articles: Iterable[ArticleEntry], generation: int = 0,
+                         fingerprint: str = "") -> int:
+        previous = self._articles
+        order, entries = [], {}
+        for article_id, digest, load in articles:
+            order.append(article_id)
+            old = previous.get(article_id)
+            entries[article_id] = old if old is not None and old[0] == digest else (digest, load())
+        with self._lock:
+            self._order, self._articles = order, entries
+            self._meta = {"generation": generation, "fingerprint": fingerprint}
+            self._version += 1
+            return self._version
+
+    def get_article(self, article_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._articles.get(article_id)
+        return loads(entry[1]) if entry is not None else None
+
+    def publish_banners(self, banners: List[Dict[str, Any]]):
+        self._banners = dumps(banners)
+
+    def get_banners(self) -> Optional[List[Dict[str, Any]]]:
+        return loads(self._banners) if self._banners is not None else None
+
+
+def _text(value) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Redis 后端：每个版本有独立的一组键，发布时写入新版本的键再切换版本号
+
+    键布局（prefix 默认为 ohnews）：
+      {prefix}:version              当前版本号
+      {prefix}:v{n}:ids             第 n 版的文章ID列表（发布顺序）
+      {prefix}:v{n}:meta            第 n 版的元数据（代数、内容指纹）
+      {prefix}:v{n}:article:{id}    第 n 版的文章哈希，每个字段的值为 JSON 编码，可以单独 HGET；
+                                    额外的 _digest 字段保存文章内容摘要
+      {prefix}:banners              轮播图列表的 JSON
+    已发布版本的键不再修改，读取方按版本号读取，不会看到新旧混合的文章。
+    发布时只有摘要变化的文章才读取正文并写入，未变化的文章在服务端 COPY
+    上一版的哈希（需要 Redis 6.2+）；切换版本号后上一版的键在 retire_after 秒后过期，
+    新版本中已经不存在的文章随之删除。
+    client 可以注入（如 fakeredis），未注入时按 url 创建 redis 客户端。
+    """
+
+    shared = True
+
+    DIGEST_FIELD = "_digest"
+
+    def __init__(self, client=None, url: Optional[str] = None, prefix: str = "ohnews",
+                 batch_size: int = 500, retire_after: int = 300):
+        if client is None:
+            if redis is None:
+                raise RuntimeError("未安装 redis，无法使用 Redis 缓存后端")
+            client = redis.Redis.from_url(url or "redis://localhost:6379/0")
+        self.client = client
+        self.prefix = prefix
+        self.batch_size = batch_size
+        self.retire_after = retire_after
+        self.last_written = 0
+        self.last_copied = 0
+        # 本进程上一次发布的版本及各文章摘要，避免每次发布都从 Redis 读回
+        self._published: Tuple[int, Dict[str, bytes]] = (0, {})
+
+    def _key(self, *parts: Any) -> str:
+        return ":".join((self.prefix,) + tuple(str(p) for p in parts))
+
+    def _version_key(self, version: int, *parts: Any) -> str:
+        return self._key(f"v{version}", *parts)
+
+    def get_version(self) -> int:
+        value = self.client.get(self._key("version"))
+        return int(value) if value is not None else 0
+
+    def get_snapshot(self) -> Tuple[int, List[Dict[str, Any]], Dict[str, Any]]:
+        # 读取期间版本被切换、旧版本的键已过期时重新读取
+        for _ in range(3):
+            version = self.get_version()
+            if version == 0:
+                return 0, [], {}
+            snapshot = self._read_version(version)
+            if snapshot is not None:
+                return (version,) + snapshot
+        return version, [], {}
+
+    def _read_version(self, version: int) -> Optional[Tuple[List[Dict[str, Any]], Dict[str, Any]]]:
+        """读取指定版本的全部文章与元数据，键已过期（不完整）时返回 None"""
+        meta = self.client.hgetall(self._version_key(version, "meta"))
+        if not meta:
+            return None
+        ids = self.client.lrange(self._version_key(version, "ids"), 0, -1)
+        articles: List[Dict[str, Any]] = []
+        for start in range(0, len(ids), self.batch_size):
+            pipe = self.client.pipeline(transaction=False)
+            for article_id in ids[start:start + self.batch_size]:
+                pipe.hgetall(self._version_key(version, "article", _text(article_id)))
+            for fields in pipe.execute():
+                if not fields:
+                    return None
+                articles.append(self._decode(fields))
+        return articles, self._decode(meta)
+
+    def _published_digests(self, version: int) -> Dict[str, bytes]:
+        """读取指定版本中各文章的内容摘要"""
+        ids = [_text(i) for i in self.client.lrange(self._version_key(version, "ids"), 0, -1)]
+        digests: Dict[str, bytes] = {}
+        for start in range(0, len(ids), self.batch_size):
+            batch = ids[start:start + self.batch_size]
+            pipe = self.client.pipeline(transaction=False)
+            for article_id in batch:
+                pipe.hget(self._version_key(version, "article", article_id), self.DIGEST_FIELD)
+            for article_id, digest in zip(batch, pipe.execute()):
+                if digest is not None:
+                    digests[article_id] = digest
+        return digests
+
+    def publish_snapshot(self, articles: Iterable[ArticleEntry], generation: int = 0,
+                         fingerprint: str = "") -> int:
+        old_version = self.get_version()
+        new_version = old_version + 1
+        previous: Dict[str, bytes] = {}
+        if old_version:
+            published_version, published = self._published
+            previous = published if published_version == old_version else self._published_digests(old_version)
+        digests: Dict[str, bytes] = {}
+        ids: List[str] = []
+        written = copied = 0
+        pipe = self.client.pipeline(transaction=False)
+        for count, (article_id, digest, load) in enumerate(articles, 1):
+            ids.append(article_id)
+            digests[article_id] = digest
+            key = self._version_key(new_version, "article", article_id)
+            if previous.get(article_id) == digest:
+                pipe.copy(self._version_key(old_version, "article", article_id), key, replace=True)
+                copied += 1
+            else:
+                mapping = {name: dumps(value) for name, value in loads(load()).items()}
+                mapping[self.DIGEST_FIELD] = digest
+                pipe.delete(key)
+                pipe.hset(key, mapping=mapping)
+                written += 1
+            if count % self.batch_size == 0:
+                pipe.execute()
+        ids_key = self._version_key(new_version, "ids")
+        pipe.delete(ids_key)
+        for start in range(0, len(ids), self.batch_size):
+            pipe.rpush(ids_key, *ids[start:start + self.batch_size])
+        pipe.hset(self._version_key(new_version, "meta"),
+                  mapping={"generation": dumps(generation), "fingerprint": dumps(fingerprint)})
+        pipe.execute()
+
+        # 切换版本号；上一版的键留给正在读取的副本，过期后自动删除
+        txn = self.client.pipeline(transaction=True)
+        txn.set(self._key("version"), new_version)
+        if old_version:
+            txn.expire(self._version_key(old_version, "ids"), self.retire_after)
+            txn.expire(self._version_key(old_version, "meta"), self.retire_after)
+            for article_id in previous:
+                txn.expire(self._version_key(old_version, "article", article_id), self.retire_after)
+        txn.execute()
+        self._published = (new_version, digests)
+        self.last_written, self.last_copied = written, copied
+        logger.info(f"已向 Redis 发布第 {new_version} 版新闻数据，共 {len(ids)} 篇文章，"
+                    f"写入 {written} 篇，沿用 {copied} 篇")
+        return new_version
+
+    def get_article(self, article_id: str) -> Optional[Dict[str, Any]]:
+        fields = self.client.hgetall(self._version_key(self.get_version(), "article", article_id))
+        return self._decode(fields) if fields else None
+
+    def publish_banners(self, banners: List[Dict[str, Any]]):
+        self.client.set(self._key("banners"), dumps(banners))
+
+    def get_banners(self) -> Optional[List[Dict[str, Any]]]:
+        value = self.client.get(self._key("banners"))
+        return loads(value) if value is not None else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats.update(last_written=self.last_written, last_copied=self.last_copied)
+        return stats
+
+    @classmethod
+    def _decode(cls, fields: Dict[Any, Any]) -> Dict[str, Any]:
+        return {_text(name): loads(value) for name, value in fields.items()
+                if _text(name) != cls.DIGEST_FIELD}
+
+
+# 全局缓存后端实例
+_cache_backend: Optional[CacheBackend] = None
+
+def get_cache_backend() -> CacheBackend:
+    """获取缓存后端实例（单例模式），由 CACHE_BACKEND 选择 memory 或 redis"""
+    global _cache_backend
+    if _cache_backend is None:
+        if settings.cache_backend == "redis":
+            _cache_backend = RedisCacheBackend(url=settings.redis_url, prefix=settings.redis_key_prefix)
+            logger.info(f"使用 Redis 共享缓存后端: {settings.redis_key_prefix}")
+        else:
+            _cache_backend = InMemoryCacheBackend()
+    return _cache_backend
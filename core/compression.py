@@ -0,0 +1,130 @@
+# Copyright (c) 2025 XBXyftx
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gzip
+from typing import Dict, Iterable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import Message, Receive, Scope, Send
+
+try:
+    import brotli  # 可选依赖，未安装时只提供 gzip
+except ImportError:
+    brotli = None
+
+# 热门页在每个快照下第一次被请求时压缩，使用中等压缩等级，避免拖慢该次请求
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# 服务端偏好顺序
+PREFERRED_ENCODINGS = ("br", "gzip")
+
+
+def available_encodings() -> Iterable[str]:
+    """当前环境支持的压缩编码"""
+    return tuple(e for e in PREFERRED_ENCODINGS if e != "br" or brotli is not None)
+
+
+def compress_variants(body: bytes, min_size: int = 0) -> Dict[str, bytes]:
+    """
+    生成响应体的各编码版本，键为 Content-Encoding 取值（原文为 identity）
+
+    小于 min_size 的内容压缩收益不大，只保留原文。
+    """
+    variants = {"identity": body}
+    if len(body) < min_size:
+        return variants
+    # mtime=0 使相同内容的 gzip 结果完全一致
+    variants["gzip"] = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    if brotli is not None:
+        variants["br"] = brotli.compress(body, quality=BROTLI_QUALITY)
+    return variants
+
+
+def _parse_accept_encoding(header: str) -> Dict[str, float]:
+    """解析 Accept-Encoding，返回 {编码: q值}"""
+    weights = {}
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+    return weights
+
+
+def choose_encoding(accept_encoding: Optional[str], available: Iterable[str]) -> str:
+    """
+    按 Accept-Encoding 从已有版本中选出编码，没有可用压缩版本时返回 identity
+
+    q 值相同时按 PREFERRED_ENCODINGS 的顺序优先。
+    """
+    if not accept_encoding:
+        return "identity"
+    weights = _parse_accept_encoding(accept_encoding)
+    best, best_q = "identity", 0.0
+    for encoding in PREFERRED_ENCODINGS:
+        if encoding not in available:
+            continue
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class WeakETagGZipMiddleware(GZipMiddleware):
+    """
+    在线 gzip 压缩中间件，压缩后的响应使用弱 ETag
+
+    压缩后的字节与原文不同，沿用原文的强 ETag 违反强校验语义（与预压缩的热门页面一致，
+    加上 W/ 前缀）；If-None-Match 本来就按弱比较处理，条件请求不受影响。
+    已带 Content-Encoding 的响应由 GZipMiddleware 原样透传，弱 ETag 也不会重复加前缀。
+
+    304 响应没有响应体，不会被压缩：客户端持有的是压缩版本的弱 ETag、且本次仍接受压缩编码时，
+    304 同样返回弱 ETag，与协商到的编码下 200 响应的校验值一致。
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await super().__call__(scope, receive, send)
+            return
+        request_headers = Headers(scope=scope)
+
+        async def send_with_weak_etag(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    if "content-encoding" in headers:
+                        headers["ETag"] = f"W/{etag}"
+                    elif message["status"] == 304 and _holds_compressed_variant(request_headers, etag):
+                        headers["ETag"] = f"W/{etag}"
+            await send(message)
+
+        await super().__call__(scope, receive, send_with_weak_etag)
+
+
+def _holds_compressed_variant(request_headers: Headers, etag: str) -> bool:
+    """条件请求携带的是该 ETag 的弱形式（压缩版本的校验值），且本次请求仍会协商到压缩编码"""
+    if_none_match = request_headers.get("if-none-match", "")
+    if f"W/{etag}" not in (tag.strip() for tag in if_none_match.split(",")):
+        return False
+    return choose_encoding(request_headers.get("accept-encoding"), available_encodings()) != "identity"
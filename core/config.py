@@ -40,10 +40,54 @@ class Settings(BaseSettings):
     enable_scheduler: bool = True
     cache_update_interval: int = 30  # 缓存更新间隔（分钟）
     full_crawl_hour: int = 2         # 完整爬取时间（小时）
+    incremental_crawl: bool = True   # 定时/手动爬取只抓取列表信息有变化的文章详情（完整爬取不受影响）
     
     # 缓存配置
     enable_cache: bool = True
     cache_initial_load: bool = True  # 是否在启动时加载缓存
+    hot_page_count: int = 3          # 预序列化的热门列表页数（第1~N页）
+    hot_page_sizes: list = [20]      # 预序列化的每页数量
+    
+    # 压缩配置
+    enable_compression: bool = True  # 未预压缩的响应是否在线 gzip 压缩
+    compression_min_size: int = 1024 # 小于该字节数的响应不压缩
+    compression_level: int = 5       # 在线压缩等级（预压缩固定使用高等级）
+    
+    # 分层存储配置：元数据常驻内存，正文写入磁盘并经 LRU 缓存
+    enable_content_store: bool = True
+    content_store_path: str = "./article_content.db"
+    content_cache_max_bytes: int = 32 * 1024 * 1024  # 正文 LRU 的内存预算（字节）
+    persist_news_cache: bool = True  # 新闻缓存写入 news_articles，启动时从数据库恢复
+    # 需要浏览器抓取的文章详情（华为开发者文章）缓存：ttl 内直接返回，
+    # 过期后 stale_ttl 内先返回旧内容并在后台刷新
+    enable_detail_cache: bool = True
+    detail_cache_path: str = "./article_detail.db"
+    detail_cache_ttl: int = 6 * 3600
+    detail_cache_stale_ttl: int = 7 * 24 * 3600
+    detail_cache_max_bytes: int = 16 * 1024 * 1024
+    detail_fetch_concurrency: int = 2  # 同时抓取详情的浏览器数量上限（同一文章的并发请求只抓取一次）
+    # 快照发布后预取每个来源最新 N 篇文章的详情（低优先级，请求耗时升高时退避）
+    enable_detail_prefetch: bool = True
+    prefetch_per_source: int = 5
+    prefetch_time_budget: float = 300.0     # 每轮预取的时间预算（秒）
+    prefetch_concurrency: int = 1           # 预取占用的浏览器数量，需小于 detail_fetch_concurrency
+    prefetch_latency_threshold: float = 0.5 # API 请求平均耗时超过该值（秒）时暂停预取
+    # 抓取失败（文章详情、轮播图、图片）的负缓存：连续失败后按指数退避（带随机抖动）暂停重试
+    failure_backoff_base: float = 60.0
+    failure_backoff_max: float = 6 * 3600.0
+    failure_backoff_jitter: float = 0.2
+    # 多进程共享：发布的快照写入文件，其他工作进程 mmap 映射同一文件
+    enable_snapshot_file: bool = False
+    snapshot_file_path: str = "./news_snapshot.bin"
+    # 多工作进程选主：只有持有锁文件的进程运行爬取任务，其余进程读取共享快照文件
+    enable_leader_election: bool = False
+    leader_lock_path: str = "./crawler_leader.lock"
+    leader_check_interval: float = 5.0  # 跟随进程检查领导进程与快照文件的间隔（秒）
+    # 共享缓存后端：memory（进程内）或 redis（多主机 API 副本共享同一份爬取数据）
+    cache_backend: str = "memory"
+    redis_url: Optional[str] = None
+    redis_key_prefix: str = "ohnews"
+    shared_cache_follower: bool = False  # 只读取共享缓存后端，不参与爬取
     
     # 日志配置
     log_level: str = "INFO"
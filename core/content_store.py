@@ -0,0 +1,134 @@
+# Copyright (c) 2025 XBXyftx
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ContentStore:
+    """
+    文章正文的磁盘存储（SQLite）+ 按字节数限制的 LRU 内存缓存
+
+    快照中常驻内存的只有文章元数据和列表卡片，完整文章（含正文内容块）
+    序列化后的 JSON 写入磁盘，读取详情或完整列表时经 LRU 取回。
+    同一文章ID重复写入时覆盖旧内容。
+    """
+
+    def __init__(self, path: str = ":memory:", max_bytes: int = 32 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL" if path != ":memory:" else "PRAGMA journal_mode=MEMORY")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS article_content ("
+            "article_id TEXT PRIMARY KEY, body BLOB NOT NULL)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._lru: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lru_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.writes = 0
+
+    def put_many(self, items: Iterable[Tuple[str, bytes]]):
+        """批量写入（文章ID, 完整文章 JSON），同时让 LRU 中的旧内容失效"""
+        items = list(items)
+        if not items:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO article_content (article_id, body) VALUES (?, ?)", items
+            )
+            self._conn.commit()
+            for article_id, _ in items:
+                self._discard(article_id)
+            self.writes += len(items)
+
+    def get(self, article_id: str, remember: bool = True) -> Optional[bytes]:
+        """读取文章 JSON，优先命中内存 LRU；remember 为 False 时读盘结果不放入 LRU（批量导出用）"""
+        with self._lock:
+            body = self._lru.get(article_id)
+            if body is not None:
+                self._lru.move_to_end(article_id)
+                self.hits += 1
+                return body
+            self.misses += 1
+            row = self._conn.execute(
+                "SELECT body FROM article_content WHERE article_id = ?", (article_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            body = bytes(row[0])
+            if remember:
+                self._remember(article_id, body)
+            return body
+
+    def _remember(self, article_id: str, body: bytes):
+        """放入 LRU，超出字节预算时淘汰最久未使用的条目"""
+        if len(body) > self.max_bytes:
+            return
+        self._lru[article_id] = body
+        self._lru_bytes += len(body)
+        while self._lru_bytes > self.max_bytes:
+            _, evicted = self._lru.popitem(last=False)
+            self._lru_bytes -= len(evicted)
+            self.evictions += 1
+
+    def _discard(self, article_id: str):
+        body = self._lru.pop(article_id, None)
+        if body is not None:
+            self._lru_bytes -= len(body)
+
+    def get_stats(self) -> Dict:
+        """获取命中率与内存占用统计"""
+        with self._lock:
+            stored = self._conn.execute("SELECT COUNT(*) FROM article_content").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "stored_articles": stored,
+                "resident_articles": len(self._lru),
+                "resident_bytes": self._lru_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "writes": self.writes,
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# 全局正文存储实例
+_content_store: Optional[ContentStore] = None
+
+def get_content_store() -> Optional[ContentStore]:
+    """获取正文存储实例（单例模式），未启用分层存储时返回 None"""
+    global _content_store
+    if _content_store is None and settings.enable_content_store:
+        _content_store = ContentStore(settings.content_store_path, settings.content_cache_max_bytes)
+        logger.info(f"文章正文分层存储已启用: {settings.content_store_path}，"
+                    f"内存预算 {settings.content_cache_max_bytes} 字节")
+    return _content_store
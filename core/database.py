@@ -12,9 +12,12 @@
 # limitations under the License.
 
 import sqlite3
+import html
+import json
 import logging
+import re
 from contextlib import contextmanager
-from typing import Generator
+from typing import Any, Dict, Generator, Iterable, List, Optional, Tuple
 import os
 
 logger = logging.getLogger(__name__)
@@ -45,6 +48,9 @@ def init_database():
                 )
             ''')
             
+            _migrate_news_articles(cursor)
+            _create_news_fts(cursor)
+            
             # 创建话题表
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS topics (
@@ -90,6 +96,258 @@ def init_database():
         logger.error(f"数据库初始化失败: {e}")
         raise
 
+def _migrate_news_articles(cursor: sqlite3.Cursor):
+    """news_articles 增加缓存使用的文章ID列（字符串），旧库自动补齐"""
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(news_articles)")}
+    if "article_id" not in columns:
+        cursor.execute("ALTER TABLE news_articles ADD COLUMN article_id TEXT")
+        logger.info("news_articles 表已增加 article_id 列")
+    cursor.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_news_article_id ON news_articles(article_id)"
+    )
+
+# 全文索引：news_fts 的 rowid 与 news_articles.id 一致，body 为正文中所有文本块
+# 由触发器随 news_articles 的插入/删除/更新同步（INSERT OR REPLACE 的隐式删除需要
+# recursive_triggers，见 get_db），只索引缓存写入的文章（article_id 非空）；
+# 更新时只有标题、摘要或正文文本变化才重建该行的索引
+_FTS_BODY_SQL = (
+    "(SELECT group_concat(json_extract(value, '$.value'), char(10)) "
+    "FROM json_each(CASE WHEN json_valid({content}) THEN {content} ELSE '[]' END) "
+    "WHERE json_extract(value, '$.type') = 'text')"
+)
+
+def _create_news_fts(cursor: sqlite3.Cursor):
+    """创建 news_articles 的 FTS5 全文索引（trigram 分词，支持中文子串）及同步触发器"""
+    exists = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'news_fts'"
+    ).fetchone()
+    try:
+        cursor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS news_fts "
+            "USING fts5(title, summary, body, tokenize = 'trigram')"
+        )
+    except sqlite3.OperationalError as e:
+        # SQLite 3.34 以下没有 trigram 分词器，全文搜索不可用但不影响其他功能
+        logger.warning(f"创建全文索引失败，全文搜索不可用: {e}")
+        return
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS news_fts_insert AFTER INSERT ON news_articles
+        WHEN new.article_id IS NOT NULL
+        BEGIN
+            INSERT INTO news_fts (rowid, title, summary, body)
+            VALUES (new.id, new.title, new.summary, {_FTS_BODY_SQL.format(content="new.content")});
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS news_fts_delete AFTER DELETE ON news_articles
+        BEGIN
+            DELETE FROM news_fts WHERE rowid = old.id;
+        END
+    ''')
+    # 旧库中的更新触发器对任何更新都重建索引，替换为只在索引内容变化时触发
+    cursor.execute("DROP TRIGGER IF EXISTS news_fts_update")
+    cursor.execute(f'''
+        CREATE TRIGGER news_fts_update AFTER UPDATE OF article_id, title, summary, content ON news_articles
+        WHEN (old.article_id IS NULL) IS NOT (new.article_id IS NULL)
+          OR old.title IS NOT new.title
+          OR old.summary IS NOT new.summary
+          OR (old.content IS NOT new.content AND
+              {_FTS_BODY_SQL.format(content="old.content")} IS NOT {_FTS_BODY_SQL.format(content="new.content")})
+        BEGIN
+            DELETE FROM news_fts WHERE rowid = old.id;
+            INSERT INTO news_fts (rowid, title, summary, body)
+            SELECT new.id, new.title, new.summary, {_FTS_BODY_SQL.format(content="new.content")}
+            WHERE new.article_id IS NOT NULL;
+        END
+    ''')
+    if not exists:
+        # 旧库首次建立索引时补齐已有文章
+        cursor.execute(
+            "INSERT INTO news_fts (rowid, title, summary, body) "
+            f"SELECT id, title, summary, {_FTS_BODY_SQL.format(content='content')} "
+            "FROM news_articles WHERE article_id IS NOT NULL"
+        )
+        logger.info(f"全文索引已建立，索引文章 {cursor.rowcount} 篇")
+
+# news_articles 中与 NewsArticle 对应的列
+_NEWS_COLUMNS = ("article_id", "title", "date", "url", "category", "summary", "source", "content")
+
+def save_news_articles(articles: Iterable[Dict[str, Any]], replace_all: bool = False) -> int:
+    """
+    把文章写入 news_articles（按文章ID或URL覆盖），返回写入的条数
+    
+    articles 为与 NewsArticle 字段一致的字典，content 以 JSON 存储；
+    replace_all 为 True 时同时删除本次未包含的文章（用于整体更新）。
+    已有文章按ID原位更新，内容没有变化的行不会被改写，全文索引只同步变化的文章。
+    """
+    rows = [
+        (a.get("id"), a.get("title") or "", a.get("date") or "", a.get("url"),
+         a.get("category"), a.get("summary"), a.get("source"),
+         json.dumps(a.get("content") or [], ensure_ascii=False))
+        for a in articles if a.get("id") and a.get("url")
+    ]
+    updates = ", ".join(f"{column} = excluded.{column}" for column in _NEWS_COLUMNS[1:])
+    changed = (f"({', '.join(_NEWS_COLUMNS[1:])}) IS NOT "
+               f"({', '.join('excluded.' + column for column in _NEWS_COLUMNS[1:])})")
+    with get_db() as conn:
+        cursor = conn.cursor()
+        if replace_all:
+            cursor.execute(
+                "DELETE FROM news_articles WHERE article_id IS NOT NULL "
+                "AND article_id NOT IN (SELECT value FROM json_each(?))",
+                (json.dumps([row[0] for row in rows], ensure_ascii=False),)
+            )
+        # URL 已被其他文章（或没有文章ID的旧数据）占用时先删除，与按URL覆盖的语义一致
+        cursor.executemany(
+            "DELETE FROM news_articles WHERE url = ? AND article_id IS NOT ?",
+            [(row[3], row[0]) for row in rows]
+        )
+        cursor.executemany(
+            f"INSERT INTO news_articles ({', '.join(_NEWS_COLUMNS)}, updated_at) "
+            f"VALUES ({', '.join('?' * len(_NEWS_COLUMNS))}, CURRENT_TIMESTAMP) "
+            f"ON CONFLICT(article_id) DO UPDATE SET {updates}, updated_at = CURRENT_TIMESTAMP "
+            f"WHERE {changed}",
+            rows
+        )
+        conn.commit()
+    return len(rows)
+
+def load_news_articles() -> List[Dict[str, Any]]:
+    """按写入顺序读取缓存持久化的全部文章"""
+    with get_db() as conn:
+        rows = conn.execute(
+            f"SELECT {', '.join(_NEWS_COLUMNS)} FROM news_articles "
+            "WHERE article_id IS NOT NULL ORDER BY id"
+        ).fetchall()
+    articles = []
+    for row in rows:
+        article = dict(row)
+        article["id"] = article.pop("article_id")
+        article["content"] = json.loads(article["content"] or "[]")
+        articles.append(article)
+    return articles
+
+# 全文搜索结果中高亮匹配内容的标记
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+# 先用控制字符标出匹配位置，整段 HTML 转义后再替换为高亮标记，爬取文本中的标签不会原样输出
+_MARK_START = "\x02"
+_MARK_END = "\x03"
+# BM25 中标题、摘要、正文的权重
+_BM25_WEIGHTS = (10.0, 5.0, 1.0)
+
+def _fts_phrase(term: str) -> str:
+    """把一个搜索词转换为 FTS5 短语（双引号转义，避免被解析为查询语法）"""
+    return '"' + term.replace('"', '""') + '"'
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+def _render_highlight(marked: Optional[str]) -> Optional[str]:
+    """HTML 转义带匹配位置的文本，再把匹配位置替换为高亮标记"""
+    if marked is None:
+        return None
+    return html.escape(marked).replace(_MARK_START, HIGHLIGHT_START).replace(_MARK_END, HIGHLIGHT_END)
+
+def _highlight_terms(text: str, terms: List[str], width: Optional[int] = 48) -> str:
+    """
+    为不足三个字符的搜索词加上高亮标记（已 HTML 转义）
+
+    width 为 None 时返回完整文本（标题），否则截取第一个匹配附近 width 个字符作为摘录。
+    """
+    pattern = re.compile("|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+    start, end = 0, len(text)
+    if width is not None:
+        match = pattern.search(text)
+        start = max(match.start() - width // 4, 0) if match else 0
+        end = min(start + width, len(text))
+    excerpt = pattern.sub(lambda m: _MARK_START + m.group(0) + _MARK_END, text[start:end])
+    return ("…" if start > 0 else "") + _render_highlight(excerpt) + ("…" if end < len(text) else "")
+
+def fts_available() -> bool:
+    """数据库中是否已建立全文索引"""
+    with get_db() as conn:
+        return conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'news_fts'"
+        ).fetchone() is not None
+
+def search_news_articles(query: str, limit: int = 20, offset: int = 0,
+                         category: Optional[str] = None,
+                         source: Optional[str] = None) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    在标题、摘要和正文文本中全文搜索，返回 (匹配总数, 本页结果)
+
+    空白分隔的多个词为“且”关系。trigram 分词只能索引三个字符及以上的词，
+    这些词用 MATCH 查询并按 BM25 排序（标题、摘要权重更高），结果附带
+    snippet() 生成的高亮摘录；不足三个字符的词（如“鸿蒙”）以 LIKE 条件在
+    全文索引表中过滤，只有这类词时按标题是否命中、写入顺序排序。
+    """
+    terms = [t for t in query.split() if t]
+    if not terms:
+        return 0, []
+    match_terms = [t for t in terms if len(t) >= 3]
+    like_terms = [t for t in terms if len(t) < 3]
+
+    conditions, params = [], []
+    if match_terms:
+        conditions.append("news_fts MATCH ?")
+        params.append(" ".join(_fts_phrase(t) for t in match_terms))
+    for term in like_terms:
+        conditions.append(
+            "(news_fts.title LIKE ? ESCAPE '\\' OR news_fts.summary LIKE ? ESCAPE '\\' "
+            "OR news_fts.body LIKE ? ESCAPE '\\')"
+        )
+        params.extend([_like_pattern(term)] * 3)
+    if category:
+        conditions.append("a.category = ?")
+        params.append(category)
+    if source:
+        conditions.append("a.source = ?")
+        params.append(source)
+    where = " AND ".join(conditions)
+    base = f"FROM news_fts JOIN news_articles a ON a.id = news_fts.rowid WHERE {where}"
+
+    if match_terms:
+        weights = ", ".join(str(w) for w in _BM25_WEIGHTS)
+        columns = (
+            "highlight(news_fts, 0, char(2), char(3)) AS title_highlight, "
+            "snippet(news_fts, -1, char(2), char(3), '…', 24) AS snippet, "
+            f"bm25(news_fts, {weights}) AS score"
+        )
+        order = "score"
+    else:
+        columns = "news_fts.body AS body, NULL AS score"
+        order = "(news_fts.title LIKE ? ESCAPE '\\') DESC, a.id"
+    select = (
+        "SELECT a.article_id, a.title, a.date, a.url, a.category, a.summary, a.source, "
+        f"{columns} {base} ORDER BY {order} LIMIT ? OFFSET ?"
+    )
+    page_params = list(params)
+    if not match_terms:
+        page_params.append(_like_pattern(like_terms[0]))
+    page_params.extend([limit, offset])
+
+    with get_db() as conn:
+        total = conn.execute(f"SELECT COUNT(*) {base}", params).fetchone()[0]
+        rows = conn.execute(select, page_params).fetchall() if total > offset else []
+
+    hits = []
+    for row in rows:
+        hit = dict(row)
+        hit["id"] = hit.pop("article_id")
+        if match_terms:
+            hit["title_highlight"] = _render_highlight(hit["title_highlight"])
+            hit["snippet"] = _render_highlight(hit["snippet"])
+        else:
+            body = hit.pop("body") or ""
+            hit["title_highlight"] = _highlight_terms(hit["title"], like_terms, width=None)
+            hit["snippet"] = _highlight_terms(body or hit.get("summary") or "", like_terms)
+        if hit["score"] is not None:
+            hit["score"] = -hit["score"]  # bm25() 越小越相关，取反后越大越相关
+        hits.append(hit)
+    return total, hits
+
 @contextmanager
 def get_db() -> Generator[sqlite3.Connection, None, None]:
     """获取数据库连接的上下文管理器"""
@@ -97,6 +355,8 @@ def get_db() -> Generator[sqlite3.Connection, None, None]:
     try:
         conn = sqlite3.connect(DB_PATH)
         conn.row_factory = sqlite3.Row  # 使结果可以通过列名访问
+        # INSERT OR REPLACE 覆盖旧行时也触发删除触发器，保持全文索引同步
+        conn.execute("PRAGMA recursive_triggers = ON")
         yield conn
     except Exception as e:
         logger.error(f"数据库连接失败: {e}")
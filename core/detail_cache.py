@@ -0,0 +1,302 @@
+# Copyright (c) 2025 XBXyftx
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from core.config import settings
+from core.fast_json import dumps, loads
+from core.single_flight import SingleFlight
+from core.negative_cache import ARTICLE, NegativeCache, get_negative_cache
+
+logger = logging.getLogger(__name__)
+
+# 详情内容：与 NewsArticle.content 相同格式的内容块列表
+Content = List[Dict[str, Any]]
+
+# 列表数据中不含正文、查看详情时需要用浏览器抓取的文章分类
+DETAIL_FETCH_CATEGORY = "Huawei Developer"
+
+# 抓取失败时爬虫作为正文返回的占位文本（前缀）
+FAILURE_PLACEHOLDERS = ("内容抓取失败", "浏览器初始化失败", "无法找到文章内容区域", "文章内容为空")
+
+
+class DetailFetchError(Exception):
+    """详情抓取失败（包括返回占位内容），retry_after 为距离允许重试的秒数"""
+
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def is_placeholder_content(content: Content) -> bool:
+    """抓取结果是否为空或只有一条错误占位文本"""
+    if not content:
+        return True
+    if len(content) != 1 or content[0].get("type") != "text":
+        return False
+    return str(content[0].get("value", "")).startswith(FAILURE_PLACEHOLDERS)
+
+
+def check_backoff(negative: NegativeCache, article_id: str):
+    """文章详情处于失败退避期时抛出 DetailFetchError"""
+    retry_after = negative.retry_after(ARTICLE, article_id)
+    if retry_after:
+        raise DetailFetchError("文章详情抓取失败，退避中", retry_after)
+
+
+async def fetch_checked(article_id: str, url: str, fetcher: Callable[[str], Content],
+                        negative: NegativeCache) -> Content:
+    """
+    在线程中抓取详情并检查结果
+
+    处于失败退避期时不抓取；抛出异常或返回占位内容时记入负缓存并抛出 DetailFetchError，
+    成功时清除失败记录。
+    """
+    check_backoff(negative, article_id)
+    try:
+        content = await asyncio.to_thread(fetcher, url)
+    except Exception as e:
+        raise DetailFetchError(str(e), negative.record_failure(ARTICLE, article_id, e)) from e
+    if is_placeholder_content(content):
+        error = content[0]["value"] if content else "内容为空"
+        raise DetailFetchError(error, negative.record_failure(ARTICLE, article_id, error))
+    negative.record_success(ARTICLE, article_id)
+    return content
+
+
+def fetch_huawei_detail(url: str) -> Content:
+    """启动浏览器抓取华为开发者文章详情（耗时数秒），抓取完成后立即关闭浏览器"""
+    from services.huawei_blog_api_crawler import HuaweiBlogAPICrawler
+    crawler = HuaweiBlogAPICrawler()
+    try:
+        return crawler._fetch_article_content(url)
+    finally:
+        if crawler.driver:
+            try:
+                crawler.driver.quit()
+            except Exception:
+                pass
+            crawler.driver = None
+
+
+class DetailEntry:
+    """缓存的详情内容（序列化后的 JSON）及抓取时间"""
+
+    __slots__ = ("content", "fetched_at")
+
+    def __init__(self, content: bytes, fetched_at: float):
+        self.content = content
+        self.fetched_at = fetched_at
+
+
+class DetailContentCache:
+    """
+    需要浏览器抓取的文章详情内容缓存（SQLite 持久化 + 按字节数限制的内存 LRU）
+
+    抓取后 ttl 秒内直接返回缓存；超过 ttl 但未超过 ttl + stale_ttl 时
+    先返回旧内容，同时在后台重新抓取（stale-while-revalidate）；
+    更旧或不存在时才同步抓取。抓取函数在线程中执行，不阻塞事件循环；
+    同一文章的并发抓取（包括后台刷新）经 flight 合并为一次。
+    抓取失败或返回错误占位内容时不写入缓存，记入负缓存并抛出 DetailFetchError，
+    退避期内不再抓取（有旧内容时继续返回旧内容）。
+    """
+
+    def __init__(self, path: str = ":memory:", ttl: float = 6 * 3600, stale_ttl: float = 7 * 24 * 3600,
+                 max_bytes: int = 16 * 1024 * 1024, fetcher: Callable[[str], Content] = fetch_huawei_detail,
+                 flight: Optional[SingleFlight] = None, negative: Optional[NegativeCache] = None):
+        self.path = path
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_bytes = max_bytes
+        self.fetcher = fetcher
+        self.flight = flight or SingleFlight()
+        self.negative = negative or NegativeCache()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS article_detail ("
+            "article_id TEXT PRIMARY KEY, url TEXT, content BLOB NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._lru: "OrderedDict[str, DetailEntry]" = OrderedDict()
+        self._lru_bytes = 0
+        self._tasks: Set[asyncio.Task] = set()
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.fetches = 0
+        self.revalidations = 0
+        self.failures = 0
+
+    def lookup(self, article_id: str) -> Optional[DetailEntry]:
+        """读取缓存条目（不论是否过期），优先命中内存 LRU"""
+        with self._lock:
+            entry = self._lru.get(article_id)
+            if entry is not None:
+                self._lru.move_to_end(article_id)
+                return entry
+            row = self._conn.execute(
+                "SELECT content, fetched_at FROM article_detail WHERE article_id = ?", (article_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            entry = DetailEntry(bytes(row[0]), row[1])
+            self._remember(article_id, entry)
+            return entry
+
+    def store(self, article_id: str, url: str, content: Content) -> DetailEntry:
+        """写入抓取结果（内存与磁盘）"""
+        entry = DetailEntry(dumps(content), time.time())
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO article_detail (article_id, url, content, fetched_at) VALUES (?, ?, ?, ?)",
+                (article_id, url, entry.content, entry.fetched_at)
+            )
+            self._conn.commit()
+            self._remember(article_id, entry)
+        return entry
+
+    def _remember(self, article_id: str, entry: DetailEntry):
+        """放入 LRU，超出字节预算时淘汰最久未使用的条目"""
+        old = self._lru.pop(article_id, None)
+        if old is not None:
+            self._lru_bytes -= len(old.content)
+        if len(entry.content) > self.max_bytes:
+            return
+        self._lru[article_id] = entry
+        self._lru_bytes += len(entry.content)
+        while self._lru_bytes > self.max_bytes:
+            _, evicted = self._lru.popitem(last=False)
+            self._lru_bytes -= len(evicted.content)
+
+    async def get_content(self, article_id: str, url: str) -> Content:
+        """获取详情内容：新鲜缓存直接返回，过期但可用时返回旧内容并后台刷新，否则抓取"""
+        entry = self.lookup(article_id)
+        if entry is not None:
+            age = time.time() - entry.fetched_at
+            if age < self.ttl:
+                self.fresh_hits += 1
+                return loads(entry.content)
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._revalidate(article_id, url)
+                return loads(entry.content)
+        self.misses += 1
+        entry = await self._fetch(article_id, url)
+        return loads(entry.content)
+
+    async def prefetch(self, article_id: str, url: str) -> bool:
+        """预取：缓存中没有新鲜内容且不在失败退避期时抓取，返回是否实际发起了抓取"""
+        entry = self.lookup(article_id)
+        if entry is not None and time.time() - entry.fetched_at < self.ttl:
+            return False
+        if self.negative.is_blocked(ARTICLE, article_id):
+            return False
+        await self._fetch(article_id, url)
+        return True
+
+    async def _fetch(self, article_id: str, url: str) -> DetailEntry:
+        """抓取并写入缓存，同一文章的并发抓取共享一次结果"""
+        check_backoff(self.negative, article_id)
+        return await self.flight.do(article_id, lambda: self._fetch_now(article_id, url))
+
+    async def _fetch_now(self, article_id: str, url: str) -> DetailEntry:
+        self.fetches += 1
+        try:
+            content = await fetch_checked(article_id, url, self.fetcher, self.negative)
+        except DetailFetchError:
+            self.failures += 1
+            raise
+        return self.store(article_id, url, content)
+
+    def _revalidate(self, article_id: str, url: str):
+        """在后台重新抓取过期条目，已在抓取中或处于失败退避期时不重复发起"""
+        if self.flight.is_running(article_id) or self.negative.is_blocked(ARTICLE, article_id):
+            return
+        self.revalidations += 1
+        task = asyncio.get_running_loop().create_task(self._revalidate_task(article_id, url))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _revalidate_task(self, article_id: str, url: str):
+        try:
+            await self._fetch(article_id, url)
+        except Exception as e:
+            logger.warning(f"后台刷新文章详情失败 {article_id}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """命中率与内存占用统计"""
+        with self._lock:
+            stored = self._conn.execute("SELECT COUNT(*) FROM article_detail").fetchone()[0]
+            resident, resident_bytes = len(self._lru), self._lru_bytes
+        lookups = self.fresh_hits + self.stale_hits + self.misses
+        return {
+            "stored_articles": stored,
+            "resident_articles": resident,
+            "resident_bytes": resident_bytes,
+            "ttl": self.ttl,
+            "stale_ttl": self.stale_ttl,
+            "fresh_hits": self.fresh_hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.fresh_hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            "fetches": self.fetches,
+            "revalidations": self.revalidations,
+            "failures": self.failures,
+            "single_flight": self.flight.get_stats(),
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# 全局详情缓存实例与详情抓取的 single-flight
+_detail_cache: Optional[DetailContentCache] = None
+_detail_flight: Optional[SingleFlight] = None
+
+def get_detail_flight() -> SingleFlight:
+    """获取详情抓取的 single-flight 实例（单例模式），同时运行的浏览器数量受 detail_fetch_concurrency 限制"""
+    global _detail_flight
+    if _detail_flight is None:
+        _detail_flight = SingleFlight(settings.detail_fetch_concurrency)
+    return _detail_flight
+
+async def fetch_detail_uncached(article_id: str, url: str) -> Content:
+    """未启用详情缓存时抓取详情，同一文章的并发请求仍然合并，失败同样记入负缓存"""
+    negative = get_negative_cache()
+    check_backoff(negative, article_id)
+    return await get_detail_flight().do(
+        article_id, lambda: fetch_checked(article_id, url, fetch_huawei_detail, negative))
+
+def get_detail_cache() -> Optional[DetailContentCache]:
+    """获取详情内容缓存实例（单例模式），未启用时返回 None"""
+    global _detail_cache
+    if _detail_cache is None and settings.enable_detail_cache:
+        _detail_cache = DetailContentCache(
+            settings.detail_cache_path,
+            ttl=settings.detail_cache_ttl,
+            stale_ttl=settings.detail_cache_stale_ttl,
+            max_bytes=settings.detail_cache_max_bytes,
+            flight=get_detail_flight(),
+            negative=get_negative_cache(),
+        )
+    return _detail_cache
@@ -0,0 +1,118 @@
+# Copyright (c) 2025 XBXyftx
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+from typing import Any, Iterable, Iterator, Optional
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ValidationError
+
+from models.news import NewsArticle
+
+try:
+    import orjson
+except ImportError:  # 未安装时退回标准库 json，输出格式一致
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _default(value: Any):
+    """orjson 不能直接序列化的类型"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, set):
+        return list(value)
+    return str(value)
+
+
+def dumps(value: Any) -> bytes:
+    """序列化为紧凑的 UTF-8 JSON 字节"""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def loads(data: bytes) -> Any:
+    """解析 JSON 字节"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def article_json(article) -> bytes:
+    """
+    把完整文章序列化为 JSON 片段，字段与 NewsArticle 一致
+
+    入库时每篇文章只调用一次，校验失败的数据按原样序列化并记录警告。
+    """
+    if isinstance(article, NewsArticle):
+        return dumps(article.model_dump(mode="json"))
+    try:
+        return dumps(NewsArticle.model_validate(article).model_dump(mode="json"))
+    except ValidationError as e:
+        logger.warning(f"文章数据校验失败，按原样序列化: {e}")
+        return dumps(article)
+
+
+def render_news_response(fragments: Iterable[bytes], total: int, page: int, page_size: int,
+                         has_next: bool = False, has_prev: bool = False,
+                         next_cursor: Optional[str] = None) -> bytes:
+    """用预先序列化的文章片段拼接出 NewsResponse 的 JSON，不再逐篇校验和序列化"""
+    return b"".join((
+        b'{"articles":[', b",".join(fragments), b'],',
+        _response_tail(total, page, page_size, has_next, has_prev, next_cursor),
+    ))
+
+
+def iter_news_response(fragments: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    逐段产出把全部文章作为一整页的 NewsResponse JSON（与 render_news_response 的结果相同）
+
+    total 等字段位于 articles 之后，文章输出完才需要知道篇数，不必先把片段收集到列表中。
+    """
+    yield b'{"articles":['
+    count = 0
+    for fragment in fragments:
+        yield b"," + fragment if count else fragment
+        count += 1
+    yield b'],' + _response_tail(count, 1, count)
+
+
+def _response_tail(total: int, page: int, page_size: int, has_next: bool = False,
+                   has_prev: bool = False, next_cursor: Optional[str] = None) -> bytes:
+    """NewsResponse 中 articles 之后的分页字段"""
+    return b"".join((
+        b'"total":', dumps(total),
+        b',"page":', dumps(page),
+        b',"page_size":', dumps(page_size),
+        b',"has_next":', dumps(has_next),
+        b',"has_prev":', dumps(has_prev),
+        b',"next_cursor":', dumps(next_cursor),
+        b"}",
+    ))
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    使用 orjson 的 JSON 响应
+
+    内容为 bytes 时视为已经序列化好的 JSON，直接输出；
+    直接返回该响应会跳过 FastAPI 的 response_model 校验。
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray)):
+            return bytes(content)
+        return dumps(content)
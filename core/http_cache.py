@@ -0,0 +1,81 @@
+# Copyright (c) 2025 XBXyftx
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts) -> str:
+    """由若干组成部分生成强 ETag（带引号）"""
+    digest = hashlib.sha1("\x1f".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def content_etag(body: bytes) -> str:
+    """由响应内容生成强 ETag"""
+    return f'"{hashlib.sha1(body).hexdigest()[:32]}"'
+
+
+def _to_utc(moment: datetime) -> datetime:
+    """缓存中的时间是本地时间（naive），统一换算成 UTC 并去掉微秒"""
+    return moment.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def format_http_date(moment: datetime) -> str:
+    """格式化为 HTTP 日期（RFC 7231 IMF-fixdate）"""
+    return format_datetime(_to_utc(moment), usegmt=True)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    判断条件请求是否可以返回 304
+
+    If-None-Match 优先；只有请求中没有 If-None-Match 时才看 If-Modified-Since。
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        # If-None-Match 使用弱比较，忽略 W/ 前缀
+        return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return _to_utc(last_modified) <= since
+    return False
+
+
+def set_cache_headers(response: Response, etag: str, last_modified: Optional[datetime] = None):
+    """写入校验相关的响应头，要求客户端每次使用前重新验证"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    if last_modified is not None:
+        response.headers["Last-Modified"] = format_http_date(last_modified)
+
+
+def not_modified_response(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    """构造 304 响应"""
+    response = Response(status_code=304)
+    set_cache_headers(response, etag, last_modified)
+    return response
@@ -0,0 +1,94 @@
+# Copyright (c) 2025 XBXyftx
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+from typing import Any, Dict, Tuple
+
+from models.news import NewsContentBlock
+
+# 驻留后的内容块：(类型, 值)
+Block = Tuple[str, str]
+
+
+def _block_key(block) -> Tuple[str, ...]:
+    """内容块的去重键：(类型, 值)，无法识别的块返回空元组"""
+    if isinstance(block, NewsContentBlock):
+        return (block.type.value, block.value)
+    if isinstance(block, tuple) and len(block) == 2:
+        return block
+    if isinstance(block, dict) and block.keys() == {"type", "value"}:
+        block_type, value = block["type"], block["value"]
+        if isinstance(value, str):
+            return (getattr(block_type, "value", block_type), value)
+    return ()
+
+
+class ContentInterner:
+    """
+    入库时的字符串驻留与内容块去重
+
+    爬虫输出中大量重复的内容（统一的页脚段落、相同的图片URL、日期字符串）
+    在缓存里只保留一份对象，各文章记录共享引用（见 ArticleRecord.from_article）。
+    内容块统一保存为不可变的 (类型, 值) 元组。
+    """
+
+    def __init__(self):
+        self._strings: Dict[str, str] = {}
+        self._blocks: Dict[Block, Block] = {}
+        self.string_lookups = 0
+        self.string_hits = 0
+        self.string_bytes_saved = 0
+        self.block_lookups = 0
+        self.block_hits = 0
+        self.block_bytes_saved = 0
+
+    def intern(self, value: str) -> str:
+        """返回与 value 相等的共享字符串"""
+        self.string_lookups += 1
+        shared = self._strings.setdefault(value, value)
+        if shared is not value:
+            self.string_hits += 1
+            self.string_bytes_saved += sys.getsizeof(value)
+        return shared
+
+    def intern_block(self, block):
+        """返回与 block 内容相同的共享内容块元组，无法识别的块原样返回"""
+        key = _block_key(block)
+        if not key:
+            return block
+        self.block_lookups += 1
+        shared = self._blocks.get(key)
+        if shared is None:
+            shared = (self.intern(key[0]), key[1])
+            self._blocks[shared] = shared
+        else:
+            self.block_hits += 1
+            if shared[1] is not key[1]:
+                self.block_bytes_saved += sys.getsizeof(key[1])
+            if shared is not block:
+                self.block_bytes_saved += sys.getsizeof(block)
+        return shared
+
+    def get_report(self) -> Dict[str, Any]:
+        """驻留与去重的统计信息"""
+        return {
+            "unique_strings": len(self._strings),
+            "string_lookups": self.string_lookups,
+            "string_hits": self.string_hits,
+            "string_bytes_saved": self.string_bytes_saved,
+            "unique_blocks": len(self._blocks),
+            "block_lookups": self.block_lookups,
+            "block_hits": self.block_hits,
+            "block_bytes_saved": self.block_bytes_saved,
+            "bytes_saved": self.string_bytes_saved + self.block_bytes_saved,
+        }
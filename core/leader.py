@@ -0,0 +1,132 @@
+# Copyright (c) 2025 XBXyftx
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from fastapi import HTTPException
+
+from core.config import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows 没有 fcntl，退化为单进程模式（当前进程总是领导进程）
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderElection:
+    """
+    基于 fcntl 文件锁的多工作进程选主
+
+    uvicorn 以多个工作进程运行时，只有持有锁文件排他锁的进程（领导进程）
+    运行定时爬取任务并写入共享快照文件，其余进程（跟随进程）只映射该文件。
+    锁由操作系统在进程退出（包括崩溃）时自动释放，跟随进程定期尝试加锁，
+    领导进程挂掉后由最先抢到锁的跟随进程接替。
+    未启用选主或平台不支持 fcntl 时，当前进程始终是领导进程。
+    follow_only 为 True 时当前进程只做跟随进程（如只读取共享缓存后端的 API 副本）。
+    """
+
+    def __init__(self, lock_path: str, enabled: bool = True, follow_only: bool = False):
+        self.lock_path = lock_path
+        self.enabled = (enabled and fcntl is not None) or follow_only
+        self.follow_only = follow_only
+        self._fd: Optional[int] = None
+        self._is_leader = not self.enabled
+        self.elected_at: Optional[datetime] = datetime.now() if self._is_leader else None
+        self.failovers = 0
+
+    @property
+    def is_leader(self) -> bool:
+        return self._is_leader
+
+    def try_acquire(self) -> bool:
+        """尝试以非阻塞方式获取排他锁，返回当前进程是否为领导进程"""
+        if self._is_leader:
+            return True
+        if self.follow_only:
+            return False
+        directory = os.path.dirname(os.path.abspath(self.lock_path))
+        os.makedirs(directory, exist_ok=True)
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        # 锁文件中记录领导进程的 PID，便于排查
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode("ascii"))
+        self._fd = fd
+        self._is_leader = True
+        self.elected_at = datetime.now()
+        logger.info(f"进程 {os.getpid()} 成为领导进程（锁文件: {self.lock_path}）")
+        return True
+
+    def release(self):
+        """释放锁（进程退出时操作系统也会自动释放）"""
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+            self._is_leader = False
+
+    async def monitor(self, on_elected: Callable[[], Awaitable[None]],
+                      on_follow: Callable[[], Any], interval: float):
+        """
+        跟随进程的后台循环：每隔 interval 秒尝试接替领导进程，
+        未成功时执行 on_follow（同步读取领导进程发布的数据，在线程中运行）
+        """
+        while not self._is_leader:
+            await asyncio.sleep(interval)
+            try:
+                if self.try_acquire():
+                    self.failovers += 1
+                    await on_elected()
+                else:
+                    await asyncio.to_thread(on_follow)
+            except Exception as e:
+                logger.error(f"选主后台任务执行失败: {e}", exc_info=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "pid": os.getpid(),
+            "role": "leader" if self._is_leader else "follower",
+            "follow_only": self.follow_only,
+            "elected_at": self.elected_at.isoformat() if self.elected_at else None,
+            "failovers": self.failovers,
+            "lock_path": self.lock_path,
+        }
+
+
+def require_leader():
+    """手动触发的爬取任务只能在领导进程执行，跟随进程返回 409"""
+    if not get_leader_election().is_leader:
+        raise HTTPException(status_code=409, detail="爬取任务由领导进程执行，当前工作进程不能触发，请稍后重试")
+
+
+# 全局选主实例
+_leader_election: Optional[LeaderElection] = None
+
+def get_leader_election() -> LeaderElection:
+    """获取选主实例（单例模式）"""
+    global _leader_election
+    if _leader_election is None:
+        _leader_election = LeaderElection(settings.leader_lock_path, settings.enable_leader_election,
+                                          follow_only=settings.shared_cache_follower)
+    return _leader_election
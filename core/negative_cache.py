@@ -0,0 +1,150 @@
+# Copyright (c) 2025 XBXyftx
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Optional, Tuple
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 失败类型：文章详情、轮播图页面、图片下载
+ARTICLE = "article"
+BANNER = "banner"
+IMAGE = "image"
+
+# 轮播图页面的负缓存键（API 与定时任务共用）
+MOBILE_BANNER_KEY = "mobile"
+
+
+class FailureRecord:
+    """某个键的连续失败次数、最近的错误及下次允许重试的时间"""
+
+    __slots__ = ("failures", "error", "failed_at", "retry_at")
+
+    def __init__(self):
+        self.failures = 0
+        self.error = ""
+        self.failed_at = 0.0
+        self.retry_at = 0.0
+
+
+class NegativeCache:
+    """
+    抓取失败的负缓存（指数退避 + 随机抖动）
+
+    第 n 次连续失败后 base_delay * 2^(n-1) 秒内（不超过 max_delay，
+    再乘以 1 ± jitter 的随机系数，避免多个失败的键同时重试）不再重试；
+    成功后清除记录。记录数超过 max_entries 时淘汰最早失败的键。
+    爬虫线程与事件循环都会调用，内部加锁。
+    """
+
+    def __init__(self, base_delay: float = 60.0, max_delay: float = 6 * 3600.0,
+                 jitter: float = 0.2, max_entries: int = 10000):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._records: "OrderedDict[Tuple[str, str], FailureRecord]" = OrderedDict()
+        self.failures: Dict[str, int] = defaultdict(int)
+        self.recoveries: Dict[str, int] = defaultdict(int)
+        self.suppressed: Dict[str, int] = defaultdict(int)
+
+    def backoff_delay(self, failures: int) -> float:
+        """连续失败 failures 次后的退避时长（秒）"""
+        delay = min(self.base_delay * (2 ** (failures - 1)), self.max_delay)
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def retry_after(self, kind: str, key: str) -> float:
+        """距离允许重试还有多少秒，不在退避期内时返回 0（并计入被拦截的次数）"""
+        with self._lock:
+            record = self._records.get((kind, key))
+            if record is None:
+                return 0.0
+            remaining = record.retry_at - time.time()
+            if remaining <= 0:
+                return 0.0
+            self.suppressed[kind] += 1
+            return remaining
+
+    def is_blocked(self, kind: str, key: str) -> bool:
+        return self.retry_after(kind, key) > 0
+
+    def record_failure(self, kind: str, key: str, error: Any = "") -> float:
+        """记录一次失败，返回本次的退避时长"""
+        with self._lock:
+            record = self._records.pop((kind, key), None) or FailureRecord()
+            record.failures += 1
+            record.error = str(error)[:200]
+            record.failed_at = time.time()
+            delay = self.backoff_delay(record.failures)
+            record.retry_at = record.failed_at + delay
+            self._records[(kind, key)] = record
+            while len(self._records) > self.max_entries:
+                self._records.popitem(last=False)
+            self.failures[kind] += 1
+        logger.warning(f"⚠️ {kind} 抓取失败（连续 {record.failures} 次），{delay:.0f} 秒内不再重试: {key} - {record.error}")
+        return delay
+
+    def record_success(self, kind: str, key: str):
+        """抓取成功，清除失败记录"""
+        with self._lock:
+            if self._records.pop((kind, key), None) is not None:
+                self.recoveries[kind] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """按类型统计失败次数、退避中的键数，并列出最近失败的键"""
+        now = time.time()
+        with self._lock:
+            records = list(self._records.items())
+            kinds = set(self.failures) | set(self.suppressed)
+            stats = {
+                kind: {
+                    "failures": self.failures[kind],
+                    "recoveries": self.recoveries[kind],
+                    "suppressed_retries": self.suppressed[kind],
+                    "backing_off": sum(1 for (k, _), r in records if k == kind and r.retry_at > now),
+                }
+                for kind in sorted(kinds)
+            }
+        recent = [
+            {
+                "kind": kind,
+                "key": key,
+                "failures": record.failures,
+                "error": record.error,
+                "retry_in": round(max(record.retry_at - now, 0.0), 1),
+            }
+            for (kind, key), record in reversed(records[-20:])
+        ]
+        return {"kinds": stats, "tracked": len(records), "recent": recent}
+
+
+# 全局负缓存实例
+_negative_cache: Optional[NegativeCache] = None
+
+def get_negative_cache() -> NegativeCache:
+    """获取抓取失败负缓存实例（单例模式）"""
+    global _negative_cache
+    if _negative_cache is None:
+        _negative_cache = NegativeCache(
+            base_delay=settings.failure_backoff_base,
+            max_delay=settings.failure_backoff_max,
+            jitter=settings.failure_backoff_jitter,
+        )
+    return _negative_cache
@@ -0,0 +1,366 @@
+# Copyright (c) 2025 XBXyftx
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import re
+import calendar
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# 标题与摘要之间的分隔符，避免跨字段拼出不存在的 n-gram
+_FIELD_SEPARATOR = "\n"
+
+# 匹配各爬虫输出的年月部分：2025-09-13 / 2025.9.13 / 2025/9/13 / 2025年9月
+_MONTH_PATTERN = re.compile(r'(\d{4})[.\-/年](\d{1,2})')
+
+# 完整日期（可带时间）：2025-09-13 / 2025.9.13 / 2025年9月13日 / 2025-09-13 10:20:30 / 2025-09-13T10:20
+_DATE_PATTERN = re.compile(
+    r'(\d{4})[.\-/年](\d{1,2})[.\-/月](\d{1,2})日?'
+    r'(?:[ T]+(\d{1,2}):(\d{1,2})(?::(\d{1,2}))?)?'
+)
+
+# 紧凑格式：YYYYMMDD 或 YYYYMMDDHHmmss（华为接口的 publishTime）
+_COMPACT_PATTERN = re.compile(r'^(\d{4})(\d{2})(\d{2})(?:(\d{2})(\d{2})(\d{2}))?$')
+
+
+class NGramIndex:
+    """
+    基于字符二元组/三元组的倒排索引
+
+    中文没有天然的分词边界，这里直接把标题和摘要切成字符 n-gram，
+    查询时对 n-gram 的倒排表求交集得到候选文档，再做一次子串校验，
+    结果与逐篇 `keyword in text` 的语义保持一致。
+    文档编号使用文章在缓存列表中的位置（整数）。
+
+    copy() 得到的副本与原索引共享倒排表，副本第一次修改某个倒排表时
+    才复制它（写时复制），因此可以在不影响原索引读者的前提下增量构建。
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Set[int]] = {}
+        self._texts: Dict[int, str] = {}  # 文档编号 -> 已小写化的可搜索文本
+        self._owned: Optional[Set[str]] = None  # None 表示独占全部倒排表
+
+    def copy(self) -> "NGramIndex":
+        """浅复制索引，倒排表在首次修改时才真正复制"""
+        clone = NGramIndex()
+        clone._postings = dict(self._postings)
+        clone._texts = dict(self._texts)
+        clone._owned = set()
+        return clone
+
+    def _writable_posting(self, gram: str) -> Set[int]:
+        """获取可以原地修改的倒排表（必要时先复制共享的那一份）"""
+        posting = self._postings.get(gram)
+        if posting is None:
+            posting = self._postings[gram] = set()
+            if self._owned is not None:
+                self._owned.add(gram)
+        elif self._owned is not None and gram not in self._owned:
+            posting = self._postings[gram] = set(posting)
+            self._owned.add(gram)
+        return posting
+
+    @staticmethod
+    def _grams(text: str, n: int) -> Set[str]:
+        """切分出文本中所有长度为 n 的字符片段"""
+        return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+    def add(self, doc_id: int, *fields: str):
+        """索引一篇文档（重复添加同一编号会先移除旧内容）"""
+        if doc_id in self._texts:
+            self.remove(doc_id)
+
+        text = _FIELD_SEPARATOR.join(f or "" for f in fields).lower()
+        self._texts[doc_id] = text
+        for n in (2, 3):
+            for gram in self._grams(text, n):
+                self._writable_posting(gram).add(doc_id)
+
+    def remove(self, doc_id: int):
+        """从索引中移除一篇文档"""
+        text = self._texts.pop(doc_id, None)
+        if text is None:
+            return
+        for n in (2, 3):
+            for gram in self._grams(text, n):
+                if gram not in self._postings:
+                    continue
+                posting = self._writable_posting(gram)
+                posting.discard(doc_id)
+                if not posting:
+                    del self._postings[gram]
+
+    def clear(self):
+        """清空索引"""
+        self._postings = {}
+        self._texts = {}
+        self._owned = None
+
+    def search(self, query: str) -> List[int]:
+        """
+        返回包含查询串的文档编号（升序，即缓存中的原始顺序）
+
+        - 单字符查询：直接在预先小写化的文本上做子串判断
+        - 两字符查询：二元组倒排表本身就是精确结果
+        - 三字符及以上：三元组倒排表求交集后再做子串校验
+        """
+        query = query.lower()
+        if not query:
+            return sorted(self._texts)
+
+        if len(query) == 1:
+            return sorted(doc_id for doc_id, text in self._texts.items() if query in text)
+
+        if len(query) == 2:
+            return sorted(self._postings.get(query, ()))
+
+        postings = []
+        for gram in self._grams(query, 3):
+            posting = self._postings.get(gram)
+            if not posting:
+                return []
+            postings.append(posting)
+
+        # 从最短的倒排表开始求交集
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                return []
+
+        return sorted(doc_id for doc_id in candidates if query in self._texts[doc_id])
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+
+def month_bucket(date_str: Optional[str]) -> Optional[str]:
+    """把日期字符串归入 YYYY-MM 月份桶，无法识别时返回 None"""
+    if not date_str:
+        return None
+    match = _MONTH_PATTERN.search(str(date_str))
+    if not match:
+        return None
+    year, month = match.groups()
+    return f"{year}-{int(month):02d}"
+
+
+def parse_timestamp(date_str: Optional[str], end_of_day: bool = False) -> Optional[int]:
+    """
+    把各爬虫输出的日期字符串统一转换为整数时间戳（秒），无法识别时返回 None
+
+    日期按墙上时间直接换算（不做时区转换），只用于排序和区间比较。
+    end_of_day 为 True 且字符串不含时间部分时，返回当天（仅年月时为当月）的最后一秒，
+    用于闭区间的结束日期。
+    """
+    if not date_str:
+        return None
+    text = str(date_str).strip()
+
+    match = _DATE_PATTERN.search(text) or _COMPACT_PATTERN.match(text)
+    if match:
+        year, month, day, hour, minute, second = (int(g) if g else None for g in match.groups())
+        last_day = day
+    else:
+        match = _MONTH_PATTERN.search(text)
+        if not match:
+            return None
+        year, month = (int(g) for g in match.groups())
+        hour = minute = second = None
+        day = 1
+        try:
+            last_day = calendar.monthrange(year, month)[1]
+        except (ValueError, calendar.IllegalMonthError):
+            return None
+
+    has_time = hour is not None
+    if end_of_day and not has_time:
+        day, hour, minute, second = last_day, 23, 59, 59
+
+    try:
+        moment = datetime(year, month, day, hour or 0, minute or 0, second or 0)
+    except ValueError:
+        return None
+    return calendar.timegm(moment.timetuple())
+
+
+def bitmap_from_positions(positions: Iterable[int], size: int) -> int:
+    """由位置列表构造位图"""
+    buffer = bytearray((size + 7) // 8)
+    for position in positions:
+        buffer[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def iter_bits(bitmap: int) -> Iterator[int]:
+    """按从小到大的顺序遍历位图中被置位的位置"""
+    while bitmap:
+        low = bitmap & -bitmap
+        yield low.bit_length() - 1
+        bitmap ^= low
+
+
+def count_bits(bitmap: int) -> int:
+    """位图中被置位的数量（兼容 Python 3.9，没有 int.bit_count）"""
+    return bin(bitmap).count("1")
+
+
+class BitmapIndex:
+    """
+    以 Python 大整数作为位集的倒排索引
+
+    每个取值（分类、来源、月份……）对应一个整数，第 i 位表示缓存中
+    第 i 篇文章是否具有该取值。多条件过滤只需要做按位与/或运算。
+    """
+
+    def __init__(self):
+        self._bitmaps: Dict[str, int] = {}
+
+    def copy(self) -> "BitmapIndex":
+        """复制索引（位图是不可变整数，只需复制字典）"""
+        clone = BitmapIndex()
+        clone._bitmaps = dict(self._bitmaps)
+        return clone
+
+    def add(self, key: Optional[str], position: int):
+        """将 position 标记为具有取值 key"""
+        if key is None:
+            return
+        self._bitmaps[key] = self._bitmaps.get(key, 0) | (1 << position)
+
+    def remove(self, key: Optional[str], position: int):
+        """取消 position 在取值 key 上的标记"""
+        bitmap = self._bitmaps.get(key)
+        if bitmap is None:
+            return
+        bitmap &= ~(1 << position)
+        if bitmap:
+            self._bitmaps[key] = bitmap
+        else:
+            del self._bitmaps[key]
+
+    def clear(self):
+        """清空索引"""
+        self._bitmaps = {}
+
+    def get(self, key: str) -> int:
+        """获取单个取值的位图"""
+        return self._bitmaps.get(key, 0)
+
+    def any_of(self, keys: Iterable[str]) -> int:
+        """获取多个取值的并集位图（同一维度内多选为“或”关系）"""
+        bitmap = 0
+        for key in keys:
+            bitmap |= self._bitmaps.get(key, 0)
+        return bitmap
+
+    def keys(self) -> List[str]:
+        """全部取值"""
+        return list(self._bitmaps)
+
+    def counts(self) -> Dict[str, int]:
+        """各取值对应的文章数量"""
+        return {key: count_bits(bitmap) for key, bitmap in self._bitmaps.items()}
+
+
+class DateIndex:
+    """
+    按时间戳预排序的日期索引
+
+    条目以 (时间戳, 文章ID, 位置) 有序保存，区间查询用 bisect 直接切片，
+    不需要在每次请求时解析日期字符串。(时间戳, 文章ID) 同时作为游标分页的
+    稳定排序键。无法解析日期的文章按 (文章ID, 位置) 单独有序保存，
+    通过 dated 位图可以区分两者。
+    """
+
+    def __init__(self):
+        self._entries: List[Tuple[int, str, int]] = []  # (时间戳, 文章ID, 位置)，升序
+        self._undated: List[Tuple[str, int]] = []  # (文章ID, 位置)，升序
+        self._keys: Dict[int, Tuple[Optional[int], str]] = {}  # 位置 -> (时间戳, 文章ID)
+        self.dated = 0  # 有时间戳的位置位图
+
+    def copy(self) -> "DateIndex":
+        """复制索引"""
+        clone = DateIndex()
+        clone._entries = list(self._entries)
+        clone._undated = list(self._undated)
+        clone._keys = dict(self._keys)
+        clone.dated = self.dated
+        return clone
+
+    def add(self, position: int, timestamp: Optional[int], key: str = ""):
+        """登记 position 的时间戳和排序用的文章ID（已存在时先移除旧值）"""
+        self.remove(position)
+        self._keys[position] = (timestamp, key)
+        if timestamp is None:
+            insort(self._undated, (key, position))
+            return
+        insort(self._entries, (timestamp, key, position))
+        self.dated |= 1 << position
+
+    def remove(self, position: int):
+        """移除 position 的时间戳"""
+        entry = self._keys.pop(position, None)
+        if entry is None:
+            return
+        timestamp, key = entry
+        if timestamp is None:
+            del self._undated[bisect_left(self._undated, (key, position))]
+            return
+        del self._entries[bisect_left(self._entries, (timestamp, key, position))]
+        self.dated &= ~(1 << position)
+
+    def clear(self):
+        """清空索引"""
+        self._entries = []
+        self._undated = []
+        self._keys = {}
+        self.dated = 0
+
+    def timestamp(self, position: int) -> Optional[int]:
+        """获取 position 的时间戳"""
+        entry = self._keys.get(position)
+        return entry[0] if entry else None
+
+    def sort_key(self, position: int) -> Tuple[Optional[int], str]:
+        """获取 position 的排序键 (时间戳, 文章ID)"""
+        return self._keys[position]
+
+    def range(self, start: Optional[int] = None, end: Optional[int] = None) -> List[int]:
+        """返回时间戳落在闭区间 [start, end] 内的位置，按时间升序"""
+        lo = 0 if start is None else bisect_left(self._entries, (start,))
+        hi = len(self._entries) if end is None else bisect_left(self._entries, (end + 1,))
+        return [position for _, _, position in self._entries[lo:hi]]
+
+    def iter_desc_before(self, cursor: Optional[Tuple[Optional[int], str]] = None) -> Iterator[int]:
+        """
+        从新到旧遍历排在游标之后的位置（不含游标本身）
+
+        先遍历有日期的条目（时间戳、文章ID 降序），再遍历无日期的条目（文章ID 降序）；
+        游标为 None 时从最新的一条开始。
+        """
+        if cursor is None:
+            dated_hi, undated_hi = len(self._entries), len(self._undated)
+        elif cursor[0] is None:
+            dated_hi, undated_hi = 0, bisect_left(self._undated, (cursor[1],))
+        else:
+            dated_hi, undated_hi = bisect_left(self._entries, cursor), len(self._undated)
+        for i in range(dated_hi - 1, -1, -1):
+            yield self._entries[i][2]
+        for i in range(undated_hi - 1, -1, -1):
+            yield self._undated[i][1]
+
+    def __len__(self) -> int:
+        return len(self._entries)
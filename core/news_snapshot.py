@@ -0,0 +1,444 @@
+# Copyright (c) 2025 XBXyftx
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import base64
+import hashlib
+import json
+from datetime import datetime
+from itertools import islice, chain
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from models.news import NewsArticle, SortOrder
+from core.fast_json import dumps, loads, article_json
+from core.interning import ContentInterner
+from core.article_record import ArticleRecord, article_field
+from core.content_store import ContentStore
+from core.news_index import (
+    NGramIndex, BitmapIndex, DateIndex, month_bucket,
+    bitmap_from_positions, iter_bits, count_bits
+)
+
+
+def _as_list(value: Union[str, List[str], None]) -> List[str]:
+    """把单个取值或取值列表统一成列表，忽略空值"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return [v for v in value if v]
+
+
+# 列表卡片投影：列表页展示需要的字段，不含正文内容块
+CARD_FIELDS: Tuple[str, ...] = ("id", "title", "date", "url", "category", "summary", "source")
+ARTICLE_FIELDS: Tuple[str, ...] = tuple(NewsArticle.model_fields)
+
+# fields 参数的预设取值
+FIELD_PRESETS = {
+    "card": CARD_FIELDS,
+    "full": None,
+}
+
+
+def resolve_fields(value: Optional[str], default: str = "card") -> Optional[Tuple[str, ...]]:
+    """
+    解析 fields 参数：预设名（card/full）或逗号分隔的字段名
+
+    返回字段元组，None 表示完整文章；包含未知字段时抛出 ValueError。
+    """
+    value = (value or default).strip()
+    if value in FIELD_PRESETS:
+        return FIELD_PRESETS[value]
+    fields = tuple(dict.fromkeys(f.strip() for f in value.split(",") if f.strip()))
+    unknown = [f for f in fields if f not in ARTICLE_FIELDS]
+    if unknown or not fields:
+        raise ValueError(f"未知的字段: {', '.join(unknown) or value}")
+    return fields
+
+
+def project_article(article: ArticleRecord, fields: Tuple[str, ...],
+                    content: Optional[List[Any]] = None) -> Dict[str, Any]:
+    """按字段列表把文章记录投影为 API 格式的字典，content 用于传入从磁盘读取的正文"""
+    return {name: (article.content_blocks() if content is None else content)
+            if name == "content" else getattr(article, name)
+            for name in fields}
+
+
+# 游标：(时间戳或 None, 文章ID)，即 DateIndex 的排序键
+Cursor = Tuple[Optional[int], str]
+
+
+def _digest(body: bytes) -> bytes:
+    """单篇文章 JSON 的摘要（用于快照内容指纹）"""
+    return hashlib.blake2b(body, digest_size=16).digest()
+
+
+def content_fingerprint(digests: Iterable[bytes]) -> str:
+    """按文章顺序组合各篇摘要得到的快照内容指纹（十六进制）"""
+    return hashlib.blake2b(b"".join(digests), digest_size=16).hexdigest()
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    """把排序键编码为不透明的游标字符串"""
+    raw = json.dumps(list(cursor), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Cursor:
+    """解析游标字符串，格式不正确时抛出 ValueError"""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        timestamp, article_id = json.loads(raw.decode("utf-8"))
+    except Exception as e:
+        raise ValueError(f"无效的游标: {token}") from e
+    if (timestamp is not None and not isinstance(timestamp, int)) or not isinstance(article_id, str):
+        raise ValueError(f"无效的游标: {token}")
+    return timestamp, article_id
+
+
+class NewsSnapshot:
+    """
+    新闻缓存的不可变快照：文章记录（ArticleRecord）列表及其全部索引
+
+    快照一旦发布就不再修改。刷新或追加文章时通过 build()/extend()
+    在旁边构建一个新快照，再由 NewsCache 用一次引用赋值整体替换，
+    读请求只需在开始时取一次快照引用，不需要加锁，也不会看到半成品。
+    extend() 与旧快照共享未改动的索引数据（写时复制），追加一批文章
+    不必重建全部索引。
+    指定 content_store 时正文不常驻内存：完整文章的 JSON 写入磁盘存储，
+    内存中只保留元数据、卡片投影及其 JSON 片段。
+    fingerprint 由全部文章的内容按顺序计算，在构建时确定；内容相同的快照
+    （重启后、不同工作进程或主机上）指纹相同，用作 HTTP 缓存校验值。
+    generation 只是发布顺序的计数，不能代表内容。
+    """
+
+    def __init__(self, generation: int = 0, content_store: Optional[ContentStore] = None):
+        self.generation = generation
+        self.published_at: Optional[datetime] = None
+        self._digests: Tuple[bytes, ...] = ()  # 与 articles 一一对应的文章摘要
+        self.fingerprint = content_fingerprint(())
+        self.articles: Tuple[ArticleRecord, ...] = ()
+        self.cards: Tuple[Dict[str, Any], ...] = ()  # 与 articles 一一对应的卡片投影
+        # 入库时序列化好的 JSON 片段（完整文章 / 卡片），列表响应直接拼接；
+        # 完整文章的片段在正文写入磁盘时为 None
+        self.article_json: Tuple[Optional[bytes], ...] = ()
+        self.card_json: Tuple[bytes, ...] = ()
+        self._id_index: Dict[str, int] = {}  # 文章ID -> 在 articles 中的位置
+        self._search_index = NGramIndex()
+        self._category_index = BitmapIndex()
+        self._source_index = BitmapIndex()
+        self._month_index = BitmapIndex()
+        self._date_index = DateIndex()
+        # 入库时的字符串驻留与内容块去重，extend() 产生的快照共用同一个驻留表
+        self._interner = ContentInterner()
+        self._content_store = content_store
+
+    @classmethod
+    def build(cls, articles: Iterable[Any],
+              content_store: Optional[ContentStore] = None) -> "NewsSnapshot":
+        """从一组文章构建全新的快照"""
+        snapshot = cls(content_store=content_store)
+        snapshot._ingest(articles)
+        return snapshot
+
+    @classmethod
+    def from_mapped(cls, mapped) -> "NewsSnapshot":
+        """
+        从映射的快照文件（MappedSnapshotFile）构建快照
+
+        内存中只根据元数据区重建记录、卡片与索引，正文留在共享映射中按需读取。
+        """
+        snapshot = cls(generation=mapped.generation, content_store=mapped)
+        snapshot._ingest(mapped.articles(), write_content=False)
+        snapshot.published_at = mapped.published_at
+        # 文件中只有卡片，沿用写入方按完整内容计算的指纹
+        snapshot.fingerprint = mapped.fingerprint
+        return snapshot
+
+    def extend(self, articles: Iterable[Any]) -> "NewsSnapshot":
+        """在当前快照基础上追加文章，返回新快照（当前快照保持不变）"""
+        snapshot = NewsSnapshot(self.generation, self._content_store)
+        snapshot.articles = self.articles
+        snapshot.cards = self.cards
+        snapshot.article_json = self.article_json
+        snapshot.card_json = self.card_json
+        snapshot._digests = self._digests
+        snapshot._id_index = dict(self._id_index)
+        snapshot._search_index = self._search_index.copy()
+        snapshot._category_index = self._category_index.copy()
+        snapshot._source_index = self._source_index.copy()
+        snapshot._month_index = self._month_index.copy()
+        snapshot._date_index = self._date_index.copy()
+        snapshot._interner = self._interner
+        snapshot._ingest(articles)
+        return snapshot
+
+    def _ingest(self, articles: Iterable[Any], write_content: bool = True):
+        """
+        写入文章并同步更新全部索引（ID已存在时原位替换），只在发布前调用
+
+        write_content 为 False 时正文已在存储中（如快照文件），不再写入。
+        """
+        items = list(self.articles)
+        cards = list(self.cards)
+        article_fragments = list(self.article_json)
+        card_fragments = list(self.card_json)
+        digests = list(self._digests)
+        spilled: List[Tuple[str, bytes]] = []
+        for raw in articles:
+            # 有ID的文章才能按ID回查，正文写入磁盘存储
+            spill = self._content_store is not None and bool(article_field(raw, 'id'))
+            article = ArticleRecord.from_article(raw, self._interner, keep_content=not spill)
+            article_id = article.id
+            position = self._id_index.get(article_id) if article_id else None
+            if position is None:
+                position = len(items)
+                items.append(article)
+                cards.append(None)
+                article_fragments.append(None)
+                card_fragments.append(None)
+                digests.append(None)
+                if article_id:
+                    self._id_index[article_id] = position
+            else:
+                self._unindex_filters(items[position], position)
+                items[position] = article
+            cards[position] = project_article(article, CARD_FIELDS)
+            card_fragments[position] = dumps(cards[position])
+            if article.is_resident:
+                article_fragments[position] = body = article_json(article.to_dict())
+            else:
+                article_fragments[position] = None
+                if write_content and raw is not article:
+                    body = article_json(raw)
+                    spilled.append((article_id, body))
+                else:
+                    # 正文已在存储中，以卡片代替
+                    body = card_fragments[position]
+            digests[position] = _digest(body)
+            self._category_index.add(article.category, position)
+            self._source_index.add(article.source, position)
+            self._month_index.add(month_bucket(article.date), position)
+            self._date_index.add(position, article.timestamp, article_id or "")
+            self._search_index.add(position, article.title, article.summary or "")
+        self.articles = tuple(items)
+        self.cards = tuple(cards)
+        self.article_json = tuple(article_fragments)
+        self.card_json = tuple(card_fragments)
+        self._digests = tuple(digests)
+        self.fingerprint = content_fingerprint(self._digests)
+        if spilled:
+            self._content_store.put_many(spilled)
+
+    def _unindex_filters(self, article: ArticleRecord, position: int):
+        """从位图索引中移除旧文章的标记"""
+        self._category_index.remove(article.category, position)
+        self._source_index.remove(article.source, position)
+        self._month_index.remove(month_bucket(article.date), position)
+
+    def get(self, article_id: str) -> Optional[ArticleRecord]:
+        """按ID查找文章记录（哈希索引，O(1)）"""
+        position = self._id_index.get(article_id)
+        if position is None:
+            return None
+        return self.articles[position]
+
+    def _project(self, positions: Iterable[int], fields: Optional[Tuple[str, ...]],
+                 as_json: bool = False) -> List[Any]:
+        """
+        取出指定位置的文章并投影（卡片投影直接使用预先计算的结果）
+
+        as_json 为 True 时返回 JSON 片段（bytes），完整文章与卡片使用入库时的缓存。
+        """
+        if as_json:
+            if fields is None:
+                return [self._full_json(i) for i in positions]
+            if fields == CARD_FIELDS:
+                return [self.card_json[i] for i in positions]
+            return [dumps(self._project_fields(i, fields)) for i in positions]
+        if fields is None:
+            return [self.articles[i] for i in positions]
+        if fields == CARD_FIELDS:
+            return [self.cards[i] for i in positions]
+        return [self._project_fields(i, fields) for i in positions]
+
+    def _full_json(self, position: int, remember: bool = True) -> bytes:
+        """完整文章的 JSON 片段，正文不在内存中时从磁盘存储读取"""
+        fragment = self.article_json[position]
+        if fragment is None:
+            fragment = self._content_store.get(self.articles[position].id, remember)
+        return fragment
+
+    def export_json(self, position: int) -> bytes:
+        """导出用的完整文章 JSON 片段，从磁盘读取的正文不挤占 LRU"""
+        return self._full_json(position, remember=False)
+
+    def content_digest(self, position: int) -> bytes:
+        """单篇文章内容的摘要，用于判断发布时文章是否有变化"""
+        return self._digests[position]
+
+    @property
+    def content_store(self):
+        """正文存储（ContentStore 或映射的快照文件），正文常驻内存时为 None"""
+        return self._content_store
+
+    def _project_fields(self, position: int, fields: Tuple[str, ...]) -> Dict[str, Any]:
+        """自定义字段投影，需要正文且正文不在内存中时从磁盘存储读取"""
+        article = self.articles[position]
+        content = None
+        if "content" in fields and not article.is_resident:
+            content = loads(self._full_json(position))["content"]
+        return project_article(article, fields, content)
+
+    def full_article(self, article: ArticleRecord) -> NewsArticle:
+        """把文章记录转换为含正文的 API 模型"""
+        if article.is_resident:
+            return article.to_api()
+        return NewsArticle.model_validate_json(self._content_store.get(article.id))
+
+    def get_json(self, article_id: str, remember: bool = True) -> Optional[bytes]:
+        """按ID获取文章的 JSON 片段；remember 为 False 时从磁盘读取的正文不放入 LRU（批量读取用）"""
+        position = self._id_index.get(article_id)
+        if position is None:
+            return None
+        return self._full_json(position, remember)
+
+    def categories(self) -> List[str]:
+        """快照中出现过的全部分类"""
+        return self._category_index.keys()
+
+    def query(self, page: int = 1, page_size: int = 20,
+              category: Union[str, List[str], None] = None,
+              search: Optional[str] = None,
+              source: Union[str, List[str], None] = None,
+              month: Union[str, List[str], None] = None,
+              start_ts: Optional[int] = None,
+              end_ts: Optional[int] = None,
+              sort: SortOrder = SortOrder.DEFAULT,
+              fields: Optional[Tuple[str, ...]] = None,
+              as_json: bool = False) -> Tuple[List[Any], int]:
+        """
+        过滤并分页，返回 (当前页文章, 过滤后的总数)
+
+        同一维度传入多个取值时为“或”关系，不同维度之间为“与”关系，
+        过滤通过位图索引完成，分页作用在过滤后的结果上。
+        start_ts/end_ts 为闭区间时间戳（见 parse_timestamp），通过日期索引二分切片；
+        按日期排序时，无法解析日期的文章排在最后。
+        fields 为投影字段（见 resolve_fields），None 返回完整文章；
+        as_json 为 True 时返回每篇文章的 JSON 片段而不是文章对象。
+        """
+        mask, in_range = self._filter_mask(category, search, source, month, start_ts, end_ts)
+        start = (page - 1) * page_size
+        positions = islice(self._ordered_positions(mask, in_range, sort), start, start + page_size)
+        return self._project(positions, fields, as_json), count_bits(mask)
+
+    def iter_query(self, category: Union[str, List[str], None] = None,
+                   search: Optional[str] = None,
+                   source: Union[str, List[str], None] = None,
+                   month: Union[str, List[str], None] = None,
+                   start_ts: Optional[int] = None,
+                   end_ts: Optional[int] = None,
+                   sort: SortOrder = SortOrder.DEFAULT,
+                   fields: Optional[Tuple[str, ...]] = None,
+                   as_json: bool = False) -> Iterator[Any]:
+        """
+        按与 query() 相同的过滤和排序规则逐篇产出全部匹配文章
+
+        不分页、不复制文章列表，用于流式导出，内存占用与结果数量无关。
+        """
+        mask, in_range = self._filter_mask(category, search, source, month, start_ts, end_ts)
+        for position in self._ordered_positions(mask, in_range, sort):
+            yield self._project((position,), fields, as_json)[0]
+
+    def query_after(self, cursor: Optional[Cursor] = None, limit: int = 20,
+                    category: Union[str, List[str], None] = None,
+                    search: Optional[str] = None,
+                    source: Union[str, List[str], None] = None,
+                    month: Union[str, List[str], None] = None,
+                    start_ts: Optional[int] = None,
+                    end_ts: Optional[int] = None,
+                    fields: Optional[Tuple[str, ...]] = None,
+                    as_json: bool = False) -> Tuple[List[Any], int, Optional[Cursor]]:
+        """
+        游标（keyset）分页，按发布时间从新到旧，返回 (文章, 过滤后的总数, 下一页游标)
+
+        游标是上一页最后一篇文章的 (时间戳, 文章ID)，下一页通过在日期索引上
+        二分定位得到，缓存在翻页期间追加或替换文章也不会导致重复或遗漏。
+        没有更多数据时下一页游标为 None。
+        """
+        size = len(self.articles)
+        mask, _ = self._filter_mask(category, search, source, month, start_ts, end_ts)
+        selected = mask.to_bytes((size + 7) // 8, "little")
+        matched = (p for p in self._date_index.iter_desc_before(cursor)
+                   if (selected[p >> 3] >> (p & 7)) & 1)
+
+        positions = list(islice(matched, limit + 1))
+        next_cursor = None
+        if len(positions) > limit:
+            positions = positions[:limit]
+            next_cursor = self._date_index.sort_key(positions[-1])
+        return self._project(positions, fields, as_json), count_bits(mask), next_cursor
+
+    def _ordered_positions(self, mask: int, in_range: Optional[List[int]],
+                           sort: SortOrder) -> Iterator[int]:
+        """按排序方式惰性产出位图中被选中的位置"""
+        if sort == SortOrder.DEFAULT:
+            return iter_bits(mask)
+        ordered = in_range if in_range is not None else self._date_index.range()
+        if sort == SortOrder.DATE_DESC:
+            ordered = reversed(ordered)
+        selected = mask.to_bytes((len(self.articles) + 7) // 8, "little")
+        matched = (p for p in ordered if (selected[p >> 3] >> (p & 7)) & 1)
+        if in_range is None:
+            # 没有日期的文章排在最后
+            matched = chain(matched, iter_bits(mask & ~self._date_index.dated))
+        return matched
+
+    def _filter_mask(self, category, search, source, month,
+                     start_ts: Optional[int], end_ts: Optional[int]) -> Tuple[int, Optional[List[int]]]:
+        """计算过滤条件对应的位图，同时返回日期区间内的位置（未指定区间时为 None）"""
+        size = len(self.articles)
+
+        # 位图过滤：分类 × 来源 × 月份
+        mask = (1 << size) - 1
+        for index, values in ((self._category_index, _as_list(category)),
+                              (self._source_index, _as_list(source)),
+                              (self._month_index, _as_list(month))):
+            if values:
+                mask &= index.any_of(values)
+
+        # 关键字搜索（走倒排索引）
+        if search:
+            mask &= bitmap_from_positions(self._search_index.search(search), size)
+
+        # 日期区间：在预排序的日期索引上二分切片
+        has_range = start_ts is not None or end_ts is not None
+        in_range = self._date_index.range(start_ts, end_ts) if has_range else None
+        if in_range is not None:
+            mask &= bitmap_from_positions(in_range, size)
+
+        return mask, in_range
+
+    def memory_report(self) -> Dict[str, Any]:
+        """快照的内存概况：文章数、预序列化片段大小与驻留去重节省的字节数"""
+        store = self._content_store
+        return {
+            "articles": len(self.articles),
+            "resident_articles": sum(1 for f in self.article_json if f is not None),
+            "article_json_bytes": sum(len(f) for f in self.article_json if f is not None),
+            "card_json_bytes": sum(len(f) for f in self.card_json),
+            "interning": self._interner.get_report(),
+            "content_store": store.get_stats() if store is not None else None,
+        }
+
+    def __len__(self) -> int:
+        return len(self.articles)
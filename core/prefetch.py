@@ -0,0 +1,193 @@
+# Copyright (c) 2025 XBXyftx
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from models.news import SortOrder
+from core.config import settings
+from core.article_record import ArticleRecord
+from core.detail_cache import DetailContentCache, DETAIL_FETCH_CATEGORY, get_detail_cache
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """
+    API 请求耗时的指数滑动平均
+
+    由请求日志中间件记录；超过 idle_after 秒没有新请求时视为空闲（返回 0）。
+    """
+
+    def __init__(self, alpha: float = 0.2, idle_after: float = 30.0):
+        self.alpha = alpha
+        self.idle_after = idle_after
+        self._average = 0.0
+        self._updated_at = 0.0
+
+    def record(self, seconds: float):
+        self._average += self.alpha * (seconds - self._average)
+        self._updated_at = time.monotonic()
+
+    def current(self) -> float:
+        if time.monotonic() - self._updated_at > self.idle_after:
+            return 0.0
+        return self._average
+
+
+class DetailPrefetcher:
+    """
+    快照发布后的低优先级详情预取
+
+    作为领导进程的发布回调，按来源取最新的 per_source 篇需要浏览器抓取的文章，
+    在 time_budget 秒、concurrency 个并发内把详情抓进 DetailContentCache，
+    用户首次查看这些文章时不再等待浏览器。每次抓取前检查 API 请求耗时，
+    超过 latency_threshold 时按指数退避等待，超出时间预算则放弃本轮剩余文章。
+    预取期间又发布了新快照时，本轮结束后按最新快照再预取一轮。
+    """
+
+    def __init__(self, cache: DetailContentCache, tracker: LatencyTracker,
+                 per_source: int = 5, time_budget: float = 300.0, concurrency: int = 1,
+                 latency_threshold: float = 0.5, max_backoff: float = 30.0):
+        self.cache = cache
+        self.tracker = tracker
+        self.per_source = per_source
+        self.time_budget = time_budget
+        self.concurrency = concurrency
+        self.latency_threshold = latency_threshold
+        self.max_backoff = max_backoff
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self._pending = None
+        self._running = False
+        self.runs = 0
+        self.fetched = 0
+        self.already_cached = 0
+        self.failed = 0
+        self.backoffs = 0
+        self.over_budget = 0
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+        """绑定执行预取的事件循环（发布回调可能在爬虫线程中调用）"""
+        self._loop = loop
+
+    def on_publish(self, snapshot):
+        """快照发布回调：记录最新快照，没有进行中的预取时开始一轮"""
+        if self._loop is None or self.per_source <= 0:
+            return
+        with self._lock:
+            self._pending = snapshot
+            if self._running:
+                return
+            self._running = True
+        asyncio.run_coroutine_threadsafe(self._drain(), self._loop)
+
+    async def _drain(self):
+        while True:
+            with self._lock:
+                snapshot, self._pending = self._pending, None
+                if snapshot is None:
+                    self._running = False
+                    return
+            try:
+                await self.prefetch(snapshot)
+            except Exception as e:
+                logger.error(f"详情预取失败: {e}", exc_info=True)
+
+    def candidates(self, snapshot) -> List[ArticleRecord]:
+        """每个来源最新的 per_source 篇需要浏览器抓取详情的文章"""
+        counts: Dict[Optional[str], int] = defaultdict(int)
+        selected = []
+        for record in snapshot.iter_query(category=DETAIL_FETCH_CATEGORY, sort=SortOrder.DATE_DESC):
+            if record.id and counts[record.source] < self.per_source:
+                counts[record.source] += 1
+                selected.append(record)
+        return selected
+
+    async def prefetch(self, snapshot):
+        """预取一轮，受时间预算、并发数与请求耗时约束"""
+        self.runs += 1
+        deadline = time.monotonic() + self.time_budget
+        semaphore = asyncio.Semaphore(self.concurrency)
+        records = self.candidates(snapshot)
+
+        async def prefetch_one(record: ArticleRecord):
+            async with semaphore:
+                if not await self._wait_until_quiet(deadline):
+                    self.over_budget += 1
+                    return
+                try:
+                    if await self.cache.prefetch(record.id, record.url):
+                        self.fetched += 1
+                    else:
+                        self.already_cached += 1
+                except Exception as e:
+                    self.failed += 1
+                    logger.warning(f"预取文章详情失败 {record.id}: {e}")
+
+        await asyncio.gather(*(prefetch_one(r) for r in records))
+        logger.info(f"详情预取完成：候选 {len(records)} 篇，本轮累计抓取 {self.fetched} 篇，"
+                    f"已缓存 {self.already_cached} 篇，超出预算 {self.over_budget} 篇")
+
+    async def _wait_until_quiet(self, deadline: float) -> bool:
+        """请求耗时过高时指数退避等待，超过截止时间返回 False"""
+        delay = 1.0
+        while True:
+            if time.monotonic() >= deadline:
+                return False
+            if self.tracker.current() <= self.latency_threshold:
+                return True
+            self.backoffs += 1
+            await asyncio.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+            delay = min(delay * 2, self.max_backoff)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._running,
+            "runs": self.runs,
+            "fetched": self.fetched,
+            "already_cached": self.already_cached,
+            "failed": self.failed,
+            "backoffs": self.backoffs,
+            "over_budget": self.over_budget,
+            "request_latency": round(self.tracker.current(), 4),
+            "latency_threshold": self.latency_threshold,
+        }
+
+
+# 全局请求耗时统计与预取器实例
+_latency_tracker = LatencyTracker()
+_prefetcher: Optional[DetailPrefetcher] = None
+
+def get_latency_tracker() -> LatencyTracker:
+    """获取 API 请求耗时统计实例"""
+    return _latency_tracker
+
+def get_detail_prefetcher() -> Optional[DetailPrefetcher]:
+    """获取详情预取器实例（单例模式），未启用预取或详情缓存时返回 None"""
+    global _prefetcher
+    if _prefetcher is None and settings.enable_detail_prefetch:
+        cache = get_detail_cache()
+        if cache is not None:
+            _prefetcher = DetailPrefetcher(
+                cache, _latency_tracker,
+                per_source=settings.prefetch_per_source,
+                time_budget=settings.prefetch_time_budget,
+                concurrency=settings.prefetch_concurrency,
+                latency_threshold=settings.prefetch_latency_threshold,
+            )
+    return _prefetcher
@@ -0,0 +1,151 @@
+# Copyright (c) 2025 XBXyftx
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from core.config import settings
+from core.news_snapshot import NewsSnapshot, CARD_FIELDS
+from core.compression import compress_variants
+from core.fast_json import render_news_response
+
+logger = logging.getLogger(__name__)
+
+# 各列表接口固定附加的过滤条件，API 与预序列化共用同一份定义
+ENDPOINT_FILTERS = {
+    "news": {},
+    "openharmony": {"category": "官方动态", "source": "OpenHarmony"},
+    "blog": {"category": "技术博客", "source": "OpenHarmony技术博客"},
+}
+
+# (接口, 页码, 每页数量, 分类)
+PageKey = Tuple[str, int, int, Optional[str]]
+# Content-Encoding -> 响应体（identity 为未压缩原文）
+PageVariants = Dict[str, bytes]
+
+
+def render_page(snapshot: NewsSnapshot, endpoint: str, page: int, page_size: int,
+                category: Optional[str] = None) -> bytes:
+    """把快照中的一页列表（默认的卡片投影）序列化为最终的 JSON 字节"""
+    filters = dict(ENDPOINT_FILTERS[endpoint])
+    if category:
+        filters["category"] = category
+    fragments, total = snapshot.query(page=page, page_size=page_size, fields=CARD_FIELDS,
+                                      as_json=True, **filters)
+    return render_news_response(fragments, total, page, page_size,
+                                has_next=page * page_size < total, has_prev=page > 1)
+
+
+class HotPageCache:
+    """
+    热门列表页的预序列化缓存
+
+    热门组合（接口 × 第1~N页 × 每页数量 × 分类）在当前快照下第一次被请求时
+    渲染为 JSON 字节并压缩出 gzip/brotli 版本，之后同一快照的请求直接返回。
+    内容指纹变化时整体丢弃旧快照的页面；发布本身不做任何渲染，
+    分批追加频繁发布时也不会在爬取线程上反复重建。
+    """
+
+    def __init__(self, page_count: int = 3, page_sizes=(20,), compress_min_size: int = 1024):
+        self.page_count = page_count
+        self.page_sizes = tuple(page_sizes)
+        self.compress_min_size = compress_min_size
+        # (内容指纹, 页面各编码版本) 作为一个整体替换，读者看到的总是一致的组合
+        self._state: Tuple[Optional[str], Dict[PageKey, PageVariants]] = (None, {})
+        self._lock = threading.Lock()
+        self._published_at: Optional[datetime] = None  # 当前页面所属快照的发布时间
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.last_render_seconds = 0.0
+
+    def get(self, snapshot: NewsSnapshot, key: PageKey) -> Optional[PageVariants]:
+        """
+        获取快照的预序列化页面（各编码版本），本快照第一次请求该页时渲染
+
+        分类不在快照中，或请求拿到的快照已被更新的快照替换时返回 None，由调用方按需渲染。
+        """
+        endpoint, page, page_size, category = key
+        if category is not None and category not in snapshot.categories():
+            return None
+        pages = self._pages_for(snapshot)
+        if pages is None:
+            return None
+        variants = pages.get(key)
+        if variants is not None:
+            self.hits += 1
+            return variants
+        self.misses += 1
+        start_time = time.time()
+        variants = compress_variants(render_page(snapshot, endpoint, page, page_size, category),
+                                     self.compress_min_size)
+        # 并发的首个请求可能重复渲染，结果相同，后写入的覆盖即可
+        pages[key] = variants
+        self.last_render_seconds = time.time() - start_time
+        return variants
+
+    def _pages_for(self, snapshot: NewsSnapshot) -> Optional[Dict[PageKey, PageVariants]]:
+        """返回快照对应的页面字典，内容指纹变化时换成新的空字典"""
+        fingerprint, pages = self._state
+        if fingerprint == snapshot.fingerprint:
+            return pages
+        with self._lock:
+            fingerprint, pages = self._state
+            if fingerprint == snapshot.fingerprint:
+                return pages
+            if self._published_at and snapshot.published_at and snapshot.published_at < self._published_at:
+                # 已有更新快照的页面，不为旧快照替换缓存
+                return None
+            pages = {}
+            self._state = (snapshot.fingerprint, pages)
+            self._published_at = snapshot.published_at
+            self._generation = snapshot.generation
+            logger.debug(f"热门页面缓存切换到第 {snapshot.generation} 代快照")
+            return pages
+
+    def is_hot(self, page: int, page_size: int) -> bool:
+        """该分页参数是否属于预序列化的范围"""
+        return page <= self.page_count and page_size in self.page_sizes
+
+    def get_stats(self) -> Dict:
+        """获取缓存统计信息"""
+        fingerprint, pages = self._state
+        encoded_bytes: Dict[str, int] = {}
+        for variants in pages.values():
+            for encoding, body in variants.items():
+                encoded_bytes[encoding] = encoded_bytes.get(encoding, 0) + len(body)
+        return {
+            "generation": self._generation,
+            "fingerprint": fingerprint,
+            "pages": len(pages),
+            "bytes": encoded_bytes.get("identity", 0),
+            "encoded_bytes": encoded_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "last_render_seconds": round(self.last_render_seconds, 4)
+        }
+
+
+# 全局热门页面缓存实例
+_hot_page_cache: Optional[HotPageCache] = None
+
+def get_hot_page_cache() -> HotPageCache:
+    """获取热门页面缓存实例（单例模式）"""
+    global _hot_page_cache
+    if _hot_page_cache is None:
+        _hot_page_cache = HotPageCache(settings.hot_page_count, settings.hot_page_sizes,
+                                       settings.compression_min_size)
+    return _hot_page_cache
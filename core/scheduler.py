@@ -22,6 +22,7 @@ from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 from .cache import get_news_cache, get_banner_cache, ServiceStatus
+from .negative_cache import BANNER, MOBILE_BANNER_KEY, get_negative_cache
 from services.news_service import get_news_service, NewsSource
 
 logger = logging.getLogger(__name__)
@@ -69,8 +70,9 @@ class TaskScheduler:
         except Exception as e:
             logger.error(f"设置定时任务失败: {e}")
     
-    def _run_crawler_in_thread(self, task_name: str, source: NewsSource = NewsSource.ALL):
-        """在线程中执行爬虫任务"""
+    def _run_crawler_in_thread(self, task_name: str, source: NewsSource = NewsSource.ALL,
+                               incremental: Optional[bool] = None):
+        """在线程中执行爬虫任务（incremental 为 None 时按配置决定是否增量爬取）"""
         try:
             logger.info(f"🚀 开始执行{task_name} - 来源: {source.value}")
             
@@ -81,9 +83,10 @@ class TaskScheduler:
             logger.info(f"📊 {task_name} - 准备并行爬取数据...")
             
             # 执行爬取（分批写入模式，数据已经在爬取过程中写入缓存）
-            articles = news_service.crawl_news(source)
+            articles = news_service.crawl_news(source, incremental=incremental)
             
-            logger.info(f"🔍 {task_name} - 爬取完成，原始文章数: {len(articles)}")
+            logger.info(f"🔍 {task_name} - 爬取完成，原始文章数: {len(articles)}，"
+                        f"增量模式跳过详情抓取 {news_service.last_crawl_stats.get('skipped', 0)} 篇")
             
             # 验证文章数据
             valid_articles = news_service.validate_articles(articles)
@@ -97,6 +100,9 @@ class TaskScheduler:
                 if cache_status['cache_count'] > 0 and cache_status['status'] != 'ready':
                     logger.info(f"🎯 {task_name} - 确保缓存状态为就绪")
                     cache.set_status(ServiceStatus.READY)
+                # 分批写入结束，再写出快照文件等需要完整结果的副本
+                cache.finish_batches()
+                cache._is_first_load = False
                 logger.info(f"🎉 {task_name}完成（首次加载），缓存中共有 {cache_status['cache_count']} 篇文章")
             else:
                 # 后续更新：完整替换缓存，避免数据倒退
@@ -110,6 +116,8 @@ class TaskScheduler:
             # 设置错误状态
             cache = get_news_cache()
             cache.set_status(ServiceStatus.ERROR, str(e))
+            # 已分批写入的文章照常同步给其他工作进程
+            cache.finish_batches()
     
     async def _update_cache_job(self, source: NewsSource = NewsSource.ALL):
         """定时更新缓存任务"""
@@ -126,16 +134,22 @@ class TaskScheduler:
     async def _full_crawl_job(self):
         """完整爬取任务（所有来源）"""
         try:
-            # 在线程池中执行爬虫任务
-            future = self.thread_pool.submit(self._run_crawler_in_thread, "完整爬取任务", NewsSource.ALL)
+            # 在线程池中执行爬虫任务（作为备份，重新抓取全部详情）
+            future = self.thread_pool.submit(self._run_crawler_in_thread, "完整爬取任务", NewsSource.ALL, False)
             # 不等待完成，让任务在后台执行
             logger.info("完整爬取任务已提交到后台线程")
             
         except Exception as e:
             logger.error(f"提交完整爬取任务失败: {e}")
     
-    def _run_banner_crawler_in_thread(self, task_name: str):
-        """在线程中执行轮播图爬虫任务"""
+    def _run_banner_crawler_in_thread(self, task_name: str, respect_backoff: bool = True):
+        """在线程中执行轮播图爬虫任务（最近失败且仍在退避期内时跳过，手动任务不受限制）"""
+        negative = get_negative_cache()
+        if respect_backoff:
+            retry_after = negative.retry_after(BANNER, MOBILE_BANNER_KEY)
+            if retry_after:
+                logger.info(f"⏭️ 跳过{task_name}：最近的轮播图爬取失败，{retry_after:.0f} 秒后才会重试")
+                return
         try:
             logger.info(f"🖼️ 开始执行{task_name}")
             
@@ -179,12 +193,15 @@ class TaskScheduler:
             banner_cache.update_cache(banner_info_list)
             
             if banner_info_list:
+                negative.record_success(BANNER, MOBILE_BANNER_KEY)
                 logger.info(f"✅ {task_name}完成，共更新 {len(banner_info_list)} 张轮播图，状态已设为READY")
             else:
+                negative.record_failure(BANNER, MOBILE_BANNER_KEY, "未找到任何轮播图")
                 logger.warning(f"⚠️ {task_name}完成，但未找到任何轮播图，状态保持PREPARING")
             
         except Exception as e:
             logger.error(f"❌ {task_name}失败: {e}", exc_info=True)
+            negative.record_failure(BANNER, MOBILE_BANNER_KEY, e)
             # 设置错误状态
             banner_cache = get_banner_cache()
             banner_cache.set_status(ServiceStatus.ERROR, str(e))
@@ -253,7 +270,7 @@ class TaskScheduler:
             
             # 在线程池中执行轮播图爬虫任务
             task_name = "手动轮播图爬取任务"
-            future = self.thread_pool.submit(self._run_banner_crawler_in_thread, task_name)
+            future = self.thread_pool.submit(self._run_banner_crawler_in_thread, task_name, False)
             
             # 不等待完成，让任务在后台执行
             logger.info(f"{task_name}已提交到后台线程")
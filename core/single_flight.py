@@ -0,0 +1,86 @@
+# Copyright (c) 2025 XBXyftx
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    按键合并并发的异步调用（single-flight），并限制同时执行的不同调用数量
+
+    同一个键已有调用在执行时，后来的调用直接等待并共享它的结果（或异常），
+    不会再次执行；不同键的调用最多同时执行 max_concurrency 个，其余排队。
+    调用在独立的任务中执行，发起它的请求被取消不影响其他等待者。
+    """
+
+    def __init__(self, max_concurrency: int = 2):
+        self.max_concurrency = max_concurrency
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        # 信号量在首次使用时创建，绑定到运行中的事件循环
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.calls = 0
+        self.shared = 0
+        self.executions = 0
+        self.active = 0
+
+    def is_running(self, key: Hashable) -> bool:
+        """该键是否有调用正在执行或排队"""
+        return key in self._inflight
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """执行 fn（或等待同一键上已在执行的调用），返回其结果"""
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self._run(key, fn))
+            self._inflight[key] = task
+            task.add_done_callback(self._done)
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    async def _run(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        try:
+            async with self._semaphore:
+                self.active += 1
+                self.executions += 1
+                try:
+                    return await fn()
+                finally:
+                    self.active -= 1
+        finally:
+            self._inflight.pop(key, None)
+
+    @staticmethod
+    def _done(task: asyncio.Task):
+        # 所有等待者都已取消时，避免“异常未被获取”的警告
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"single-flight 调用失败: {task.exception()!r}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "shared": self.shared,
+            "executions": self.executions,
+            "active": self.active,
+            "inflight": len(self._inflight),
+            "max_concurrency": self.max_concurrency,
+        }
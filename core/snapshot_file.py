@@ -0,0 +1,213 @@
+# Copyright (c) 2025 XBXyftx
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.config import settings
+from core.fast_json import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+# 文件格式（小端）：
+#   头部   magic, 版本, 保留, 文章数, 代数, 发布时间, 元数据长度, 正文区长度, 内容指纹
+#   元数据 JSON 数组，与快照中的文章位置一一对应：有ID的文章为卡片投影，
+#          没有ID的文章为完整文章（无法按ID回查正文）
+#   偏移表 (文章数 + 1) 个 u64，第 i 篇文章的正文位于正文区 [off[i], off[i+1])，长度为 0 表示无正文
+#   正文区 完整文章 JSON 片段依次拼接
+SNAPSHOT_MAGIC = b"OHNSNAP\0"
+SNAPSHOT_VERSION = 2
+_HEADER = struct.Struct("<8sHHIqdQQ16s")
+_OFFSET = struct.Struct("<Q")
+
+
+def _align(size: int) -> int:
+    return (size + 7) & ~7
+
+
+class SnapshotFileWriter:
+    """
+    把已发布的快照写入单个带版本号的二进制文件
+
+    作为 NewsCache 的发布回调使用。先写临时文件并 fsync，
+    再用 os.replace 原子替换目标文件，读取方始终看到完整的旧文件或新文件。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.writes = 0
+        self.last_generation: Optional[int] = None
+        self.last_bytes = 0
+        self.last_duration_ms = 0.0
+
+    def write(self, snapshot):
+        """序列化快照并原子替换文件；来自快照文件本身的快照不再回写"""
+        if isinstance(snapshot.content_store, MappedSnapshotFile):
+            return
+        start = time.time()
+        with self._lock:
+            meta: List[Dict[str, Any]] = []
+            offsets = [0]
+            chunks: List[bytes] = []
+            for position, article in enumerate(snapshot.articles):
+                if article.id:
+                    meta.append(snapshot.cards[position])
+                    fragment = snapshot.export_json(position)
+                else:
+                    meta.append(loads(snapshot.export_json(position)))
+                    fragment = b""
+                chunks.append(fragment)
+                offsets.append(offsets[-1] + len(fragment))
+            meta_bytes = dumps(meta)
+            published_at = snapshot.published_at.timestamp() if snapshot.published_at else 0.0
+            header = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, len(meta),
+                                  snapshot.generation, published_at, len(meta_bytes), offsets[-1],
+                                  bytes.fromhex(snapshot.fingerprint))
+
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_path, "wb") as f:
+                    f.write(header)
+                    f.write(meta_bytes)
+                    f.write(b"\0" * (_align(len(header) + len(meta_bytes)) - len(header) - len(meta_bytes)))
+                    f.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+                    for chunk in chunks:
+                        f.write(chunk)
+                    f.flush()
+                    os.fsync(f.fileno())
+                    size = f.tell()
+                os.replace(tmp_path, self.path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            self.writes += 1
+            self.last_generation = snapshot.generation
+            self.last_bytes = size
+            self.last_duration_ms = round((time.time() - start) * 1000, 2)
+        logger.info(f"快照文件已写入: {self.path}，第 {snapshot.generation} 代，"
+                    f"{len(meta)} 篇文章，{size} 字节，耗时 {self.last_duration_ms}ms")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "role": "writer",
+            "path": self.path,
+            "writes": self.writes,
+            "generation": self.last_generation,
+            "bytes": self.last_bytes,
+            "duration_ms": self.last_duration_ms,
+        }
+
+
+class MappedSnapshotFile:
+    """
+    只读映射的快照文件
+
+    整个文件通过 mmap 映射，多个工作进程映射同一文件时共享同一份物理页；
+    文章正文只在按ID读取时从映射中切出。实现了与 ContentStore 相同的
+    get()/get_stats() 接口，可直接作为 NewsSnapshot 的正文存储。
+    文件被替换后旧映射保持有效，直到不再被引用的快照释放。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            self.identity: Tuple[int, int] = (stat.st_ino, stat.st_mtime_ns)
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mm) < _HEADER.size:
+            raise ValueError(f"快照文件不完整: {path}")
+        if self._mm[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            raise ValueError(f"不是快照文件: {path}")
+        version, = struct.unpack_from("<H", self._mm, len(SNAPSHOT_MAGIC))
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"不支持的快照文件版本: {version}")
+        (magic, version, _, count, generation, published_at,
+         meta_len, blob_len, fingerprint) = _HEADER.unpack_from(self._mm, 0)
+        self.count = count
+        self.generation = generation
+        self.fingerprint = fingerprint.hex()
+        self.published_at = datetime.fromtimestamp(published_at) if published_at else None
+        self._meta_start = _HEADER.size
+        self._meta_len = meta_len
+        self._offsets_start = _align(_HEADER.size + meta_len)
+        self._blob_start = self._offsets_start + (count + 1) * _OFFSET.size
+        if len(self._mm) != self._blob_start + blob_len:
+            raise ValueError(f"快照文件大小与头部不符: {path}")
+        self._positions: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def articles(self) -> List[Dict[str, Any]]:
+        """解析元数据区，返回与文章位置对应的卡片（或完整文章）列表，同时建立ID索引"""
+        start = self._meta_start
+        meta = loads(self._mm[start:start + self._meta_len])
+        self._positions = {item["id"]: i for i, item in enumerate(meta) if item.get("id")}
+        return meta
+
+    def get_at(self, position: int) -> Optional[bytes]:
+        """按位置读取完整文章 JSON"""
+        begin, = _OFFSET.unpack_from(self._mm, self._offsets_start + position * _OFFSET.size)
+        end, = _OFFSET.unpack_from(self._mm, self._offsets_start + (position + 1) * _OFFSET.size)
+        if begin == end:
+            return None
+        return self._mm[self._blob_start + begin:self._blob_start + end]
+
+    def get(self, article_id: str, remember: bool = True) -> Optional[bytes]:
+        """按ID读取完整文章 JSON（从映射中切出，不经过 LRU）"""
+        position = self._positions.get(article_id)
+        if position is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self.get_at(position)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "role": "reader",
+            "path": self.path,
+            "generation": self.generation,
+            "articles": self.count,
+            "mapped_bytes": len(self._mm),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def snapshot_file_changed(path: str, current: Optional[MappedSnapshotFile]) -> bool:
+    """文件是否已被替换为新版本（按 inode 与修改时间判断）"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return False
+    return current is None or (stat.st_ino, stat.st_mtime_ns) != current.identity
+
+
+# 全局快照文件写入器
+_snapshot_writer: Optional[SnapshotFileWriter] = None
+
+def get_snapshot_writer() -> SnapshotFileWriter:
+    """获取快照文件写入器实例（单例模式）"""
+    global _snapshot_writer
+    if _snapshot_writer is None:
+        _snapshot_writer = SnapshotFileWriter(settings.snapshot_file_path)
+    return _snapshot_writer
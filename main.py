@@ -22,7 +22,10 @@ from core.config import settings
 from core.logging_config import setup_logging
 from core.database import init_database
 from core.scheduler import start_scheduler, stop_scheduler, get_scheduler
-from core.cache import init_cache, get_news_cache
+from core.cache import init_cache, get_news_cache, sync_from_leader
+from core.leader import get_leader_election
+from core.prefetch import get_latency_tracker, get_detail_prefetcher
+from core.compression import WeakETagGZipMiddleware
 
 # 导入API路由
 from api import news, banner
@@ -49,12 +52,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 压缩中间件：只处理没有预压缩的响应（已带 Content-Encoding 的响应原样透传），
+# 在线压缩的响应 ETag 改为弱 ETag
+if settings.enable_compression:
+    app.add_middleware(
+        WeakETagGZipMiddleware,
+        minimum_size=settings.compression_min_size,
+        compresslevel=settings.compression_level,
+    )
+
 # 请求日志中间件
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     start_time = time.time()
     response = await call_next(request)
     process_time = time.time() - start_time
+    # 详情预取根据请求耗时退避
+    get_latency_tracker().record(process_time)
     
     logger.info(
         f"{request.method} {request.url.path} - "
@@ -181,6 +195,10 @@ async def startup_event():
         logger.error(f"数据库初始化失败: {e}")
         raise
     
+    # 多工作进程选主：缓存初始化前确定角色，跟随进程不爬取
+    election = get_leader_election()
+    is_leader = election.try_acquire()
+    
     # 初始化缓存
     try:
         init_cache()
@@ -189,6 +207,29 @@ async def startup_event():
         logger.error(f"缓存初始化失败: {e}")
         raise
     
+    if is_leader:
+        await _start_leader_tasks()
+    else:
+        logger.info("当前进程为跟随进程，读取领导进程发布的快照文件")
+        # 定期同步快照文件，领导进程退出后自动接替
+        app.state.leader_monitor = asyncio.create_task(election.monitor(
+            on_elected=_start_leader_tasks,
+            on_follow=sync_from_leader,
+            interval=settings.leader_check_interval,
+        ))
+    
+    logger.info("应用启动完成")
+
+async def _start_leader_tasks():
+    """领导进程：启动定时任务调度器并执行初始缓存加载"""
+    get_news_cache().detach_snapshot_file()
+    
+    # 每次发布快照后在后台预取最新文章的详情
+    prefetcher = get_detail_prefetcher()
+    if prefetcher is not None:
+        prefetcher.start(asyncio.get_running_loop())
+        get_news_cache().add_publish_listener(prefetcher.on_publish)
+    
     # 启动定时任务调度器
     if settings.enable_scheduler:
         try:
@@ -206,21 +247,25 @@ async def startup_event():
     except Exception as e:
         logger.error(f"初始缓存加载失败: {e}")
         # 不抛出异常，让服务继续启动
-    
-    logger.info("应用启动完成")
 
 # 应用关闭事件
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("应用关闭中...")
     
-    # 停止定时任务调度器
-    if settings.enable_scheduler:
+    monitor = getattr(app.state, "leader_monitor", None)
+    if monitor is not None:
+        monitor.cancel()
+    
+    # 停止定时任务调度器（只有领导进程启动过）
+    election = get_leader_election()
+    if settings.enable_scheduler and election.is_leader:
         try:
             stop_scheduler()
             logger.info("定时任务调度器已停止")
         except Exception as e:
             logger.error(f"停止定时任务调度器失败: {e}")
+    election.release()
     
     logger.info("应用关闭完成")
 
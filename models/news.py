@@ -12,7 +12,7 @@
 # limitations under the License.
 
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Annotated, Any, Dict, List, Optional, Union
 from datetime import datetime
 from enum import Enum
 
@@ -22,6 +22,11 @@ class ContentType(str, Enum):
     VIDEO = "video"
     CODE = "code"
 
+class SortOrder(str, Enum):
+    DEFAULT = "default"      # 缓存中的原始顺序
+    DATE_DESC = "date_desc"  # 按发布时间从新到旧
+    DATE_ASC = "date_asc"    # 按发布时间从旧到新
+
 class NewsContentBlock(BaseModel):
     type: ContentType
     value: str
@@ -39,12 +44,35 @@ class NewsArticle(BaseModel):
     updated_at: Optional[datetime] = None
 
 class NewsResponse(BaseModel):
-    articles: List[NewsArticle]
+    # 完整文章，或按 fields 参数投影后的部分字段（列表默认为不含正文的卡片）；
+    # 依次尝试，完整文章仍按 NewsArticle 校验
+    articles: List[Annotated[Union[NewsArticle, Dict[str, Any]], Field(union_mode="left_to_right")]]
     total: int
     page: int
     page_size: int
     has_next: bool = Field(False, description="是否有下一页")
     has_prev: bool = Field(False, description="是否有上一页")
+    next_cursor: Optional[str] = Field(None, description="游标分页模式下的下一页游标")
+
+class NewsSearchHit(BaseModel):
+    id: str
+    title: str
+    date: str
+    url: str
+    category: Optional[str] = None
+    summary: Optional[str] = None
+    source: Optional[str] = None
+    title_highlight: str = Field(description="标题（已 HTML 转义），匹配内容以 <mark> 标出")
+    snippet: Optional[str] = Field(None, description="匹配位置附近的摘录（已 HTML 转义），匹配内容以 <mark> 标出")
+    score: Optional[float] = Field(None, description="BM25 相关度（越大越相关），只含短词的查询为空")
+
+class NewsSearchResponse(BaseModel):
+    query: str
+    hits: List[NewsSearchHit]
+    total: int
+    page: int
+    page_size: int
+    has_next: bool = False
 
 class SearchRequest(BaseModel):
     keyword: str
@@ -651,7 +651,9 @@ class EnhancedMobileBannerCrawler:
         return unique_images
     
     def _download_images(self, images: List[Dict], save_directory: str):
-        """下载图片到本地"""
+        """下载图片到本地（最近下载失败且仍在退避期内的图片直接跳过）"""
+        from core.negative_cache import IMAGE, get_negative_cache
+        negative = get_negative_cache()
         logger.info(f"⬇️ 开始下载 {len(images)} 张图片到: {save_directory}")
         
         os.makedirs(save_directory, exist_ok=True)
@@ -663,6 +665,12 @@ class EnhancedMobileBannerCrawler:
         
         download_count = 0
         for img_info in images:
+            retry_after = negative.retry_after(IMAGE, img_info['url'])
+            if retry_after:
+                logger.info(f"⏭️ 跳过下载失败退避中的图片: {img_info['url']}（{retry_after:.0f} 秒后重试）")
+                img_info['downloaded'] = False
+                img_info['download_error'] = f"下载失败退避中，{retry_after:.0f} 秒后重试"
+                continue
             try:
                 img_url = img_info['url']
                 filename = img_info['filename']
@@ -682,6 +690,7 @@ class EnhancedMobileBannerCrawler:
                 img_info['local_path'] = file_path
                 img_info['file_size'] = len(response.content)
                 img_info['downloaded'] = True
+                negative.record_success(IMAGE, img_url)
                 
                 download_count += 1
                 logger.info(f"✅ 下载成功: {filename} ({len(response.content)} bytes)")
@@ -690,6 +699,7 @@ class EnhancedMobileBannerCrawler:
                 
             except Exception as e:
                 logger.error(f"❌ 下载失败: {img_info.get('filename', 'unknown')} - {e}")
+                negative.record_failure(IMAGE, img_info['url'], e)
                 img_info['downloaded'] = False
                 img_info['download_error'] = str(e)
         
@@ -424,13 +424,22 @@ class MobileBannerCrawler:
     
     def download_image(self, image_info, save_directory="downloads/banners"):
         """
-        下载图片到本地
+        下载图片到本地（最近下载失败且仍在退避期内的图片直接跳过）
         """
+        from core.negative_cache import IMAGE, get_negative_cache
+        negative = get_negative_cache()
+        img_url = image_info['url']
+        retry_after = negative.retry_after(IMAGE, img_url)
+        if retry_after:
+            logger.info(f"⏭️ 跳过下载失败退避中的图片: {img_url}（{retry_after:.0f} 秒后重试）")
+            image_info['downloaded'] = False
+            image_info['download_error'] = f"下载失败退避中，{retry_after:.0f} 秒后重试"
+            return False
+        
         try:
             # 创建保存目录
             os.makedirs(save_directory, exist_ok=True)
             
-            img_url = image_info['url']
             filename = image_info['filename']
             
             # 确保文件名有扩展名
@@ -459,11 +468,13 @@ class MobileBannerCrawler:
             image_info['local_path'] = file_path
             image_info['file_size'] = file_size
             image_info['downloaded'] = True
+            negative.record_success(IMAGE, img_url)
             
             return True
             
         except Exception as e:
             logger.error(f"❌ 下载图片失败: {img_url}, 错误: {e}")
+            negative.record_failure(IMAGE, img_url, e)
             image_info['downloaded'] = False
             image_info['download_error'] = str(e)
             return False
@@ -12,8 +12,9 @@
 # limitations under the License.
 
 import logging
-from typing import List, Dict, Optional
+from typing import Any, Callable, List, Dict, Optional
 from enum import Enum
+from datetime import datetime
 
 from .openharmony_news_crawler import OpenHarmonyNewsCrawler
 from .openharmony_blog_crawler import OpenHarmonyBlogCrawler
@@ -39,18 +40,43 @@ class NewsService:
         self.openharmony_blog_crawler = OpenHarmonyBlogCrawler()
         self.huawei_blog_crawler = HuaweiBlogCrawler()
         self.huawei_developer_crawler = HuaweiDeveloperBlogCrawler()
+        # 最近一次爬取各来源的统计（含增量模式跳过的详情抓取数）
+        self.last_crawl_stats: Dict[str, Any] = {}
     
-    def crawl_news(self, source: NewsSource = NewsSource.ALL) -> List[Dict]:
+    def _cached_article_lookup(self) -> Callable[[str], Optional[Dict]]:
+        """
+        增量爬取：按文章ID查询爬取开始时缓存中的完整文章（缓存启动时已从数据库恢复）
+
+        爬取会逐篇查询全部文章，读盘结果不放入正文 LRU，以免挤掉请求的热点文章。
+        """
+        from core.cache import get_news_cache
+        from core.fast_json import loads
+        snapshot = get_news_cache().snapshot
+        
+        def lookup(article_id: str) -> Optional[Dict]:
+            body = snapshot.get_json(article_id, remember=False)
+            return loads(body) if body else None
+        return lookup
+    
+    def crawl_news(self, source: NewsSource = NewsSource.ALL, incremental: Optional[bool] = None) -> List[Dict]:
         """
         根据指定源爬取新闻
         
         Args:
             source: 新闻源类型
+            incremental: 是否增量爬取（默认取 settings.incremental_crawl）。
+                增量模式下 OpenHarmony 官网与技术博客只抓取列表信息（url、标题、发布时间）
+                新增或变化的文章详情，其余文章沿用缓存内容
             
         Returns:
             统一格式的新闻文章列表
         """
+        from core.config import settings
         articles = []
+        if incremental is None:
+            incremental = settings.incremental_crawl
+        known = self._cached_article_lookup() if incremental else None
+        self.last_crawl_stats = {"incremental": incremental, "started_at": datetime.now().isoformat()}
         
         try:
             # 通用分批回调函数
@@ -103,8 +129,9 @@ class NewsService:
                 oh_batch_callback = create_batch_callback("OpenHarmony官网")
                 start_time = time.time()
                 oh_articles = self.openharmony_crawler.crawl_openharmony_news(
-                    batch_callback=oh_batch_callback, batch_size=20)
+                    batch_callback=oh_batch_callback, batch_size=20, known=known)
                 end_time = time.time()
+                self.last_crawl_stats[NewsSource.OPENHARMONY.value] = dict(self.openharmony_crawler.last_crawl_stats)
                 
                 articles.extend(oh_articles)
                 logger.info(f"✅ OpenHarmony官网新闻爬取完成，获取 {len(oh_articles)} 篇文章，耗时 {end_time-start_time:.2f}秒")
@@ -116,8 +143,9 @@ class NewsService:
                 blog_batch_callback = create_batch_callback("OpenHarmony博客")
                 start_time = time.time()
                 blog_articles = self.openharmony_blog_crawler.crawl_openharmony_blog_news(
-                    batch_callback=blog_batch_callback, batch_size=20)
+                    batch_callback=blog_batch_callback, batch_size=20, known=known)
                 end_time = time.time()
+                self.last_crawl_stats[NewsSource.OPENHARMONY_BLOG.value] = dict(self.openharmony_blog_crawler.last_crawl_stats)
                 
                 articles.extend(blog_articles)
                 logger.info(f"✅ OpenHarmony技术博客爬取完成，获取 {len(blog_articles)} 篇文章，耗时 {end_time-start_time:.2f}秒")
@@ -171,6 +199,9 @@ class NewsService:
             logger.error(f"新闻爬取过程中发生错误: {e}")
             raise
         
+        self.last_crawl_stats["skipped"] = sum(
+            stats.get("skipped", 0) for stats in self.last_crawl_stats.values() if isinstance(stats, dict))
+        self.last_crawl_stats["finished_at"] = datetime.now().isoformat()
         return articles
     
     def get_news_sources(self) -> List[Dict]:
@@ -42,6 +42,8 @@ class OpenHarmonyBlogCrawler:
             'Referer': 'https://old.openharmony.cn/',
             'Cache-Control': 'no-cache'
         })
+        # 最近一次爬取的统计：列表中的文章数、抓取详情数、增量模式下跳过的数量
+        self.last_crawl_stats = {"listed": 0, "fetched": 0, "skipped": 0}
         
     def get_page_content(self, url: str) -> Optional[str]:
         """获取页面内容"""
@@ -255,13 +257,25 @@ class OpenHarmonyBlogCrawler:
             "updated_at": datetime.now().isoformat()
         }
 
-    def crawl_openharmony_blog_news(self, batch_callback=None, batch_size=20):
+    def _unchanged_article(self, known: Optional[Callable[[str], Optional[Dict]]], info: Dict) -> Optional[Dict]:
+        """增量模式：列表信息（url、标题、发布日期）与已缓存的文章一致时返回缓存的文章"""
+        if known is None:
+            return None
+        previous = known(hashlib.md5(info['url'].encode()).hexdigest()[:16])
+        if (previous and previous.get("content") and previous.get("title") == info["title"]
+                and previous.get("date") == info["date"]):
+            return previous
+        return None
+
+    def crawl_openharmony_blog_news(self, batch_callback=None, batch_size=20, known=None):
         """
         爬取OpenHarmony技术博客新闻，完全仿照OpenHarmony爬虫的逻辑
         
         Args:
             batch_callback: 分批处理回调函数
             batch_size: 每批处理的文章数量
+            known: 按文章ID查询已缓存文章的函数，传入时为增量模式，
+                   列表信息未变化的文章直接沿用缓存内容，不再抓取详情页
             
         Returns:
             处理后的文章列表
@@ -276,11 +290,14 @@ class OpenHarmonyBlogCrawler:
         
         if not articles_info:
             logger.warning("⚠️ [OpenHarmony博客] 未获取到任何文章信息")
+            self.last_crawl_stats = {"listed": 0, "fetched": 0, "skipped": 0}
             return []
         
         # 2. 逐篇处理文章内容，完全仿照OpenHarmony爬虫的逻辑
         all_articles_data = []
         batch_articles = []
+        stats = {"listed": len(articles_info), "fetched": 0, "skipped": 0}
+        self.last_crawl_stats = stats
         
         for i, info in enumerate(articles_info):
             title = info["title"]
@@ -288,6 +305,13 @@ class OpenHarmonyBlogCrawler:
             article_url = info["url"]
             summary = info.get("summary", "")
             
+            previous = self._unchanged_article(known, info)
+            if previous is not None:
+                all_articles_data.append(previous)
+                stats["skipped"] += 1
+                continue
+            stats["fetched"] += 1
+            
             logger.info(f"🔍 [OpenHarmony博客] 正在处理第 {i+1}/{len(articles_info)} 篇文章: {title}")
             logger.debug(f"🔗 [OpenHarmony博客] 文章URL: {article_url}")
             
@@ -330,7 +354,8 @@ class OpenHarmonyBlogCrawler:
             except Exception as callback_e:
                 logger.error(f"❌ [OpenHarmony博客分批处理] 最后批次处理失败: {callback_e}")
         
-        logger.info(f"🎉 [OpenHarmony博客] 爬取完成，共处理 {len(all_articles_data)} 篇文章")
+        logger.info(f"🎉 [OpenHarmony博客] 爬取完成，共处理 {len(all_articles_data)} 篇文章，"
+                    f"抓取详情 {stats['fetched']} 篇，未变化跳过 {stats['skipped']} 篇")
         return all_articles_data
 
     def validate_articles(self, articles: List[Dict]) -> List[Dict]:
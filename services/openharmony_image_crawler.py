@@ -103,10 +103,22 @@ class OpenHarmonyImageCrawler:
         return image_urls
     
     def download_image(self, image_info):
-        """下载单张图片"""
+        """下载单张图片（最近下载失败且仍在退避期内的图片直接跳过）"""
+        from core.negative_cache import IMAGE, get_negative_cache
+        negative = get_negative_cache()
         url = image_info['url']
         alt_text = image_info['alt']
         
+        retry_after = negative.retry_after(IMAGE, url)
+        if retry_after:
+            self.logger.info(f"⏭️  跳过下载失败退避中的图片: {url}（{retry_after:.0f} 秒后重试）")
+            return {
+                'status': 'failed',
+                'url': url,
+                'alt': alt_text,
+                'error': f"下载失败退避中，{retry_after:.0f} 秒后重试"
+            }
+        
         try:
             self.logger.info(f"⬇️  正在下载图片: {alt_text or '无描述'}")
             
@@ -148,6 +160,7 @@ class OpenHarmonyImageCrawler:
             
             file_size = len(response.content)
             self.logger.info(f"✅ 图片下载成功: {filename} ({file_size} bytes)")
+            negative.record_success(IMAGE, url)
             
             return {
                 'status': 'success',
@@ -160,6 +173,7 @@ class OpenHarmonyImageCrawler:
             
         except Exception as e:
             self.logger.error(f"❌ 图片下载失败: {url}, 错误: {e}")
+            negative.record_failure(IMAGE, url, e)
             return {
                 'status': 'failed',
                 'url': url,
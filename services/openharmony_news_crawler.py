@@ -27,6 +27,8 @@ class OpenHarmonyNewsCrawler:
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        # 最近一次爬取的统计：列表中的文章数、抓取详情数、增量模式下跳过的数量
+        self.last_crawl_stats = {"listed": 0, "fetched": 0, "skipped": 0}
 
     def get_page_content(self, url):
         try:
@@ -220,7 +222,24 @@ class OpenHarmonyNewsCrawler:
             "updated_at": datetime.now().isoformat()
         }
 
-    def crawl_openharmony_news(self, batch_callback=None, batch_size=20):
+    def _unchanged_article(self, known, info):
+        """增量模式：列表信息（url、标题、发布日期）与已缓存的文章一致时返回缓存的文章"""
+        if known is None:
+            return None
+        import hashlib
+        previous = known(hashlib.md5(info['url'].encode()).hexdigest()[:16])
+        if (previous and previous.get("content") and previous.get("title") == info["title"]
+                and previous.get("date") == self._standardize_date(info["date"])):
+            return previous
+        return None
+
+    def crawl_openharmony_news(self, batch_callback=None, batch_size=20, known=None):
+        """
+        爬取OpenHarmony官网新闻
+
+        known 为按文章ID查询已缓存文章（完整字典）的函数，传入时为增量模式：
+        列表信息未变化的文章不再抓取详情页，直接沿用缓存内容（不触发分批回调）。
+        """
         import logging
         logger = logging.getLogger(__name__)
 
@@ -233,11 +252,19 @@ class OpenHarmonyNewsCrawler:
 
         all_articles_data = []
         batch_articles = []
+        stats = {"listed": len(articles_info), "fetched": 0, "skipped": 0}
+        self.last_crawl_stats = stats
 
         for i, info in enumerate(articles_info):
             title = info["title"]
             date = info["date"]
             article_url = info["url"]
+            previous = self._unchanged_article(known, info)
+            if previous is not None:
+                all_articles_data.append(previous)
+                stats["skipped"] += 1
+                continue
+            stats["fetched"] += 1
             logger.info(f"🔍 正在处理第 {i+1}/{len(articles_info)} 篇文章: {title}")
             logger.debug(f"🔗 文章URL: {article_url}")
 
@@ -275,7 +302,8 @@ class OpenHarmonyNewsCrawler:
             except Exception as callback_e:
                 logger.error(f"❌ [分批处理] 最后批次处理失败: {callback_e}")
 
-        logger.info(f"🎉 OpenHarmony官网爬取完成，共处理 {len(all_articles_data)} 篇文章")
+        logger.info(f"🎉 OpenHarmony官网爬取完成，共处理 {len(all_articles_data)} 篇文章，"
+                    f"抓取详情 {stats['fetched']} 篇，未变化跳过 {stats['skipped']} 篇")
         return all_articles_data
 
 def main():
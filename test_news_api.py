@@ -0,0 +1,597 @@
+"""
+测试新闻 API 的端到端行为（通过 TestClient 调用，不依赖网络和浏览器）
+包括：
+1. 定时爬取失败时缓存状态置为 error
+2. 列表 ETag 随内容变化（重启后代数相同也不会误返回 304）
+3. 详情抓取失败且没有摘要时返回标题，文章在查找后被移除时返回 404
+4. 全文搜索：新快照发布时数据库已写入，新 ETag 不会配上旧结果
+5. 在线 gzip 压缩的响应使用弱 ETag
+6. 热门列表页首次请求时预序列化，之后直接返回，发布新快照后随之更新
+7. 热门列表页按 Accept-Encoding 返回预压缩版本
+8. 列表、详情与轮播图接口的条件请求（If-None-Match / If-Modified-Since）
+9. NDJSON 流式导出
+10. 从数据库热启动
+11. 多工作进程选主：跟随进程映射领导进程的快照文件并沿用其代数，领导进程退出后接替
+12. 增量爬取：只抓取新增或列表信息变化的文章详情
+13. 分批写入期间不重写快照文件，每次爬取完成后只写一次
+14. 分批写入期间不向共享缓存后端发布新版本，每次爬取完成后只发布一次
+15. 再次爬取整体替换缓存时保留本次未爬取来源的文章（启动时加载的华为文章基础数据）
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fastapi.testclient import TestClient
+
+import core.cache as cache_module
+import core.cache_backend as cache_backend
+import core.content_store as content_store
+import core.database as database
+import core.detail_cache as detail_cache
+import core.leader as leader
+import core.negative_cache as negative_cache
+import core.prefetch as prefetch
+import core.response_cache as response_cache
+import core.scheduler as scheduler
+import core.snapshot_file as snapshot_file
+import services.news_service as news_service
+from core.config import settings
+from core.cache import NewsCache, ServiceStatus, get_news_cache
+from core.detail_cache import DETAIL_FETCH_CATEGORY
+from core.fast_json import render_news_response
+from core.news_snapshot import CARD_FIELDS
+from core.negative_cache import ARTICLE
+from services.news_service import NewsSource
+from services.openharmony_news_crawler import OpenHarmonyNewsCrawler
+
+# 设置日志
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# 每个测试重新创建的单例
+_SINGLETONS = [
+    (cache_module, "_news_cache"),
+    (cache_module, "_banner_cache"),
+    (cache_backend, "_cache_backend"),
+    (content_store, "_content_store"),
+    (detail_cache, "_detail_cache"),
+    (detail_cache, "_detail_flight"),
+    (leader, "_leader_election"),
+    (negative_cache, "_negative_cache"),
+    (prefetch, "_prefetcher"),
+    (response_cache, "_hot_page_cache"),
+    (scheduler, "_scheduler"),
+    (snapshot_file, "_snapshot_writer"),
+    (news_service, "_news_service"),
+]
+
+
+def make_article(article_id, title, date="2025-09-01", summary=""):
+    """构造测试文章（与爬虫输出的字典格式一致）"""
+    return {
+        "id": article_id,
+        "title": title,
+        "date": date,
+        "url": f"https://example.com/{article_id}",
+        "content": [{"type": "text", "value": f"{title} 正文"}],
+        "category": "官方动态",
+        "summary": summary,
+        "source": "OpenHarmony",
+        "created_at": "2025-09-01T00:00:00",
+        "updated_at": "2025-09-01T00:00:00",
+    }
+
+
+@contextmanager
+def isolated_app(articles=(), **overrides):
+    """
+    在临时目录中运行应用：数据库、正文存储、快照文件等都写入临时目录，
+    启动时加载的华为文章基础数据替换为 articles，退出时恢复配置与单例
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        config = {
+            "content_store_path": os.path.join(tmp, "content.db"),
+            "detail_cache_path": os.path.join(tmp, "detail.db"),
+            "snapshot_file_path": os.path.join(tmp, "news_snapshot.bin"),
+            "leader_lock_path": os.path.join(tmp, "leader.lock"),
+            "enable_detail_prefetch": False,
+        }
+        config.update(overrides)
+        saved_settings = {name: getattr(settings, name) for name in config}
+        saved_singletons = [(module, name, getattr(module, name)) for module, name in _SINGLETONS]
+        saved_db_path = database.DB_PATH
+        saved_basic = NewsCache._get_huawei_articles_basic
+        try:
+            for name, value in config.items():
+                setattr(settings, name, value)
+            for module, name in _SINGLETONS:
+                setattr(module, name, None)
+            database.DB_PATH = os.path.join(tmp, "news.db")
+            database.init_database()
+            NewsCache._get_huawei_articles_basic = lambda self: [dict(a) for a in articles]
+            from main import app
+            yield TestClient(app), tmp
+        finally:
+            content = content_store._content_store
+            if content is not None:
+                content.close()
+            NewsCache._get_huawei_articles_basic = saved_basic
+            database.DB_PATH = saved_db_path
+            for module, name, value in saved_singletons:
+                setattr(module, name, value)
+            for name, value in saved_settings.items():
+                setattr(settings, name, value)
+
+
+def test_crawl_failure_sets_error():
+    """爬取抛出异常时缓存状态置为 error，并记录错误信息"""
+    with isolated_app([make_article("a1", "鸿蒙发布")]) as (client, _):
+        cache = get_news_cache()
+        assert cache.status == ServiceStatus.READY
+
+        service = news_service.get_news_service()
+        def failing_crawl(source, incremental=None):
+            raise RuntimeError("爬虫崩溃")
+        service.crawl_news = failing_crawl
+
+        scheduler.get_scheduler()._run_crawler_in_thread("测试爬取任务")
+        assert cache.status == ServiceStatus.ERROR
+        assert cache.error_message == "爬虫崩溃"
+        assert client.get("/health").json()["status"] == "degraded"
+
+
+def test_list_etag_follows_content():
+    """重建缓存后代数相同但内容不同，旧 ETag 不再命中；内容相同则仍返回 304"""
+    with isolated_app([make_article("a1", "旧标题")]) as (client, _):
+        response = client.get("/api/news/")
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        assert get_news_cache().snapshot.generation == 1
+
+    with isolated_app([make_article("a1", "新标题")]) as (client, _):
+        assert get_news_cache().snapshot.generation == 1
+        for path in ("/api/news/", "/api/news/?page_size=5"):
+            response = client.get(path, headers={"If-None-Match": etag})
+            assert response.status_code == 200
+            assert response.json()["articles"][0]["title"] == "新标题"
+        response = client.get("/api/news/", headers={"If-None-Match": etag})
+        assert response.headers["etag"] != etag
+
+    with isolated_app([make_article("a1", "旧标题")]) as (client, _):
+        assert client.get("/api/news/", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_detail_fallback_without_summary():
+    """详情抓取处于退避期、文章没有摘要时返回标题块，而不是 500"""
+    article = dict(make_article("h1", "华为开发者文章"), category=DETAIL_FETCH_CATEGORY)
+    with isolated_app([article]) as (client, _):
+        # 正文已分层写入磁盘，记录中没有正文
+        assert not get_news_cache().get_article("h1").is_resident
+        negative_cache.get_negative_cache().record_failure(ARTICLE, "h1", "超时")
+        response = client.get("/api/news/h1")
+        assert response.status_code == 200
+        assert response.json()["content"] == [{"type": "text", "value": "华为开发者文章"}]
+
+
+def test_detail_missing_after_swap():
+    """按ID查到文章后快照被替换、文章已不存在时返回 404"""
+    with isolated_app([make_article("a1", "鸿蒙发布")]) as (client, _):
+        cache = get_news_cache()
+        record = cache.get_article("a1")
+        cache.update_cache([make_article("a2", "另一篇")])
+        cache.get_article = lambda article_id: record
+        assert client.get("/api/news/a1").status_code == 404
+
+
+def test_search_persisted_before_publish():
+    """发布回调执行时数据库中已有新文章；旧 ETag 重新验证得到新结果"""
+    with isolated_app([make_article("a1", "分布式软总线详解")]) as (client, _):
+        cache = get_news_cache()
+        response = client.get("/api/news/search", params={"q": "软总线"})
+        assert response.json()["total"] == 1
+        etag = response.headers["etag"]
+
+        seen = []
+        cache.add_publish_listener(
+            lambda snapshot: seen.append(database.search_news_articles("软总线")[0]))
+        seen.clear()
+        cache.append_to_cache([make_article("a2", "软总线性能优化", "2025-09-02")])
+        assert seen == [2]
+
+        response = client.get("/api/news/search", params={"q": "软总线"},
+                              headers={"If-None-Match": etag})
+        assert response.status_code == 200 and response.json()["total"] == 2
+        assert client.get("/api/news/search", params={"q": "软总线"},
+                          headers={"If-None-Match": response.headers["etag"]}).status_code == 304
+
+
+def many_articles(count):
+    """构造足够大、会被压缩的文章列表"""
+    return [make_article(f"a{i}", f"文章{i}", f"2025-09-{i % 28 + 1:02d}", summary="鸿蒙生态动态" * 20)
+            for i in range(count)]
+
+
+def test_online_gzip_weak_etag():
+    """未预压缩的响应经中间件 gzip 后 ETag 加 W/ 前缀，未压缩时保持强 ETag"""
+    with isolated_app(many_articles(30)) as (client, _):
+        path = "/api/news/?page_size=30"  # 不在热门页面范围内，走在线压缩
+        compressed = client.get(path, headers={"Accept-Encoding": "gzip"})
+        assert compressed.headers["content-encoding"] == "gzip"
+        plain = client.get(path, headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+        assert not plain.headers["etag"].startswith("W/")
+        assert compressed.headers["etag"] == "W/" + plain.headers["etag"]
+        assert compressed.json() == plain.json()
+        # 弱 ETag 仍可用于条件请求，304 返回与该编码下 200 响应相同的校验值
+        for headers in (compressed.headers, plain.headers):
+            not_modified = client.get(path, headers={"Accept-Encoding": headers.get("content-encoding", "identity"),
+                                                     "If-None-Match": headers["etag"]})
+            assert not_modified.status_code == 304 and not_modified.headers["etag"] == headers["etag"]
+
+
+def test_hot_pages():
+    """热门页首次请求时渲染，之后命中缓存，内容与按需渲染的结果一致；发布后旧页面不再返回"""
+    with isolated_app([make_article("a1", "第一篇"), make_article("a2", "第二篇", "2025-09-02")]) as (client, _):
+        hot_pages = response_cache.get_hot_page_cache()
+        assert hot_pages.get_stats()["pages"] == 0
+        hot = client.get("/api/news/")
+        assert hot.status_code == 200 and (hot_pages.hits, hot_pages.misses) == (0, 1)
+        assert client.get("/api/news/").content == hot.content and hot_pages.hits == 1
+        # 与不走预序列化缓存的同一页（带来源过滤，结果相同）一致
+        assert hot.json() == client.get("/api/news/?source=OpenHarmony").json()
+        assert client.get("/api/news/openharmony").json()["total"] == 2
+        assert client.get("/api/news/blog").json()["total"] == 0
+        assert client.get("/api/news/", params={"category": "官方动态"}).json()["total"] == 2
+        # 快照中没有的分类不缓存
+        assert client.get("/api/news/", params={"category": "不存在"}).json()["total"] == 0
+        assert hot_pages.get_stats()["pages"] == 4
+
+        # 发布时不渲染，新快照的页面在下一次请求时生成
+        get_news_cache().append_to_cache([make_article("a3", "第三篇", "2025-09-03")])
+        assert hot_pages.get_stats()["pages"] == 4
+        articles = client.get("/api/news/").json()["articles"]
+        assert [a["id"] for a in articles] == ["a1", "a2", "a3"]
+        stats = hot_pages.get_stats()
+        assert stats["pages"] == 1 and stats["fingerprint"] == get_news_cache().snapshot.fingerprint
+        # 卡片投影不包含正文
+        assert "content" not in articles[0]
+
+
+def test_precompressed_hot_pages():
+    """热门页的 gzip 版本只压缩一次，响应原样返回，不再经过在线压缩"""
+    with isolated_app(many_articles(30)) as (client, _):
+        variants = response_cache.get_hot_page_cache().get(
+            get_news_cache().snapshot, ("news", 1, 20, None))
+        assert set(variants) >= {"identity", "gzip"}
+
+        with client.stream("GET", "/api/news/", headers={"Accept-Encoding": "gzip"}) as response:
+            raw = b"".join(response.iter_raw())
+            headers = response.headers
+        assert headers["content-encoding"] == "gzip" and headers["vary"] == "Accept-Encoding"
+        assert raw == variants["gzip"]
+        assert headers["etag"].startswith("W/")
+
+        plain = client.get("/api/news/", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+        assert plain.content == variants["identity"]
+        assert headers["etag"] == "W/" + plain.headers["etag"]
+        # 304 与协商到的编码下的 200 响应使用同一个校验值
+        not_modified = client.get("/api/news/", headers={"Accept-Encoding": "gzip", "If-None-Match": headers["etag"]})
+        assert not_modified.status_code == 304 and not_modified.headers["etag"] == headers["etag"]
+        not_modified = client.get("/api/news/", headers={"Accept-Encoding": "identity",
+                                                         "If-None-Match": headers["etag"]})
+        assert not_modified.status_code == 304 and not_modified.headers["etag"] == plain.headers["etag"]
+
+
+def test_conditional_requests():
+    """数据未变化时条件请求返回 304，变化后返回 200 和新的校验值"""
+    with isolated_app([make_article("a1", "鸿蒙发布")]) as (client, _):
+        for path in ("/api/news/", "/api/news/openharmony", "/api/news/blog",
+                     "/api/news/?page_size=5", "/api/news/a1"):
+            response = client.get(path)
+            assert response.status_code == 200 and response.headers["cache-control"] == "no-cache"
+            etag, last_modified = response.headers["etag"], response.headers["last-modified"]
+            not_modified = client.get(path, headers={"If-None-Match": f'"other", {etag}'})
+            assert not_modified.status_code == 304 and not_modified.headers["etag"] == etag
+            assert not_modified.content == b""
+            assert client.get(path, headers={"If-Modified-Since": last_modified}).status_code == 304
+            # If-None-Match 优先于 If-Modified-Since
+            assert client.get(path, headers={"If-None-Match": '"other"',
+                                             "If-Modified-Since": last_modified}).status_code == 200
+
+        etag = client.get("/api/news/").headers["etag"]
+        detail_etag = client.get("/api/news/a1").headers["etag"]
+        get_news_cache().append_to_cache([make_article("a1", "鸿蒙发布（更新）")])
+        response = client.get("/api/news/", headers={"If-None-Match": etag})
+        assert response.status_code == 200 and response.headers["etag"] != etag
+        response = client.get("/api/news/a1", headers={"If-None-Match": detail_etag})
+        assert response.status_code == 200 and response.json()["title"] == "鸿蒙发布（更新）"
+
+        cache_module.get_banner_cache().update_cache([{"url": "https://example.com/b.png"}])
+        response = client.get("/api/banner/mobile")
+        assert response.json()["images"] == ["https://example.com/b.png"]
+        etag = response.headers["etag"]
+        assert client.get("/api/banner/mobile", headers={"If-None-Match": etag}).status_code == 304
+        cache_module.get_banner_cache().update_cache([{"url": "https://example.com/c.png"}])
+        assert client.get("/api/banner/mobile", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_ndjson_stream():
+    """/stream 与 all=true + Accept: application/x-ndjson 每行返回一篇文章，支持过滤与字段投影"""
+    articles = many_articles(30) + [dict(make_article("b1", "技术博客文章"), category="技术博客")]
+    with isolated_app(articles) as (client, _):
+        response = client.get("/api/news/stream")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = response.content.splitlines()
+        assert response.content.endswith(b"\n") and len(lines) == 31
+        first = json.loads(lines[0])
+        assert first["id"] == "a0" and first["content"][0]["value"] == "文章0 正文"
+
+        lines = client.get("/api/news/stream", params={"category": "技术博客", "fields": "id,title"}).content.splitlines()
+        assert [json.loads(line) for line in lines] == [{"id": "b1", "title": "技术博客文章"}]
+
+        # /api/news/?all=true 按 Accept 选择流式返回，内容与 /stream 的卡片投影一致
+        streamed = client.get("/api/news/", params={"all": "true"},
+                              headers={"Accept": "application/x-ndjson"})
+        assert streamed.headers["content-type"].startswith("application/x-ndjson")
+        assert streamed.content == client.get("/api/news/stream", params={"fields": "card"}).content
+        # 不带 Accept 时仍返回 NewsResponse 结构的一整页，同样流式输出
+        legacy = client.get("/api/news/", params={"all": "true"}, headers={"Accept-Encoding": "identity"})
+        assert "content-length" not in legacy.headers
+        whole = legacy.json()
+        assert whole["total"] == whole["page_size"] == 31 and whole["page"] == 1
+        assert legacy.content == render_news_response(
+            get_news_cache().snapshot.iter_query(fields=CARD_FIELDS, as_json=True), 31, 1, 31)
+        empty = client.get("/api/news/", params={"all": "true", "category": "不存在"}).json()
+        assert empty["articles"] == [] and empty["total"] == 0
+        assert [json.loads(line) for line in streamed.content.splitlines()] == whole["articles"]
+
+        etag = response.headers["etag"]
+        assert client.get("/api/news/stream", headers={"If-None-Match": etag}).status_code == 304
+
+
+def restart_news_cache():
+    """模拟进程重启：丢弃内存中的新闻缓存、热门页面与正文存储（磁盘文件保留）"""
+    content_store._content_store.close()
+    for module, name in ((cache_module, "_news_cache"), (response_cache, "_hot_page_cache"),
+                         (content_store, "_content_store")):
+        setattr(module, name, None)
+    return get_news_cache()
+
+
+def test_warm_start():
+    """重启后先从数据库恢复上次的文章，爬取失败也能立即提供服务"""
+    with isolated_app([make_article("a1", "第一篇"), make_article("a2", "第二篇")]) as (client, _):
+        assert client.get("/api/news/").json()["total"] == 2
+
+        def unreachable(self):
+            raise ConnectionError("网络不可用")
+        NewsCache._get_huawei_articles_basic = unreachable
+        cache = restart_news_cache()
+        assert cache.status == ServiceStatus.READY
+        response = client.get("/api/news/")
+        assert [a["title"] for a in response.json()["articles"]] == ["第一篇", "第二篇"]
+        assert client.get("/api/news/a2").json()["content"][0]["value"] == "第二篇 正文"
+
+        # 启动时获取的基础数据按ID更新到恢复的文章上
+        NewsCache._get_huawei_articles_basic = lambda self: [make_article("a2", "第二篇（更新）"),
+                                                             make_article("a3", "第三篇")]
+        restart_news_cache()
+        titles = [a["title"] for a in client.get("/api/news/").json()["articles"]]
+        assert titles == ["第一篇", "第二篇（更新）", "第三篇"]
+        assert [a["title"] for a in database.load_news_articles()] == titles
+
+
+def test_leader_follower_sync():
+    """同一进程内模拟两个工作进程：领导进程写快照文件，跟随进程映射、同步并在领导退出后接替"""
+    with isolated_app([make_article("a1", "第一篇")], enable_leader_election=True) as (client, _):
+        election = leader.get_leader_election()
+        assert election.try_acquire()
+        leader_cache = get_news_cache()
+        leader_cache.append_to_cache([make_article("a2", "第二篇")])
+        leader_cache.finish_batches()
+        assert os.path.exists(settings.snapshot_file_path)
+
+        # 跟随进程：抢不到锁，不爬取，直接映射快照文件
+        follower = leader.LeaderElection(settings.leader_lock_path)
+        assert not follower.try_acquire()
+        leader._leader_election = follower
+        NewsCache._get_huawei_articles_basic = lambda self: []
+        follower_cache = restart_news_cache()
+        assert isinstance(follower_cache.snapshot.content_store, snapshot_file.MappedSnapshotFile)
+        assert follower_cache.snapshot.generation == leader_cache.snapshot.generation
+        assert follower_cache.snapshot.fingerprint == leader_cache.snapshot.fingerprint
+        assert client.get("/api/news/a2").json()["content"][0]["value"] == "第二篇 正文"
+        assert client.post("/api/news/crawl").status_code == 409
+        status = client.get("/api/news/status/info").json()
+        assert status["leader"]["role"] == "follower" and status["snapshot_file"]["role"] == "reader"
+
+        # 领导进程发布新快照后，跟随进程定期同步
+        leader._leader_election = election
+        leader_cache.update_cache([make_article("a1", "第一篇"), make_article("a3", "第三篇")])
+        leader._leader_election = follower
+        cache_module.sync_from_leader()
+        assert [a["id"] for a in client.get("/api/news/").json()["articles"]] == ["a1", "a3"]
+        assert follower_cache.snapshot.generation == leader_cache.snapshot.generation
+
+        # 领导进程退出后跟随进程接替，接管映射中的文章继续编号
+        election.release()
+        assert follower.try_acquire()
+        follower_cache.detach_snapshot_file()
+        assert follower_cache.snapshot.content_store is not None
+        assert not isinstance(follower_cache.snapshot.content_store, snapshot_file.MappedSnapshotFile)
+        assert follower_cache.snapshot.generation == leader_cache.snapshot.generation + 1
+        assert client.get("/api/news/a3").json()["title"] == "第三篇"
+        follower.release()
+
+
+def test_incremental_crawl():
+    """增量模式下列表信息未变化的文章沿用缓存内容，只为新增和改动的文章抓取详情页"""
+    crawler = OpenHarmonyNewsCrawler()
+    cached = [crawler._format_article({"title": title, "date": "2025-09-01",
+                                       "url": f"https://www.openharmony.cn/news/{slug}",
+                                       "content": [{"type": "text", "value": f"{title} 缓存正文"}]})
+              for slug, title in (("n1", "未变化"), ("n2", "将改名"))]
+    with isolated_app(cached) as (client, _):
+        service = news_service.get_news_service()
+        service.openharmony_crawler.get_all_article_infos = lambda: [
+            {"title": "未变化", "date": "2025-09-01", "url": "https://www.openharmony.cn/news/n1"},
+            {"title": "已改名", "date": "2025-09-01", "url": "https://www.openharmony.cn/news/n2"},
+            {"title": "新文章", "date": "2025-09-02", "url": "https://www.openharmony.cn/news/n3"},
+        ]
+        fetched = []
+        resident = []
+
+        def parse_article_content(url):
+            fetched.append(url)
+            resident.append(content_store.get_content_store().get_stats()["resident_articles"])
+            return [{"type": "text", "value": f"{url} 新正文"}]
+        service.openharmony_crawler.parse_article_content = parse_article_content
+
+        cache = get_news_cache()
+        cache._is_first_load = False  # 非首次加载：爬取结果整体替换缓存
+        scheduler.get_scheduler()._run_crawler_in_thread("增量爬取", NewsSource.OPENHARMONY, incremental=True)
+        assert fetched == ["https://www.openharmony.cn/news/n2", "https://www.openharmony.cn/news/n3"]
+        # 比对缓存内容时从磁盘读取的正文不进入 LRU
+        assert resident == [0, 0]
+
+        stats = client.get("/api/news/status/info").json()["last_crawl"]
+        assert stats["incremental"] and stats[NewsSource.OPENHARMONY.value] == {"listed": 3, "fetched": 2, "skipped": 1}
+        lines = client.get("/api/news/stream").content.splitlines()
+        articles = {article["title"]: article for article in map(json.loads, lines)}
+        assert set(articles) == {"未变化", "已改名", "新文章"}
+        assert articles["未变化"]["content"][0]["value"] == "未变化 缓存正文"
+        assert articles["已改名"]["content"][0]["value"].endswith("新正文")
+
+
+def run_batched_crawl(after_batch, batch_count=5, batch_size=3):
+    """模拟首次爬取：分多批追加到缓存（每批后调用 after_batch），再由调度器收尾"""
+    cache = get_news_cache()
+    batches = [[make_article(f"b{i}{j}", f"批次{i}-{j}") for j in range(batch_size)]
+               for i in range(batch_count)]
+
+    def batched_crawl(source, incremental=None):
+        for batch in batches:
+            cache.append_to_cache(batch)
+            after_batch()
+        return [article for batch in batches for article in batch]
+    news_service.get_news_service().crawl_news = batched_crawl
+    scheduler.get_scheduler()._run_crawler_in_thread("分批爬取")
+
+
+def test_snapshot_file_per_crawl():
+    """首次爬取分多批写入缓存，快照文件只在爬取完成后写一次"""
+    with isolated_app([make_article("a1", "第一篇")], enable_snapshot_file=True) as (client, _):
+        cache = get_news_cache()
+        writer = snapshot_file.get_snapshot_writer()
+        assert writer.writes == 1
+
+        def unchanged():
+            assert writer.writes == 1
+        run_batched_crawl(unchanged)
+        assert writer.writes == 2 and writer.last_generation == cache.snapshot.generation
+        assert snapshot_file.MappedSnapshotFile(settings.snapshot_file_path).count == 16
+        # 没有新的分批写入时不重复写
+        cache.finish_batches()
+        assert writer.writes == 2
+        assert client.get("/api/news/").json()["total"] == 16
+
+
+def test_backend_published_per_crawl():
+    """首次爬取分多批写入缓存，Redis 后端只在爬取完成后发布一个新版本"""
+    try:
+        import fakeredis
+    except ImportError:
+        logger.info("未安装 fakeredis，跳过共享缓存后端测试")
+        return
+    with isolated_app([make_article("a1", "第一篇")]) as (client, _):
+        backend = cache_backend.RedisCacheBackend(client=fakeredis.FakeRedis())
+        cache_backend._cache_backend = backend
+        cache = get_news_cache()
+        assert backend.get_version() == 1
+
+        def unchanged():
+            assert backend.get_version() == 1
+        run_batched_crawl(unchanged)
+        assert backend.get_version() == 2
+        version, articles, meta = backend.get_snapshot()
+        assert len(articles) == 16 and meta["fingerprint"] == cache.snapshot.fingerprint
+        # 第一篇沿用上一版，只写入新增的文章
+        assert backend.last_copied == 1 and backend.last_written == 15
+
+
+def test_refresh_keeps_uncrawled_sources():
+    """非首次爬取只替换结果中出现的来源，启动时加载的华为文章基础数据不会被删除"""
+    basic = dict(make_article("h" * 32, "华为基础数据"), source="Huawei Developer Blog",
+                 category="Huawei Developer", url="https://developer.huawei.com/blog/topic/1")
+    with isolated_app([basic, make_article("a1", "旧官网文章")]) as (client, _):
+        cache = get_news_cache()
+        cache._is_first_load = False
+        service = news_service.get_news_service()
+        service.crawl_news = lambda source, incremental=None: [make_article("a2", "新官网文章")]
+        scheduler.get_scheduler()._run_crawler_in_thread("再次爬取")
+        ids = [a["id"] for a in client.get("/api/news/").json()["articles"]]
+        assert ids == [basic["id"], "a2"]
+        assert [a["id"] for a in database.load_news_articles()] == ids
+
+        # 华为来源本次爬取到了同一篇文章（ID 不同、URL 相同）时替换基础数据
+        crawled = dict(basic, id="m" * 32, title="华为文章（爬取）")
+        service.crawl_news = lambda source, incremental=None: [crawled]
+        scheduler.get_scheduler()._run_crawler_in_thread("再次爬取")
+        ids = [a["id"] for a in client.get("/api/news/").json()["articles"]]
+        assert ids == ["a2", crawled["id"]]
+
+
+def main():
+    """主测试函数"""
+    tests = [
+        ("爬取失败状态", test_crawl_failure_sets_error),
+        ("列表ETag", test_list_etag_follows_content),
+        ("详情摘要回退", test_detail_fallback_without_summary),
+        ("详情并发替换", test_detail_missing_after_swap),
+        ("全文搜索ETag", test_search_persisted_before_publish),
+        ("在线压缩弱ETag", test_online_gzip_weak_etag),
+        ("热门页面", test_hot_pages),
+        ("预压缩版本", test_precompressed_hot_pages),
+        ("条件请求", test_conditional_requests),
+        ("NDJSON流式导出", test_ndjson_stream),
+        ("热启动", test_warm_start),
+        ("选主与跟随同步", test_leader_follower_sync),
+        ("增量爬取", test_incremental_crawl),
+        ("快照文件按次写入", test_snapshot_file_per_crawl),
+        ("共享缓存按次发布", test_backend_published_per_crawl),
+        ("保留未爬取来源", test_refresh_keeps_uncrawled_sources),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            results.append((test_name, True))
+        except Exception as e:
+            logger.error(f"测试 '{test_name}' 发生异常: {e!r}")
+            results.append((test_name, False))
+
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ 通过" if result else "❌ 失败"
+        logger.info(f"{status} - {test_name}")
+    logger.info(f"总计: {passed}/{len(results)} 测试通过")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,563 @@
+"""
+测试新闻缓存快照及索引（不依赖网络和浏览器）
+包括：
+1. n-gram 关键字搜索
+2. ID 索引与原位替换
+3. 分类/来源/月份位图过滤与分页
+4. 日期区间与排序
+5. 写时复制：追加文章不影响旧快照
+6. 游标分页
+7. 字段投影
+8. 预序列化的 JSON 片段
+9. 字符串驻留与内容块去重
+10. 紧凑文章记录
+11. 正文分层存储
+12. 多进程共享的快照文件
+13. 共享缓存后端（进程内；安装 fakeredis 时同时测试 Redis 后端的版本化键与增量发布）
+14. 文章详情缓存（TTL 与过期后台刷新）
+15. single-flight 请求合并与并发上限
+16. 发布后的详情预取与请求耗时退避
+17. 抓取失败的负缓存与指数退避
+18. 数据库 FTS5 全文搜索、索引增量同步与高亮转义
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.news_index import parse_timestamp
+from core.news_snapshot import NewsSnapshot, encode_cursor, decode_cursor, resolve_fields, CARD_FIELDS
+from models.news import NewsArticle, SortOrder
+from core.article_record import ArticleRecord
+from core.content_store import ContentStore
+from core.snapshot_file import SnapshotFileWriter, MappedSnapshotFile, snapshot_file_changed
+from core.cache_backend import InMemoryCacheBackend, RedisCacheBackend
+from core.fast_json import dumps
+from core.detail_cache import DetailContentCache, DetailFetchError
+from core.negative_cache import NegativeCache, ARTICLE
+from core.single_flight import SingleFlight
+import core.database as database
+from core.prefetch import DetailPrefetcher, LatencyTracker
+
+# 设置日志
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def make_article(article_id, title, date, category="官方动态", source="OpenHarmony", summary=""):
+    """构造测试文章（与爬虫输出的字典格式一致）"""
+    return {
+        "id": article_id,
+        "title": title,
+        "date": date,
+        "url": f"https://example.com/{article_id}",
+        "category": category,
+        "source": source,
+        "summary": summary,
+        "content": [{"type": "text", "value": title}],
+    }
+
+
+def sample_snapshot():
+    return NewsSnapshot.build([
+        make_article("a1", "OpenHarmony 5.0 发布", "2025-09-03", summary="鸿蒙生态"),
+        make_article("a2", "ArkTS 入门", "2025.8.1", category="技术博客", source="OpenHarmony技术博客"),
+        make_article("a3", "鸿蒙开发者大会", "2025年9月30日"),
+        make_article("a4", "未知日期文章", "???", category="技术博客", source="OpenHarmony技术博客"),
+        make_article("a5", "年终总结", "2024-12-31 18:00:00", category="Huawei Developer",
+                     source="Huawei Developer Blog"),
+    ])
+
+
+def test_search():
+    """测试关键字搜索"""
+    snapshot = sample_snapshot()
+    assert [a.id for a in snapshot.query(search="鸿蒙")[0]] == ["a1", "a3"]
+    assert [a.id for a in snapshot.query(search="arkts")[0]] == ["a2"]
+    assert [a.id for a in snapshot.query(search="5.0 发")[0]] == ["a1"]
+    assert snapshot.query(search="不存在的词")[1] == 0
+
+
+def test_id_index():
+    """测试ID索引与原位替换"""
+    snapshot = sample_snapshot().extend([make_article("a2", "ArkTS 进阶", "2025-08-02")])
+    assert len(snapshot) == 5
+    assert snapshot.get("a2").title == "ArkTS 进阶"
+    assert snapshot.get("missing") is None
+    assert snapshot.query(search="入门")[1] == 0
+    # a2 被替换为官方动态，技术博客只剩 a4
+    assert [a.id for a in snapshot.query(category="技术博客")[0]] == ["a4"]
+
+
+def test_bitmap_filters():
+    """测试位图过滤与分页"""
+    snapshot = sample_snapshot()
+    articles, total = snapshot.query(category=["官方动态", "技术博客"], page=2, page_size=2)
+    assert total == 4
+    assert [a.id for a in articles] == ["a3", "a4"]
+    assert snapshot.query(category="技术博客", source="OpenHarmony")[1] == 0
+    assert [a.id for a in snapshot.query(month=["2025-09", "2024-12"])[0]] == ["a1", "a3", "a5"]
+
+
+def test_date_range_and_sort():
+    """测试日期区间与排序"""
+    snapshot = sample_snapshot()
+    articles, total = snapshot.query(
+        start_ts=parse_timestamp("2025-09-01"),
+        end_ts=parse_timestamp("2025-09-30", end_of_day=True)
+    )
+    assert total == 2 and [a.id for a in articles] == ["a1", "a3"]
+    ordered = [a.id for a in snapshot.query(sort=SortOrder.DATE_DESC)[0]]
+    assert ordered == ["a3", "a1", "a2", "a5", "a4"]
+    ordered = [a.id for a in snapshot.query(sort=SortOrder.DATE_ASC, page=1, page_size=2)[0]]
+    assert ordered == ["a5", "a2"]
+
+
+def test_copy_on_write():
+    """测试追加文章不影响旧快照"""
+    old = sample_snapshot()
+    new = old.extend([make_article("a6", "鸿蒙新版本", "2025-10-01")])
+    assert len(old) == 5 and len(new) == 6
+    assert old.query(search="鸿蒙")[1] == 2
+    assert new.query(search="鸿蒙")[1] == 3
+    assert old.get("a6") is None
+
+
+def test_cursor_pagination():
+    """测试游标分页：翻页期间追加文章不重复、不遗漏"""
+    snapshot = sample_snapshot()
+    articles, total, cursor = snapshot.query_after(limit=2)
+    assert total == 5 and [a.id for a in articles] == ["a3", "a1"]
+    assert decode_cursor(encode_cursor(cursor)) == cursor
+    # 翻页期间出现更新的文章，不影响后续页
+    snapshot = snapshot.extend([make_article("a6", "最新文章", "2025-10-01")])
+    articles, _, cursor = snapshot.query_after(cursor, limit=2)
+    assert [a.id for a in articles] == ["a2", "a5"]
+    articles, _, cursor = snapshot.query_after(cursor, limit=2)
+    assert [a.id for a in articles] == ["a4"] and cursor is None
+    try:
+        decode_cursor("not-a-cursor")
+        assert False, "无效游标应当抛出 ValueError"
+    except ValueError:
+        pass
+
+
+def test_field_projection():
+    """测试卡片投影与自定义字段"""
+    snapshot = sample_snapshot()
+    cards = snapshot.query(fields=resolve_fields("card"))[0]
+    assert "content" not in cards[0] and tuple(cards[0]) == CARD_FIELDS
+    assert resolve_fields("full") is None and snapshot.query()[0][0].content
+    assert snapshot.query(fields=resolve_fields("id, title"))[0][0] == {"id": "a1", "title": "OpenHarmony 5.0 发布"}
+    # 原位替换后卡片投影同步更新
+    snapshot = snapshot.extend([make_article("a1", "新标题", "2025-09-03")])
+    assert snapshot.query(fields=CARD_FIELDS)[0][0]["title"] == "新标题"
+    try:
+        resolve_fields("id,bogus")
+        assert False, "未知字段应当抛出 ValueError"
+    except ValueError:
+        pass
+
+
+def test_json_fragments():
+    """测试入库时缓存的 JSON 片段与模型序列化结果一致"""
+    snapshot = sample_snapshot()
+    fragments, total = snapshot.query(page=1, page_size=2, as_json=True)
+    articles, _ = snapshot.query(page=1, page_size=2)
+    assert total == 5
+    assert [json.loads(f) for f in fragments] == \
+        [json.loads(a.to_api().model_dump_json()) for a in articles]
+    card = json.loads(snapshot.query(fields=CARD_FIELDS, as_json=True)[0][0])
+    assert card == snapshot.cards[0]
+    assert json.loads(snapshot.get_json("a2"))["title"] == "ArkTS 入门"
+
+
+def test_interning():
+    """测试重复的元数据字符串和内容块在文章间共享"""
+    footer = "".join(["本文转载自", "OpenHarmony"])
+    articles = [make_article(f"b{i}", f"标题{i}", "2025-09-01",
+                             source="".join(["Open", "Harmony"])) for i in range(3)]
+    for article in articles:
+        article["content"].append({"type": "text", "value": "".join([footer])})
+    snapshot = NewsSnapshot.build(articles)
+    first, second = snapshot.get("b0"), snapshot.get("b1")
+    assert first.source_code == second.source_code and first.date is second.date
+    assert first.content[1] is second.content[1]
+    assert articles[0]["content"][1] is not articles[1]["content"][1]  # 不修改传入的文章
+    report = snapshot.memory_report()["interning"]
+    assert report["block_hits"] == 2 and report["bytes_saved"] > 0
+
+
+def test_article_record():
+    """测试字典与 NewsArticle 统一转换为紧凑记录"""
+    model = NewsArticle(id="m1", title="模型文章", date="2025-09-01", url="u",
+                        content=[{"type": "image", "value": "https://example.com/a.png"}],
+                        category="官方动态", source="OpenHarmony")
+    snapshot = NewsSnapshot.build([model, make_article("d1", "字典文章", "2025-09-02")])
+    record, other = snapshot.get("m1"), snapshot.get("d1")
+    assert isinstance(record, ArticleRecord) and isinstance(other, ArticleRecord)
+    assert not hasattr(record, "__dict__")
+    assert record.timestamp == parse_timestamp("2025-09-01")
+    assert record.category_code == other.category_code and record.category == "官方动态"
+    assert record.to_api() == model
+    assert [a.id for a in snapshot.query(category="官方动态", source="OpenHarmony")[0]] == ["m1", "d1"]
+
+
+def test_content_store():
+    """测试正文写入磁盘存储，经 LRU 读取"""
+    store = ContentStore(":memory:", max_bytes=400)
+    snapshot = NewsSnapshot.build([
+        make_article(f"c{i}", f"文章{i}", "2025-09-01", summary="x" * 50) for i in range(5)
+    ], content_store=store)
+    record = snapshot.get("c0")
+    assert not record.is_resident
+    assert snapshot.full_article(record).content[0].value == "文章0"
+    assert json.loads(snapshot.get_json("c1"))["content"][0]["value"] == "文章1"
+    assert snapshot.query(fields=resolve_fields("id,content"))[0][2]["content"][0]["value"] == "文章2"
+    # 卡片不需要读取正文
+    before = store.get_stats()["misses"]
+    snapshot.query(fields=CARD_FIELDS, as_json=True)
+    assert store.get_stats()["misses"] == before
+    # 最近读取的文章命中 LRU，字节预算生效
+    snapshot.get_json("c4")
+    stats = store.get_stats()
+    assert stats["hits"] >= 1 and stats["resident_bytes"] <= 400 and stats["evictions"] > 0
+    # 原位替换后读取到新正文
+    snapshot = snapshot.extend([make_article("c0", "新正文", "2025-09-02")])
+    assert snapshot.full_article(snapshot.get("c0")).content[0].value == "新正文"
+
+
+def test_snapshot_file():
+    """测试快照文件的写入、映射读取与替换后重新映射"""
+    store = ContentStore(":memory:")
+    snapshot = NewsSnapshot.build([
+        make_article(f"f{i}", f"文章{i}", f"2025-09-0{i + 1}", summary="摘要") for i in range(3)
+    ] + [make_article(None, "无ID文章", "2025-09-09")], content_store=store)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "news_snapshot.bin")
+        writer = SnapshotFileWriter(path)
+        writer.write(snapshot)
+        mapped = MappedSnapshotFile(path)
+        shared = NewsSnapshot.from_mapped(mapped)
+        assert len(shared) == 4 and shared.get("f1").title == "文章1"
+        # 内容指纹随文件传递；内容不同则指纹不同
+        assert shared.fingerprint == snapshot.fingerprint
+        assert snapshot.extend([make_article("f1", "改过的标题", "2025-09-02")]).fingerprint != snapshot.fingerprint
+        assert json.loads(shared.get_json("f2"))["content"][0]["value"] == "文章2"
+        assert shared.full_article(shared.get("f0")).content[0].value == "文章0"
+        assert shared.query(search="无ID", fields=None)[0][0].content_blocks()[0]["value"] == "无ID文章"
+        assert shared.query(fields=CARD_FIELDS, as_json=True) == snapshot.query(fields=CARD_FIELDS, as_json=True)
+        # 来自文件的快照不会回写
+        writer.write(shared)
+        assert writer.writes == 1 and not snapshot_file_changed(path, mapped)
+        # 原子替换后检测到新版本，旧映射仍可读取
+        writer.write(snapshot.extend([make_article("f3", "新文章", "2025-09-10")]))
+        assert snapshot_file_changed(path, mapped)
+        assert len(NewsSnapshot.from_mapped(MappedSnapshotFile(path))) == 5
+        assert shared.get_json("f0") is not None
+
+
+def backend_entries(articles):
+    """把文章字典转换为发布到缓存后端的条目，记录哪些文章的正文被读取"""
+    loaded = []
+
+    def entry(article):
+        body = dumps(article)
+        return article["id"], hashlib.blake2b(body, digest_size=16).digest(), lambda: loaded.append(article["id"]) or body
+    return [entry(a) for a in articles], loaded
+
+
+def test_cache_backend():
+    """测试共享缓存后端的发布、读取、只写入变化的文章与整体替换"""
+    backends = [InMemoryCacheBackend()]
+    try:
+        import fakeredis
+        backends.append(RedisCacheBackend(client=fakeredis.FakeRedis(), batch_size=2))
+    except ImportError:
+        logger.info("未安装 fakeredis，跳过 Redis 后端测试")
+    articles = [NewsArticle.model_validate(make_article(f"r{i}", f"文章{i}", "2025-09-01")).model_dump(mode="json")
+                for i in range(5)]
+    for backend in backends:
+        assert backend.get_version() == 0 and backend.get_banners() is None
+        entries, loaded = backend_entries(articles)
+        assert backend.publish_snapshot(entries, generation=7, fingerprint="f1") == 1
+        assert loaded == ["r0", "r1", "r2", "r3", "r4"]
+        version, snapshot_articles, meta = backend.get_snapshot()
+        assert version == 1 and snapshot_articles == articles
+        assert meta == {"generation": 7, "fingerprint": "f1"}
+        assert backend.get_article("r3")["content"][0]["value"] == "文章3"
+        # 只有内容变化的文章读取正文并写入
+        changed = articles[:1] + [dict(articles[1], title="改过的标题")] + articles[2:]
+        entries, loaded = backend_entries(changed)
+        backend.publish_snapshot(entries)
+        assert loaded == ["r1"]
+        assert backend.get_snapshot()[1] == changed
+        # 整体替换后不存在的文章不再可见
+        entries, _ = backend_entries(changed[2:])
+        backend.publish_snapshot(entries)
+        assert backend.get_snapshot()[:2] == (3, changed[2:])
+        assert backend.get_article("r0") is None
+        backend.publish_banners([{"url": "b.png"}])
+        assert backend.get_banners() == [{"url": "b.png"}]
+        # 重建的快照与原数据一致
+        assert NewsSnapshot.build(backend.get_snapshot()[1]).get("r4").title == "文章4"
+
+    if len(backends) > 1:
+        redis_backend = backends[1]
+        client = redis_backend.client
+        # 已发布版本的键不被改写，上一版的键设置了过期时间
+        assert client.hget("ohnews:v1:article:r1", "title") == dumps("文章1")
+        assert client.hget("ohnews:v2:article:r1", "title") == dumps("改过的标题")
+        assert 0 < client.ttl("ohnews:v2:article:r0") <= redis_backend.retire_after
+        assert client.ttl("ohnews:v3:article:r2") == -1
+        assert not client.exists("ohnews:v3:article:r0")
+        # 新实例（如领导进程重启）从 Redis 读回摘要，未变化的文章不再写入
+        restarted = RedisCacheBackend(client=client, batch_size=2)
+        entries, loaded = backend_entries(changed[2:])
+        assert restarted.publish_snapshot(entries) == 4
+        assert loaded == [] and restarted.last_copied == 3
+        assert restarted.get_snapshot()[:2] == (4, changed[2:])
+
+
+def test_detail_cache():
+    """测试详情缓存：未命中时抓取，ttl 内命中，过期后先返回旧内容再后台刷新"""
+    fetched = []
+
+    def fetcher(url):
+        fetched.append(url)
+        return [{"type": "text", "value": f"{url}#{len(fetched)}"}]
+
+    async def scenario():
+        cache = DetailContentCache(":memory:", ttl=60, stale_ttl=60, fetcher=fetcher)
+        assert (await cache.get_content("h1", "u1"))[0]["value"] == "u1#1"
+        assert (await cache.get_content("h1", "u1"))[0]["value"] == "u1#1"
+        assert len(fetched) == 1
+        # 过期但在 stale 窗口内：返回旧内容，后台刷新
+        cache.lookup("h1").fetched_at -= 90
+        assert (await cache.get_content("h1", "u1"))[0]["value"] == "u1#1"
+        await asyncio.gather(*cache._tasks)
+        assert (await cache.get_content("h1", "u1"))[0]["value"] == "u1#2"
+        # 超出 stale 窗口：同步重新抓取
+        cache.lookup("h1").fetched_at -= 200
+        assert (await cache.get_content("h1", "u1"))[0]["value"] == "u1#3"
+        stats = cache.get_stats()
+        assert stats["fresh_hits"] == 2 and stats["stale_hits"] == 1 and stats["fetches"] == 3
+
+    asyncio.run(scenario())
+
+
+def test_single_flight():
+    """测试同一键的并发调用只执行一次，不同键的同时执行数量受限"""
+    async def scenario():
+        flight = SingleFlight(max_concurrency=2)
+        running, peak, executed = [0], [0], []
+
+        async def fetch(key):
+            executed.append(key)
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            await asyncio.sleep(0.01)
+            running[0] -= 1
+            return f"正文-{key}"
+
+        keys = ["a"] * 10 + ["b", "c", "d"]
+        results = await asyncio.gather(*(flight.do(k, lambda k=k: fetch(k)) for k in keys))
+        assert results[:10] == ["正文-a"] * 10 and results[-1] == "正文-d"
+        assert sorted(executed) == ["a", "b", "c", "d"] and peak[0] == 2
+        assert flight.get_stats()["shared"] == 9 and not flight.is_running("a")
+
+        # 异常同样共享给所有等待者，之后可以重新执行
+        async def fail():
+            await asyncio.sleep(0)
+            raise RuntimeError("抓取失败")
+        errors = await asyncio.gather(*(flight.do("x", fail) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(e, RuntimeError) for e in errors) and flight.get_stats()["executions"] == 5
+
+    asyncio.run(scenario())
+
+
+def test_detail_prefetch():
+    """测试预取每个来源最新的文章详情，已缓存的跳过，请求耗时过高时退避直至超出预算"""
+    fetched = []
+
+    def fetcher(url):
+        fetched.append(url)
+        return [{"type": "text", "value": url}]
+
+    snapshot = NewsSnapshot.build([
+        make_article(f"h{i}", f"文章{i}", f"2025-09-0{i}", category="Huawei Developer",
+                     source="Huawei Developer Blog") for i in range(1, 5)
+    ] + [make_article("o1", "官网新闻", "2025-09-09")])
+
+    async def scenario():
+        cache = DetailContentCache(":memory:", fetcher=fetcher)
+        tracker = LatencyTracker()
+        prefetcher = DetailPrefetcher(cache, tracker, per_source=3, time_budget=0.05)
+        assert [r.id for r in prefetcher.candidates(snapshot)] == ["h4", "h3", "h2"]
+        await prefetcher.prefetch(snapshot)
+        assert sorted(fetched) == [f"https://example.com/h{i}" for i in (2, 3, 4)]
+        await prefetcher.prefetch(snapshot)
+        assert len(fetched) == 3 and prefetcher.already_cached == 3
+        # 请求变慢时不再抓取，超出时间预算后放弃本轮
+        tracker.record(10.0)
+        cache.lookup("h4").fetched_at -= cache.ttl + 1
+        await prefetcher.prefetch(snapshot)
+        assert len(fetched) == 3 and prefetcher.over_budget == 3 and prefetcher.backoffs > 0
+
+    asyncio.run(scenario())
+
+
+def test_negative_cache():
+    """测试错误占位内容不写入详情缓存，失败后按指数退避暂停重试，成功后清除记录"""
+    negative = NegativeCache(base_delay=10, max_delay=25, jitter=0)
+    assert [negative.backoff_delay(n) for n in (1, 2, 3)] == [10, 20, 25]
+    results = [[{"type": "text", "value": "内容抓取失败: timeout"}], [{"type": "text", "value": "正文"}]]
+    fetched = []
+
+    def fetcher(url):
+        fetched.append(url)
+        return results[len(fetched) - 1]
+
+    async def scenario():
+        cache = DetailContentCache(":memory:", fetcher=fetcher, negative=negative)
+        for _ in range(2):
+            try:
+                await cache.get_content("h1", "u1")
+                assert False, "应当抛出 DetailFetchError"
+            except DetailFetchError as e:
+                assert 0 < e.retry_after <= 10
+        # 第二次请求处于退避期，没有再次抓取，占位内容也没有写入缓存
+        assert len(fetched) == 1 and cache.lookup("h1") is None
+        assert not await cache.prefetch("h1", "u1")
+        negative._records[(ARTICLE, "h1")].retry_at = 0
+        assert (await cache.get_content("h1", "u1"))[0]["value"] == "正文"
+        stats = negative.get_stats()
+        assert stats["kinds"][ARTICLE]["failures"] == 1 and stats["kinds"][ARTICLE]["recoveries"] == 1
+        assert stats["tracked"] == 0 and cache.get_stats()["failures"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_full_text_search():
+    """测试正文全文搜索：BM25 排序、高亮摘录、短词过滤，覆盖写入后索引同步更新"""
+    old_path = database.DB_PATH
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_PATH = os.path.join(tmp, "news.db")
+        try:
+            database.init_database()
+            database.save_news_articles([
+                make_article("a1", "分布式软总线详解", "2025-09-01"),
+                make_article("a2", "ArkTS 入门", "2025-09-02", category="技术博客"),
+                make_article("a3", "版本发布", "2025-09-03", summary="鸿蒙生态"),
+            ], replace_all=True)
+            database.save_news_articles([{
+                **make_article("a2", "ArkTS 入门", "2025-09-02", category="技术博客"),
+                "content": [{"type": "text", "value": "ArkTS 通过分布式软总线通信"},
+                            {"type": "image", "value": "https://example.com/a.png"}],
+            }])
+            total, hits = database.search_news_articles("分布式软总线")
+            # 标题命中的排在正文命中之前，摘录带高亮标记
+            assert total == 2 and [h["id"] for h in hits] == ["a1", "a2"]
+            assert "<mark>分布式软总线</mark>" in hits[1]["snippet"] and hits[0]["score"] > hits[1]["score"]
+            assert database.search_news_articles("分布式软总线", category="技术博客")[0] == 1
+            # 不足三个字符的词按 LIKE 过滤
+            total, hits = database.search_news_articles("鸿蒙")
+            assert total == 1 and hits[0]["id"] == "a3" and hits[0]["score"] is None
+            # 整体替换后被删除文章的索引同步删除
+            database.save_news_articles([make_article("a1", "分布式软总线详解", "2025-09-01")], replace_all=True)
+            assert [h["id"] for h in database.search_news_articles("分布式软总线")[1]] == ["a1"]
+            assert database.search_news_articles('"OR') == (0, [])
+            # 内容未变化的文章不改写、不重建索引（用标记检测索引行是否被重写）
+            with database.get_db() as conn:
+                conn.execute("UPDATE news_articles SET updated_at = '2000-01-01'")
+                conn.execute("UPDATE news_fts SET title = '索引标记'")
+                conn.commit()
+            unchanged = make_article("a1", "分布式软总线详解", "2025-09-01")
+            image_only = dict(unchanged, content=unchanged["content"] + [{"type": "image", "value": "b.png"}])
+            database.save_news_articles([unchanged], replace_all=True)
+            database.save_news_articles([image_only], replace_all=True)
+            with database.get_db() as conn:
+                assert conn.execute("SELECT title FROM news_fts").fetchall()[0][0] == "索引标记"
+                assert conn.execute("SELECT updated_at FROM news_articles").fetchone()[0] != "2000-01-01"
+            # 标题变化只重建该行的索引，行ID不变
+            database.save_news_articles([dict(image_only, title="软总线原理"),
+                                         make_article("a4", "新文章", "2025-09-04")], replace_all=True)
+            with database.get_db() as conn:
+                assert {row[0] for row in conn.execute("SELECT title FROM news_fts")} == {"软总线原理", "新文章"}
+                assert conn.execute("SELECT id FROM news_articles WHERE article_id = 'a1'").fetchone()[0] == 1
+            # 同一URL换了文章ID时覆盖旧行
+            database.save_news_articles([dict(make_article("a5", "换ID", "2025-09-05"), url="https://example.com/a4")])
+            assert [h["id"] for h in database.search_news_articles("新文章")[1]] == []
+            assert [h["id"] for h in database.search_news_articles("换ID")[1]] == ["a5"]
+            # 短词高亮标题时保留完整标题；爬取文本先 HTML 转义再加高亮标记
+            long_title = "OpenHarmony 开发者大会圆满落幕，全新版本正式发布鸿蒙"
+            database.save_news_articles([
+                make_article("a6", long_title, "2025-09-06"),
+                dict(make_article("a7", "<script>alert(1)</script>", "2025-09-07"),
+                     content=[{"type": "text", "value": "<b>注意</b> 鸿蒙 <img src=x onerror=alert(1)>"}]),
+            ])
+            hits = {h["id"]: h for h in database.search_news_articles("鸿蒙")[1]}
+            assert hits["a6"]["title_highlight"] == long_title.replace("鸿蒙", "<mark>鸿蒙</mark>")
+            assert hits["a7"]["title_highlight"] == "&lt;script&gt;alert(1)&lt;/script&gt;"
+            assert hits["a7"]["snippet"] == "&lt;b&gt;注意&lt;/b&gt; <mark>鸿蒙</mark> &lt;img src=x onerror=alert(1)&gt;"
+            hit = database.search_news_articles("script")[1][0]
+            assert hit["title_highlight"] == "&lt;<mark>script</mark>&gt;alert(1)&lt;/<mark>script</mark>&gt;"
+            assert "<img" not in database.search_news_articles("onerror")[1][0]["snippet"]
+        finally:
+            database.DB_PATH = old_path
+
+
+def main():
+    """主测试函数"""
+    tests = [
+        ("关键字搜索", test_search),
+        ("ID索引", test_id_index),
+        ("位图过滤", test_bitmap_filters),
+        ("日期区间与排序", test_date_range_and_sort),
+        ("写时复制", test_copy_on_write),
+        ("游标分页", test_cursor_pagination),
+        ("字段投影", test_field_projection),
+        ("JSON片段", test_json_fragments),
+        ("驻留去重", test_interning),
+        ("紧凑记录", test_article_record),
+        ("分层存储", test_content_store),
+        ("快照文件", test_snapshot_file),
+        ("共享缓存后端", test_cache_backend),
+        ("详情缓存", test_detail_cache),
+        ("请求合并", test_single_flight),
+        ("详情预取", test_detail_prefetch),
+        ("失败负缓存", test_negative_cache),
+        ("全文搜索", test_full_text_search),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            results.append((test_name, True))
+        except Exception as e:
+            logger.error(f"测试 '{test_name}' 发生异常: {e!r}")
+            results.append((test_name, False))
+
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ 通过" if result else "❌ 失败"
+        logger.info(f"{status} - {test_name}")
+    logger.info(f"总计: {passed}/{len(results)} 测试通过")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)